@@ -10,6 +10,11 @@ from datetime import datetime
 
 load_dotenv()
 
+# Load vector collections, the employee directory and agent graphs in the
+# background, so the first request in each feature doesn't pay for them
+from src.core.warmup import WARMUP_ON_START, start_warmup
+warmup = start_warmup() if WARMUP_ON_START else None
+
 # Page config
 st.set_page_config(
     page_title="Lumina Lite Agentic",
@@ -83,6 +88,9 @@ if "current_feature" not in st.session_state:
 # Sidebar
 with st.sidebar:
     st.markdown("# Lumina Lite")
+    if warmup is not None and not warmup.ready:
+        steps = warmup.status().values()
+        st.caption(f"Loading indexes and agents ({sum(step['state'] in ('ready', 'failed') for step in steps)}/{len(steps)})...")
     st.markdown("---")
     
     if st.button("+ New Chat", use_container_width=True, type="primary"):
@@ -556,6 +564,44 @@ Answer concisely and professionally.{diagram_context}"""
                         }
                     )
                     
+                    from src.core.logging_utils import get_tool_result_savings
+                    
+                    try:
+                        savings = get_tool_result_savings()
+                    except sqlite3.OperationalError:
+                        savings = {}
+                    
+                    if savings:
+                        st.markdown("### HR Tool Result Savings")
+                        savings_df = pd.DataFrame([{"tool": tool, **stats} for tool, stats in savings.items()])
+                        st.dataframe(savings_df, use_container_width=True)
+                        st.caption("Estimated tokens kept out of the LLM context by paginated, columnar HR tool results")
+                    
+                    from src.core.vector_store import get_vector_store_registry
+                    
+                    collection_stats = get_vector_store_registry().stats()
+                    if collection_stats:
+                        st.markdown("### Vector Collections")
+                        st.dataframe(pd.DataFrame(collection_stats.values()), use_container_width=True)
+                        st.caption("Collections loaded in this process, on one shared Chroma client (memory is the estimated vector index size)")
+                    
+                    cache_stats = get_vector_store_registry().query_cache_stats()
+                    if cache_stats:
+                        st.markdown("### Query Embedding Cache")
+                        st.dataframe(pd.DataFrame([{"collection": name, **stats} for name, stats in cache_stats.items()]), use_container_width=True)
+                        st.caption("Searches answered without an embedding request (normalized query text, in-memory LRU then SQLite)")
+                    
+                    result_stats = get_vector_store_registry().result_cache_stats()
+                    if result_stats:
+                        st.markdown("### Search Result Cache")
+                        st.dataframe(pd.DataFrame([{"tool": tool, **stats} for tool, stats in result_stats.items()]), use_container_width=True)
+                        st.caption("Search tool calls answered from cached results (same normalized query and arguments, collection not re-indexed since)")
+                    
+                    if warmup is not None:
+                        st.markdown("### Start-up Warm-up")
+                        st.dataframe(pd.DataFrame(warmup.status().values()), use_container_width=True)
+                        st.caption("Background loads at process start" + ("" if warmup.ready else " (still running)"))
+                    
                     st.markdown("---")
                     st.markdown("### Visualizations")
                     
@@ -627,6 +673,65 @@ Answer concisely and professionally.{diagram_context}"""
                         st.metric("Optimized", f"${optimized_annual:,.0f}/year")
                     with col3:
                         st.metric("Annual Savings", f"${savings:,.0f}")
+
+                    st.markdown("---")
+                    st.markdown("### Monte Carlo Cost Projection")
+                    st.caption("Query mix, tokens and latency drawn from the query log; intervals cover user activity and adoption uncertainty.")
+
+                    from src.core.cost_projection import CHAT_MODELS, adoption_curve, sweep_cost_scenarios
+
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        mc_model = st.selectbox("Price table", ["As logged"] + CHAT_MODELS, key="mc_model")
+                    with col2:
+                        mc_qpd = st.slider("Queries / user / day", 1, 20, 5, key="mc_qpd")
+                    with col3:
+                        mc_confidence = st.select_slider("Confidence", [0.80, 0.90, 0.95, 0.99], value=0.90, key="mc_confidence")
+
+                    mc_users = [1000, 10000, 50000, 300000]
+                    mc_months = list(range(1, 25))
+                    sweep = sweep_cost_scenarios(
+                        user_counts=mc_users,
+                        adoption=[1.0] + adoption_curve(mc_months).tolist(),
+                        queries_per_user_per_day=[mc_qpd],
+                        models=[None if mc_model == "As logged" else mc_model],
+                        confidence=mc_confidence,
+                        seed=0
+                    )
+
+                    if "error" not in sweep:
+                        full_adoption = [s for s in sweep["scenarios"] if s["adoption"] == 1.0]
+                        mc_df = pd.DataFrame([
+                            {
+                                "Scale": f"{s['num_users']:,} Users",
+                                "Low": f"${s['monthly_cost_usd']['low']:,.2f}",
+                                "Median": f"${s['monthly_cost_usd']['median']:,.2f}",
+                                "High": f"${s['monthly_cost_usd']['high']:,.2f}",
+                                "Mean": f"${s['monthly_cost_usd']['mean']:,.2f}"
+                            }
+                            for s in full_adoption
+                        ])
+                        st.dataframe(mc_df, use_container_width=True)
+
+                        rollout = [s for s in sweep["scenarios"] if s["num_users"] == 300000 and s["adoption"] != 1.0]
+                        rollout_df = pd.DataFrame([
+                            {
+                                "month": month,
+                                "low": s["monthly_cost_usd"]["low"],
+                                "median": s["monthly_cost_usd"]["median"],
+                                "high": s["monthly_cost_usd"]["high"]
+                            }
+                            for month, s in zip(mc_months, rollout)
+                        ])
+                        fig3 = px.line(
+                            rollout_df,
+                            x="month",
+                            y=["low", "median", "high"],
+                            title="300K Users: Monthly Cost Along Adoption Curve",
+                            labels={"value": "Monthly Cost (USD)", "month": "Month Since Launch", "variable": "Band"}
+                        )
+                        st.plotly_chart(fig3, use_container_width=True)
+                        st.caption(f"{sweep['scenario_count']} scenarios × {sweep['n_samples']:,} samples in {sweep['elapsed_ms']:.0f}ms")
                 else:
                     st.info("No feature-level data yet. Run queries to populate metrics.")
         
@@ -0,0 +1,104 @@
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+from langchain.schema import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from benchmarks.bench_ingestion import WORDS
+from src.core.cost_utils import calculate_embedding_cost, estimate_token_count
+from src.core.document_sources import AKS_DOC_CHUNK_TOKENS
+from src.core.indexer import chunk_ids
+from src.core.markdown_chunker import split_markdown_sections
+
+SYNTHETIC_DOCUMENTS = 500
+
+
+def fixed_size(text: str) -> List[str]:
+    """The previous AKS KB chunking: 600-character recursive splits with 100 characters of overlap."""
+    return RecursiveCharacterTextSplitter(chunk_size=600, chunk_overlap=100, length_function=len).split_text(text)
+
+
+def sections(text: str) -> List[str]:
+    return [chunk.page_content for chunk in split_markdown_sections(text, AKS_DOC_CHUNK_TOKENS, {})]
+
+
+CHUNKERS: Dict[str, Callable[[str], List[str]]] = {"fixed 600/100": fixed_size, "markdown sections": sections}
+
+
+def synthetic_documents(n: int, seed: int = 0) -> List[str]:
+    """Runbook-shaped markdown: a title, 3-8 sections with 0-3 subsections, paragraphs of domain words."""
+    rng = np.random.default_rng(seed)
+    words = np.array(WORDS)
+
+    def paragraph() -> str:
+        return " ".join(words[rng.integers(0, len(words), rng.integers(15, 90))])
+
+    documents = []
+    for i in range(n):
+        parts = [f"# Runbook {i}", paragraph()]
+        for s in range(rng.integers(3, 9)):
+            parts += [f"## Section {s}", paragraph()]
+            for sub in range(rng.integers(0, 4)):
+                parts += [f"### Step {s}.{sub}"] + [paragraph() for _ in range(rng.integers(1, 3))]
+        documents.append("\n\n".join(parts))
+    return documents
+
+
+def edit_middle_section(text: str) -> str:
+    """Append a sentence to the paragraph in the middle of the document."""
+    paragraphs = text.split("\n\n")
+    middle = len(paragraphs) // 2
+    paragraphs[middle] += " Escalate to the on-call owner if the rollout stalls."
+    return "\n\n".join(paragraphs)
+
+
+def duplicated_chars(text: str, chunks: List[str]) -> int:
+    """Characters embedded more than once: chunk lengths minus the source characters they cover."""
+    covered = np.zeros(len(text), dtype=bool)
+    at = 0
+    for chunk in chunks:
+        start = text.find(chunk, at)
+        if start < 0:
+            # Packed chunks re-join sections, so they need not be verbatim substrings; they never overlap
+            continue
+        covered[start:start + len(chunk)] = True
+        at = start + 1
+    return sum(len(chunk) for chunk in chunks if chunk in text) - int(covered.sum())
+
+
+def measure(label: str, documents: List[str]) -> None:
+    source_tokens = sum(estimate_token_count(doc) for doc in documents)
+    print(f"\n{label}: {len(documents):,} documents, {source_tokens:,} source tokens")
+    for name, chunker in CHUNKERS.items():
+        chunks = [chunker(doc) for doc in documents]
+        sizes = [estimate_token_count(chunk) for doc_chunks in chunks for chunk in doc_chunks]
+        embedded = sum(sizes)
+        duplicated = sum(duplicated_chars(doc, doc_chunks) for doc, doc_chunks in zip(documents, chunks)) // 4
+
+        # Chunks re-embedded after a one-sentence edit: IDs not present before the edit
+        reembedded = 0
+        for i, (doc, doc_chunks) in enumerate(zip(documents, chunks)):
+            before = set(chunk_ids(str(i), [Document(page_content=chunk) for chunk in doc_chunks]))
+            after = chunk_ids(str(i), [Document(page_content=chunk) for chunk in chunker(edit_middle_section(doc))])
+            reembedded += sum(chunk_id not in before for chunk_id in after)
+
+        print(f"   {name:18s} {len(sizes):7,} chunks  mean {np.mean(sizes):5.0f} tokens  "
+              f"embedded {embedded:9,} tokens (${calculate_embedding_cost('text-embedding-3-small', embedded):.4f})  "
+              f"duplicated {duplicated:8,} tokens ({duplicated / max(embedded, 1):5.1%})  "
+              f"re-embedded per edit {reembedded / len(documents):4.1f} chunks")
+
+
+def main() -> None:
+    corpora = {
+        "AKS KB (docs/*.md)": sorted(Path("docs").glob("*.md")),
+        "team docs (data/*.md)": sorted(Path("data").glob("*.md"))
+    }
+    for label, files in corpora.items():
+        if files:
+            measure(label, [f.read_text(encoding="utf-8") for f in files])
+    measure("synthetic runbooks", synthetic_documents(SYNTHETIC_DOCUMENTS))
+
+
+if __name__ == "__main__":
+    main()
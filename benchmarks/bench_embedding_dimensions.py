@@ -0,0 +1,105 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from langchain_openai import OpenAIEmbeddings
+
+from benchmarks.bench_quantization import embedding_like_vectors, exact_top_k
+from src.core.document_sources import COLLECTION_SPECS
+from src.core.vector_backends import NumpyCollection
+from src.core.vector_store import shorten_embeddings, with_dimensions
+
+WIDTHS = [256, 512, 1536]
+SCALE_ROWS = 100_000
+SCALE_QUERIES = 200
+K = 5
+
+
+def corpus_queries(texts: list) -> list:
+    """One query per chunk: its first dozen words, roughly the length of what agents search for."""
+    return [" ".join(text.split()[:12]) for text in texts]
+
+
+def measure(vectors: np.ndarray, queries: np.ndarray, truth: list, k: int, tmp: Path, label: str) -> tuple:
+    """
+    Index `vectors` in a NumpyCollection and query it. Returns (file bytes,
+    p50 ms, p99 ms, recall@k against `truth`), where `truth` is the exact full-width top k.
+    """
+    ids = [str(i) for i in range(len(vectors))]
+    collection = NumpyCollection("bench", tmp / f"{label}.vec")
+    collection.upsert(ids, vectors, ids, [{}] * len(ids))
+    collection.persist()
+
+    latencies, found = [], []
+    for query in queries:
+        start = time.perf_counter()
+        found.append(collection.query([query], n_results=k, include=[])["ids"][0])
+        latencies.append((time.perf_counter() - start) * 1000)
+    recall = np.mean([len({int(i) for i in ids} & want) / k for ids, want in zip(found, truth)])
+    return collection.path.stat().st_size, float(np.percentile(latencies, 50)), float(np.percentile(latencies, 99)), float(recall)
+
+
+def report(label: str, width: int, stats: tuple, full_size: int) -> None:
+    size, p50, p99, recall = stats
+    print(f"   {label:18s} {width:5d} dims  file {size / 2**20:8.2f} MB ({full_size / size:4.1f}x smaller)  "
+          f"p50 {p50:6.2f} ms  p99 {p99:6.2f} ms  recall@{K} {recall:.3f}")
+
+
+def corpora(tmp: Path) -> None:
+    """Our collections embedded with text-embedding-3-small at each width (needs OPENAI_API_KEY)."""
+    if not os.getenv("OPENAI_API_KEY"):
+        print("\nOPENAI_API_KEY not set; skipping the corpus run (the synthetic run below needs no API access)")
+        return
+
+    client = OpenAIEmbeddings(model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"))
+    for spec in COLLECTION_SPECS.values():
+        texts = [chunk.page_content for path in spec.source_files() for chunk in spec.load_chunks(path)]
+        if len(texts) <= K:
+            continue
+        queries = corpus_queries(texts)
+
+        print(f"\n{spec.name}: {len(texts):,} chunks, {len(queries)} queries, k={K}")
+        full_size, truth = None, None
+        for width in sorted(WIDTHS, reverse=True):
+            embeddings = with_dimensions(client, width)
+            vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+            query_vectors = np.asarray(embeddings.embed_documents(queries), dtype=np.float32)
+            truth = truth or exact_top_k(vectors, query_vectors, K)
+            stats = measure(vectors, query_vectors, truth, K, tmp, f"{spec.name}-{width}")
+            full_size = full_size or stats[0]
+            report(spec.name, width, stats, full_size)
+
+
+def synthetic(tmp: Path) -> None:
+    """
+    Search cost at a collection size our corpora do not reach yet. The
+    vectors are synthetic, so only the storage and latency columns carry
+    over; recall here is a lower bound, since unlike text-embedding-3-*
+    they are not trained to front-load information into the first dims.
+    """
+    full = embedding_like_vectors(SCALE_ROWS, max(WIDTHS))
+    rng = np.random.default_rng(1)
+    queries = full[rng.integers(0, SCALE_ROWS, SCALE_QUERIES)] + 0.02 * rng.standard_normal(
+        (SCALE_QUERIES, max(WIDTHS))).astype(np.float32)
+
+    truth = exact_top_k(full, queries, K)
+
+    print(f"\nsynthetic: {SCALE_ROWS:,} vectors, {SCALE_QUERIES} queries, k={K} (IVF search)")
+    full_size = None
+    for width in sorted(WIDTHS, reverse=True):
+        stats = measure(shorten_embeddings(full, width), shorten_embeddings(queries, width),
+                        truth, K, tmp, f"synthetic-{width}")
+        full_size = full_size or stats[0]
+        report("synthetic", width, stats, full_size)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        corpora(Path(tmp))
+        synthetic(Path(tmp))
+
+
+if __name__ == "__main__":
+    main()
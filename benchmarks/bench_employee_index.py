@@ -0,0 +1,140 @@
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic_employees import write_employees_csv
+from src.core.employee_directory import EmployeeDirectory
+from src.core.org_chart import OrgChart
+
+QUERIES = [
+    ("full_name", "sarah"),
+    ("full_name", "Priya Chenm"),
+    ("full_name", "wilson"),
+    ("role", "data scientist"),
+    ("department", "lumina"),
+    ("manager", "Grace Khan"),
+    ("location", "bos"),
+]
+
+FILTERS = [
+    {"role": "Data Scientist", "location": "Boston"},
+    {"department": "Digital Workplace AI", "manager": "sarah"},
+]
+
+
+def timed(fn, repeat: int) -> float:
+    """Median wall time of fn() in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+
+def baseline_filter(df: pd.DataFrame, criteria: dict) -> pd.DataFrame:
+    """The pre-index implementation: a full str.contains scan per criterion."""
+    for col, value in criteria.items():
+        df = df[df[col].str.contains(value, case=False, na=False)]
+    return df
+
+
+def bench(n: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = str(Path(tmp) / "employees.csv")
+        write_employees_csv(csv_path, n)
+
+        read_ms = timed(lambda: pd.read_csv(csv_path), 1)
+        plain = pd.read_csv(csv_path)
+
+        directory = EmployeeDirectory(csv_path)
+        start = time.perf_counter()
+        index = directory.index()
+        build_ms = (time.perf_counter() - start) * 1000
+
+        print(f"\n{n:,} rows: read_csv {read_ms:.0f}ms per call (old per-tool cost), "
+              f"directory load + index build {build_ms:.0f}ms once")
+        print(f"   {'query':42s} {'baseline ms':>12s} {'index ms':>10s} {'speedup':>8s} {'rows':>8s}")
+
+        cases = [(f"{col} ~ {value!r}", {col: value}) for col, value in QUERIES]
+        cases += [(" & ".join(f"{c}~{v!r}" for c, v in f.items()), f) for f in FILTERS]
+
+        for label, criteria in cases:
+            expected = baseline_filter(plain, criteria)
+            got = index.df.iloc[index.filter(criteria)]
+            assert expected.index.equals(got.index), label
+
+            base_ms = timed(lambda: baseline_filter(plain, criteria), repeat)
+            index_ms = timed(lambda: index.df.iloc[index.filter(criteria)], repeat * 5)
+            print(f"   {label[:42]:42s} {base_ms:12.2f} {index_ms:10.3f} {base_ms / index_ms:7.0f}x {len(got):8,}")
+
+
+def bench_fuzzy(n: int, queries: int = 1000, seed: int = 1) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = str(Path(tmp) / "employees.csv")
+        write_employees_csv(csv_path, n)
+        index = EmployeeDirectory(csv_path).index()
+
+    rng = random.Random(seed)
+    names = index.df["full_name"].tolist()
+
+    def typo(name: str) -> str:
+        i = rng.randrange(len(name))
+        return rng.choice([name[:i] + name[i + 1:], name[:i] + "a" + name[i:], name[:i] + "e" + name[i + 1:]])
+
+    hits, latencies = 0, []
+    for k in range(queries):
+        name = names[rng.randrange(len(names))]
+        query = typo(name) if k % 2 else ", ".join(reversed(name.split()))
+
+        start = time.perf_counter()
+        matches = index.fuzzy_name(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        hits += name.lower() in [names[row].lower() for row, _ in matches]
+
+    print(f"\nfuzzy name search, {n:,} rows ({queries} typo / 'Last, First' queries)")
+    print(f"   recall@5 {hits / queries:.3f}   p50 {np.median(latencies):.2f}ms   p95 {np.percentile(latencies, 95):.2f}ms")
+
+
+def bench_org(n: int, queries: int = 1000, seed: int = 2) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = str(Path(tmp) / "employees.csv")
+        write_employees_csv(csv_path, n)
+        df = EmployeeDirectory(csv_path).df
+
+    start = time.perf_counter()
+    org = OrgChart(df)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    rng = np.random.default_rng(seed)
+    pairs = rng.integers(0, n, (queries, 2)).tolist()
+    managers = rng.integers(0, min(n, 1000), queries).tolist()
+
+    def per_query(fn) -> float:
+        start = time.perf_counter()
+        for args in fn:
+            pass
+        return (time.perf_counter() - start) * 1000 / queries
+
+    reports_ms = per_query(org.reports(m) for m in managers)
+    chain_ms = per_query(org.chain_of_command(a) for a, _ in pairs)
+    common_ms = per_query(org.common_manager(a, b) for a, b in pairs)
+
+    print(f"\norg chart, {n:,} rows: build {build_ms:.0f}ms, depth {org.depth.max()}")
+    print(f"   all reports {reports_ms * 1000:.1f}us   chain of command {chain_ms * 1000:.1f}us   "
+          f"common manager {common_ms * 1000:.1f}us per query")
+
+
+if __name__ == "__main__":
+    bench(10_000, repeat=20)
+    bench(100_000, repeat=5)
+    bench(1_000_000, repeat=3)
+    bench_fuzzy(100_000)
+    bench_fuzzy(1_000_000)
+    bench_org(100_000)
+    bench_org(1_000_000)
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from langchain.schema import Document
+
+from benchmarks.bench_ingestion import SimulatedEmbeddings
+from src.core.document_sources import CollectionSpec
+from src.core.embedding_cache import QueryEmbeddingCache
+from src.core.vector_store import VectorStoreRegistry
+
+COLLECTIONS = {"team_docs": 20_000, "aks_kb": 60_000, "video_transcripts": 120_000}
+DIMENSIONS = 384
+QUERIES = 30
+K = 8
+EMBEDDING_REQUEST_MS = 40.0
+REMOTE_QUERY_MS = 25.0
+
+
+def synthetic_chunks(path: Path) -> List[Document]:
+    """A source file here is just a chunk count; the text only needs to be unique."""
+    count = int(path.read_text())
+    return [Document(page_content=f"{path.stem} chunk {i}", metadata={"source": path.name}) for i in range(count)]
+
+
+class RemoteCollection:
+    """A collection behind a simulated network round trip, like a Chroma server."""
+
+    def __init__(self, collection, latency_ms: float):
+        self.collection = collection
+        self.latency_ms = latency_ms
+
+    def query(self, **kwargs):
+        time.sleep(self.latency_ms / 1000)
+        return self.collection.query(**kwargs)
+
+
+def p50_ms(run) -> float:
+    latencies = []
+    for i in range(QUERIES):
+        start = time.perf_counter()
+        run(f"benchmark query {i} {time.perf_counter()}")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return float(np.percentile(latencies, 50))
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        specs = {}
+        for name, count in COLLECTIONS.items():
+            source = Path(tmp) / "sources" / name
+            source.mkdir(parents=True)
+            (source / f"{name}.txt").write_text(str(count))
+            specs[name] = CollectionSpec(name, str(source), "*.txt", synthetic_chunks)
+
+        registry = VectorStoreRegistry(
+            str(Path(tmp) / "store"), specs, SimulatedEmbeddings(DIMENSIONS, request_ms=0.0, per_token_us=0.0),
+            QueryEmbeddingCache(str(Path(tmp) / "queries.db")), backend="numpy", snapshot=None
+        )
+        registry.warm_up()
+        # Queries pay a simulated embedding round trip; indexing above did not
+        registry.embeddings.request_ms = EMBEDDING_REQUEST_MS
+        names = list(COLLECTIONS)
+
+        print(f"{', '.join(f'{n} {c:,}' for n, c in COLLECTIONS.items())} chunks x {DIMENSIONS} dims (numpy backend), "
+              f"k={K}, {EMBEDDING_REQUEST_MS:.0f} ms embedding request, {os.cpu_count()} CPU(s)")
+
+        for label, latency_ms in [("in-process store", 0.0), (f"remote store (+{REMOTE_QUERY_MS:.0f} ms per query)", REMOTE_QUERY_MS)]:
+            if latency_ms:
+                for name in names:
+                    registry._collections[name] = RemoteCollection(registry.get(name), latency_ms)
+
+            single = {name: p50_ms(lambda q, name=name: registry.search(name, q, k=K)) for name in names}
+            sequential = p50_ms(lambda q: [registry.search(name, q, k=K) for name in names])
+            federated = p50_ms(lambda q: registry.federated_search(q, names, k=K))
+            print(f"\n{label}")
+            for name, ms in single.items():
+                print(f"   {name:20s} alone        p50 {ms:7.1f} ms")
+            print(f"   {'3 searches in turn':20s}              p50 {sequential:7.1f} ms")
+            print(f"   {'federated':20s}              p50 {federated:7.1f} ms "
+                  f"({sequential / federated:4.1f}x faster; slowest single collection {max(single.values()):.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import random
+import re
+import time
+
+from src.core.guardrails import HARMFUL_PATTERNS, get_guardrail_engine
+
+WORDS = (
+    "how do i configure nsg rules for aks cluster private endpoint azure cni kubenet "
+    "who are the data scientists on the lumina team where is sarah located deploy "
+    "github actions pipeline ingress controller load balancer subnet pod network"
+).split()
+
+
+def legacy_check(text: str) -> bool:
+    """Baseline: one re.search per rule, recompiled through the re cache on each call."""
+    for pattern in HARMFUL_PATTERNS:
+        if re.search(pattern, text):
+            return False
+    return True
+
+
+def make_inputs(n: int, length: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    inputs = []
+    for _ in range(n):
+        words = []
+        size = 0
+        while size < length:
+            words.append(rng.choice(WORDS))
+            size += len(words[-1]) + 1
+        inputs.append(" ".join(words))
+    return inputs
+
+
+def bench_single(inputs: list) -> None:
+    engine = get_guardrail_engine()
+
+    start = time.perf_counter()
+    for text in inputs:
+        legacy_check(text)
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in inputs:
+        engine.check(text)
+    engine_s = time.perf_counter() - start
+
+    megabytes = sum(len(t) for t in inputs) / 1e6
+    print(f"single check ({len(inputs)} inputs, {megabytes:.1f} MB)")
+    print(f"   legacy : {legacy_s / len(inputs) * 1e6:8.2f} us/check  {megabytes / legacy_s:8.1f} MB/s")
+    print(f"   engine : {engine_s / len(inputs) * 1e6:8.2f} us/check  {megabytes / engine_s:8.1f} MB/s")
+
+
+def bench_batch(inputs: list) -> None:
+    engine = get_guardrail_engine()
+
+    start = time.perf_counter()
+    engine.check_batch(inputs)
+    batch_s = time.perf_counter() - start
+
+    megabytes = sum(len(t) for t in inputs) / 1e6
+    print(f"batch check ({len(inputs)} inputs)")
+    print(f"   engine : {batch_s / len(inputs) * 1e6:8.2f} us/check  {megabytes / batch_s:8.1f} MB/s")
+
+
+def bench_stream(total_chars: int, chunk_chars: int) -> None:
+    engine = get_guardrail_engine()
+    text = make_inputs(1, total_chars, seed=1)[0]
+    chunks = [text[i:i + chunk_chars] for i in range(0, len(text), chunk_chars)]
+
+    start = time.perf_counter()
+    scanner = engine.stream()
+    for chunk in chunks:
+        scanner.feed(chunk)
+    stream_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    seen = ""
+    for chunk in chunks[:500]:
+        seen += chunk
+        legacy_check(seen)
+    rescan_s = (time.perf_counter() - start) * len(chunks) / min(len(chunks), 500)
+
+    megabytes = len(text) / 1e6
+    print(f"streaming ({megabytes:.1f} MB in {len(chunks)} chunks of {chunk_chars} chars)")
+    print(f"   incremental     : {stream_s / len(chunks) * 1e6:8.2f} us/chunk  {megabytes / stream_s:8.1f} MB/s")
+    print(f"   rescan (approx) : {rescan_s / len(chunks) * 1e6:8.2f} us/chunk  {megabytes / rescan_s:8.2f} MB/s")
+
+
+if __name__ == "__main__":
+    short = make_inputs(20000, 120)
+    long = make_inputs(500, 8000)
+
+    bench_single(short)
+    bench_single(long)
+    bench_batch(short)
+    bench_batch(long)
+    bench_stream(2_000_000, 40)
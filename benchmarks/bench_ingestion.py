@@ -0,0 +1,103 @@
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import chromadb
+import numpy as np
+from chromadb.config import Settings
+from langchain_community.vectorstores import Chroma
+from langchain_core.embeddings import Embeddings
+
+from src.core.document_sources import CollectionSpec, load_team_doc_chunks
+from src.core.indexer import IncrementalIndexer
+from src.core.vector_backends import ChromaBackend
+
+WORDS = ("cluster network subnet policy ingress pod node deploy pipeline secret registry "
+         "latency budget owner review incident runbook rollout canary region quota").split()
+
+
+class SimulatedEmbeddings(Embeddings):
+    """Deterministic vectors behind a simulated API round trip (fixed latency plus per-token time)."""
+
+    def __init__(self, dimensions: int = 256, request_ms: float = 40.0, per_token_us: float = 1.0,
+                 max_inputs: int = 1000):
+        self.dimensions = dimensions
+        self.request_ms = request_ms
+        self.per_token_us = per_token_us
+        self.max_inputs = max_inputs
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = []
+        for start in range(0, len(texts), self.max_inputs):
+            batch = texts[start:start + self.max_inputs]
+            tokens = sum(len(t) // 4 for t in batch)
+            time.sleep(self.request_ms / 1000 + tokens * self.per_token_us / 1e6)
+            rng = np.random.default_rng(len(batch))
+            vectors.extend(rng.standard_normal((len(batch), self.dimensions), dtype=np.float32).tolist())
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def write_corpus(root: Path, documents: int, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    words = np.array(WORDS)
+    for i in range(documents):
+        paragraphs = []
+        for _ in range(rng.integers(1, 4)):
+            paragraphs.append(" ".join(words[rng.integers(0, len(words), rng.integers(40, 120))]))
+        (root / f"doc_{i:06d}.md").write_text(f"# Document {i}\n\n" + "\n\n".join(paragraphs), encoding="utf-8")
+
+
+def run(mode: str, corpus: str, store_dir: str) -> None:
+    spec = CollectionSpec("bench", corpus, "*.md", load_team_doc_chunks)
+    embeddings = SimulatedEmbeddings()
+    start = time.perf_counter()
+
+    if mode == "serial":
+        # The pre-pipeline path: load and split every file in turn, then add
+        # everything at once (split at Chroma's max batch size, which a
+        # single from_documents call exceeds at this corpus size)
+        client = chromadb.PersistentClient(path=store_dir, settings=Settings(anonymized_telemetry=False))
+        store = Chroma(client=client, collection_name="bench", embedding_function=embeddings)
+        chunks = []
+        for path in spec.source_files():
+            chunks.extend(spec.load_chunks(path))
+        step = client.get_max_batch_size()
+        for start_at in range(0, len(chunks), step):
+            store.add_documents(chunks[start_at:start_at + step])
+        count = len(chunks)
+    else:
+        collection = ChromaBackend(Path(store_dir)).open("bench")
+        report = IncrementalIndexer(spec, Path(store_dir) / "manifests", "simulated").sync(collection, embeddings)
+        count = report.chunks_added
+
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"   {mode:9s} {count:8,} chunks {elapsed:8.1f}s {count / elapsed:10,.0f} chunks/sec   peak RSS {peak_mb:6.0f} MB")
+
+
+def main(documents: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = Path(tmp) / "corpus"
+        corpus.mkdir()
+        write_corpus(corpus, documents)
+
+        print(f"\ningesting {documents:,} markdown documents (simulated embedding API: 40ms/request + 1us/token)")
+        for mode in ["serial", "pipeline"]:
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_ingestion", "--run", mode, str(corpus), str(Path(tmp) / mode)],
+                check=True
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--run":
+        run(*sys.argv[2:5])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,88 @@
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_quantization import embedding_like_vectors
+from src.core.vector_backends import MetadataIndex, NumpyCollection, matches_where, where_all
+
+ROWS = 200_000
+DIMENSIONS = 256
+QUERIES = 50
+K = 10
+SPEAKERS = 50
+VIDEOS = 4000
+
+FILTERS = {
+    "video_id": where_all([{"video_id": "VID-0042"}]),
+    "speaker": where_all([{"speaker": "Speaker 7"}]),
+    "date range (1 quarter)": where_all([{"date_number": {"$gte": 20240101}}, {"date_number": {"$lte": 20240331}}]),
+    "speaker + date range": where_all([{"speaker": "Speaker 7"}, {"date_number": {"$gte": 20240101}}]),
+    "video_id $in (3 videos)": where_all([{"video_id": {"$in": ["VID-0001", "VID-0002", "VID-0003"]}}]),
+}
+
+
+def transcript_metadata(n: int, seed: int = 0) -> list:
+    """Segment metadata: ~50 segments per video, each video by one speaker on one day in 2022-2024."""
+    rng = np.random.default_rng(seed)
+    video_speaker = rng.integers(0, SPEAKERS, VIDEOS)
+    video_day = rng.integers(0, 3 * 365, VIDEOS)
+    metadatas = []
+    for video in rng.integers(0, VIDEOS, n):
+        year, day = divmod(int(video_day[video]), 365)
+        month, day = min(day // 30, 11) + 1, day % 30 + 1
+        metadatas.append({
+            "video_id": f"VID-{video:04d}",
+            "speaker": f"Speaker {video_speaker[video]}",
+            "date_number": (2022 + year) * 10000 + month * 100 + min(day, 28),
+            "source_type": "video_transcript"
+        })
+    return metadatas
+
+
+def p50_ms(run, repeat: int) -> float:
+    latencies = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        run(i)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return float(np.percentile(latencies, 50))
+
+
+def main() -> None:
+    vectors = embedding_like_vectors(ROWS, DIMENSIONS)
+    metadatas = transcript_metadata(ROWS)
+    ids = [str(i) for i in range(ROWS)]
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.integers(0, ROWS, QUERIES)]
+
+    start = time.perf_counter()
+    index = MetadataIndex(metadatas)
+    print(f"{ROWS:,} chunks x {DIMENSIONS} dims, k={K}; metadata index built in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, persisted in [("exact scan (unpersisted)", False), ("IVF (persisted)", True)]:
+            collection = NumpyCollection("bench", Path(tmp) / "bench.vec")
+            collection.upsert(ids, vectors, ids, metadatas)
+            if persisted:
+                collection.persist()
+            collection.query(queries[:1], n_results=K, where={"speaker": "Speaker 0"})  # builds the metadata index
+
+            unfiltered = p50_ms(lambda i: collection.query(queries[i:i + 1], n_results=K, include=[]), QUERIES)
+            print(f"\n{label}: unfiltered p50 {unfiltered:7.2f} ms")
+            for name, where in FILTERS.items():
+                matched = len(index.rows(where))
+                filtered = p50_ms(lambda i: collection.query(queries[i:i + 1], n_results=K, where=where, include=[]), QUERIES)
+                print(f"   {name:24s} {matched:7,} rows ({matched / ROWS:6.2%})  p50 {filtered:7.2f} ms "
+                      f"({unfiltered / filtered:5.1f}x faster than unfiltered)")
+
+    print("\ncandidate selection only (before: a matches_where() call per row)")
+    for name, where in FILTERS.items():
+        indexed = p50_ms(lambda i: index.rows(where), 20)
+        linear = p50_ms(lambda i: [row for row, m in enumerate(metadatas) if matches_where(m, where)], 3)
+        print(f"   {name:24s} index {indexed:7.3f} ms   linear {linear:8.1f} ms   ({linear / indexed:7.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
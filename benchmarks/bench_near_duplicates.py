@@ -0,0 +1,139 @@
+import time
+from typing import List, Set
+
+import numpy as np
+from langchain.schema import Document
+
+from benchmarks.bench_ingestion import WORDS
+from src.core.cost_utils import estimate_token_count
+from src.core.document_sources import AKS_DOC_CHUNK_TOKENS
+from src.core.indexer import chunk_ids
+from src.core.lexical_index import BM25Index
+from src.core.markdown_chunker import split_markdown_sections
+from src.core.near_duplicates import (
+    NEAR_DUPLICATE_OVERFETCH, add_signatures, near_duplicate_candidates, suppress_near_duplicates
+)
+
+DOCUMENTS = 400
+# Share of documents with a derived copy (an on-call runbook, a team wiki page) repeating some of their sections
+COPIED_SHARE = 0.3
+EDITED_WORD_SHARE = 0.03
+QUERIES = 300
+# Queries are a phrase from the target passage
+QUERY_WORDS = 8
+K = 5
+VOCABULARY = 5000
+
+
+def runbooks(n: int, seed: int = 0) -> List[str]:
+    """
+    Runbook-shaped markdown (a title, 3-8 sections with 0-3 subsections)
+    over a Zipf-distributed vocabulary, so passages have distinctive terms
+    as real documentation does.
+    """
+    rng = np.random.default_rng(seed)
+    syllables = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "pa", "do", "gu"]
+    vocabulary = np.array(WORDS + [
+        "".join(rng.choice(syllables, rng.integers(2, 5))) + str(i) for i in range(VOCABULARY)
+    ])
+
+    def paragraph() -> str:
+        ranks = np.minimum(rng.zipf(1.3, rng.integers(15, 90)), len(vocabulary)) - 1
+        return " ".join(vocabulary[ranks])
+
+    documents = []
+    for i in range(n):
+        parts = [f"# Runbook {i}", paragraph()]
+        for s in range(rng.integers(3, 9)):
+            parts += [f"## Section {s}", paragraph()]
+            for sub in range(rng.integers(0, 4)):
+                parts += [f"### Step {s}.{sub}"] + [paragraph() for _ in range(rng.integers(1, 3))]
+        documents.append("\n\n".join(parts))
+    return documents
+
+
+def with_copies(documents: List[str], seed: int = 0) -> List[str]:
+    """Append derived documents: a new title and intro, then 1-3 sections of an original with ~3% of words changed."""
+    rng = np.random.default_rng(seed)
+    copies = []
+    for i in rng.choice(len(documents), int(len(documents) * COPIED_SHARE), replace=False):
+        sections = documents[i].split("\n\n## ")[1:]
+        picked = rng.choice(len(sections), min(len(sections), rng.integers(1, 4)), replace=False)
+        parts = [f"# Runbook copy {i}", "Copied for the on-call rotation; the original is the source of truth."]
+        for s in sorted(picked):
+            words = sections[s].split(" ")
+            for w in rng.integers(0, len(words), max(1, int(len(words) * EDITED_WORD_SHARE))):
+                words[w] = "revised"
+            parts.append("## " + " ".join(words))
+        copies.append("\n\n".join(parts))
+    return documents + copies
+
+
+def shingles(text: str) -> Set[str]:
+    words = text.lower().split()
+    return {" ".join(words[i:i + 3]) for i in range(max(len(words) - 2, 1))}
+
+
+def main() -> None:
+    documents = with_copies(runbooks(DOCUMENTS))
+    chunks: List[Document] = []
+    start = time.perf_counter()
+    for i, text in enumerate(documents):
+        doc_chunks = add_signatures(split_markdown_sections(text, AKS_DOC_CHUNK_TOKENS, {"doc_id": f"doc-{i}"}))
+        for chunk, chunk_id in zip(doc_chunks, chunk_ids(str(i), doc_chunks)):
+            chunk.id = chunk_id
+        chunks.extend(doc_chunks)
+    signing_ms = (time.perf_counter() - start) * 1000
+
+    index = BM25Index()
+    index.add([c.id for c in chunks], [c.page_content for c in chunks], [c.metadata for c in chunks])
+    print(f"{len(documents):,} documents ({len(documents) - DOCUMENTS} partial copies), {len(chunks):,} chunks; "
+          f"chunking + signatures {signing_ms:.0f} ms; BM25 retrieval, k={K}")
+
+    rng = np.random.default_rng(1)
+    originals = [c for c in chunks if int(c.metadata["doc_id"].split("-")[1]) < DOCUMENTS]
+    targets = [originals[i] for i in rng.choice(len(originals), QUERIES, replace=False)]
+    queries = []
+    for target in targets:
+        words = target.page_content.split()
+        at = rng.integers(0, max(len(words) - QUERY_WORDS, 1))
+        queries.append(" ".join(words[at:at + QUERY_WORDS]))
+
+    # As the search tools do: retrieve near_duplicate_candidates(k), fold near-duplicates, keep k.
+    # Over-fetch 1 keeps the token saving but can return fewer than k results.
+    runs = [
+        ("top-k as retrieved", False, 1),
+        ("suppressed, over-fetch 1", True, 1),
+        (f"suppressed, over-fetch {NEAR_DUPLICATE_OVERFETCH:g}", True, NEAR_DUPLICATE_OVERFETCH)
+    ]
+    for label, dedupe, overfetch in runs:
+        tokens, redundant, returned, found, elapsed = [], [], [], 0, 0.0
+        for target, query in zip(targets, queries):
+            hits = index.search(query, near_duplicate_candidates(K, overfetch))
+            if dedupe:
+                start = time.perf_counter()
+                hits = [(doc, score) for doc, score, _ in suppress_near_duplicates(hits)[:K]]
+                elapsed += time.perf_counter() - start
+
+            texts = [doc.page_content for doc, _ in hits]
+            returned.append(len(texts))
+            tokens.append(sum(estimate_token_count(t) for t in texts))
+            seen: Set[str] = set()
+            repeated = total = 0
+            for t in texts:
+                s = shingles(t)
+                repeated += len(s & seen)
+                total += len(s)
+                seen |= s
+            redundant.append(repeated / max(total, 1))
+            target_shingles = shingles(target.page_content)
+            found += len(target_shingles & seen) >= 0.8 * len(target_shingles)
+
+        print(f"   {label:28s} {np.mean(returned):4.1f} results {np.mean(tokens):6.0f} tokens/retrieval   "
+              f"repeated text {np.mean(redundant):5.1%}   "
+              f"target passage retrieved {found / QUERIES:6.1%}"
+              + (f"   dedupe {elapsed / QUERIES * 1000:.2f} ms/query" if dedupe else ""))
+
+
+if __name__ == "__main__":
+    main()
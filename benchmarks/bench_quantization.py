@@ -0,0 +1,77 @@
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.core.vector_backends import NumpyCollection
+
+SIZES = [20_000, 100_000]
+DIMENSIONS = 1536
+QUERIES = 200
+K = 10
+
+
+def embedding_like_vectors(n: int, dims: int, seed: int = 0) -> np.ndarray:
+    """
+    Unit vectors with topic structure and low intrinsic dimension: points
+    scattered around topic centres in a 64-d latent space, projected up to
+    `dims`, plus isotropic noise.
+    """
+    rng = np.random.default_rng(seed)
+    projection = rng.standard_normal((64, dims)).astype(np.float32)
+    topics = rng.standard_normal((max(n // 200, 16), 64)).astype(np.float32)
+    vectors = np.empty((n, dims), dtype=np.float32)
+    for at in range(0, n, 10_000):
+        rows = min(10_000, n - at)
+        latent = topics[rng.integers(0, len(topics), rows)] + 0.7 * rng.standard_normal((rows, 64)).astype(np.float32)
+        vectors[at:at + rows] = latent @ projection + 2.0 * rng.standard_normal((rows, dims)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int) -> list:
+    norms = np.einsum("ij,ij->i", vectors, vectors)
+    truth = []
+    for at in range(0, len(queries), 50):
+        distances = norms[None, :] - 2 * queries[at:at + 50] @ vectors.T
+        truth.extend(set(row) for row in np.argpartition(distances, k, axis=1)[:, :k])
+    return truth
+
+
+def main() -> None:
+    for n in SIZES:
+        vectors = embedding_like_vectors(n, DIMENSIONS)
+        rng = np.random.default_rng(1)
+        queries = vectors[rng.integers(0, n, QUERIES)] + 0.02 * rng.standard_normal((QUERIES, DIMENSIONS)).astype(np.float32)
+        truth = exact_top_k(vectors, queries, K)
+        ids = [str(i) for i in range(n)]
+
+        print(f"\n{n:,} vectors x {DIMENSIONS} dims, {QUERIES} queries, k={K} "
+              f"({'exact scan' if n <= 20_000 else 'IVF'} + full-precision re-rank of quantized shortlists)")
+        baseline = None
+        with tempfile.TemporaryDirectory() as tmp:
+            for quantization in [None, "int8", "pq"]:
+                collection = NumpyCollection("bench", Path(tmp) / f"{quantization}.vec", quantization=quantization)
+                collection.upsert(ids, vectors, ids, [{}] * n)
+                start = time.perf_counter()
+                collection.persist()
+                build_s = time.perf_counter() - start
+
+                latencies, recalls = [], []
+                for query, want in zip(queries, truth):
+                    start = time.perf_counter()
+                    found = collection.query([query], n_results=K, include=[])["ids"][0]
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    recalls.append(len({int(i) for i in found} & want) / K)
+
+                memory = collection.scan_bytes()
+                recall = float(np.mean(recalls))
+                baseline = baseline or (memory, recall)
+                print(f"   {quantization or 'float32':7s} build {build_s:6.1f}s  resident {memory / 2**20:7.1f} MB "
+                      f"({baseline[0] / memory:5.1f}x smaller)  p50 {np.percentile(latencies, 50):6.2f} ms  "
+                      f"p99 {np.percentile(latencies, 99):6.2f} ms  recall@{K} {recall:.3f} "
+                      f"(loss {baseline[1] - recall:+.3f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+import src.core.vector_store as vector_store
+from benchmarks.bench_federated_search import synthetic_chunks
+from benchmarks.bench_ingestion import SimulatedEmbeddings
+from src.core.document_sources import CollectionSpec
+from src.core.embedding_cache import QueryEmbeddingCache
+from src.core.result_cache import SearchResultCache
+from src.tools.search_tools import search_team_documents
+
+CHUNKS = 50_000
+DIMENSIONS = 384
+DISTINCT_QUERIES = 300
+CALLS = 3000
+K = 5
+EMBEDDING_REQUEST_MS = 40.0
+
+
+def percentiles_us(latencies) -> str:
+    p50, p99 = np.percentile(np.array(latencies) * 1e6, [50, 99])
+    return f"p50 {p50:9.1f} us   p99 {p99:9.1f} us"
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "sources"
+        source.mkdir()
+        (source / "team_docs.txt").write_text(str(CHUNKS))
+        registry = vector_store.VectorStoreRegistry(
+            str(Path(tmp) / "store"), {"team_docs": CollectionSpec("team_docs", str(source), "*.txt", synthetic_chunks)},
+            SimulatedEmbeddings(DIMENSIONS, request_ms=0.0, per_token_us=0.0),
+            QueryEmbeddingCache(str(Path(tmp) / "queries.db")), SearchResultCache(), backend="numpy", snapshot=None
+        )
+        registry.warm_up()
+        registry.embeddings.request_ms = EMBEDDING_REQUEST_MS
+        vector_store._registry = registry
+        search = search_team_documents.func
+
+        # Popular questions recur (Zipf), with casing and punctuation varying between users
+        rng = np.random.default_rng(0)
+        picks = np.minimum(rng.zipf(1.2, CALLS), DISTINCT_QUERIES) - 1
+        spellings = [str, lambda q: q + "?", lambda q: f"  {q}  ", str.capitalize]
+        calls = [spellings[rng.integers(len(spellings))](f"how do we rotate secrets {q}") for q in picks]
+
+        print(f"team_docs {CHUNKS:,} chunks x {DIMENSIONS} dims (numpy backend), k={K}, "
+              f"{EMBEDDING_REQUEST_MS:.0f} ms embedding request; {CALLS:,} calls over {DISTINCT_QUERIES} questions (Zipf)")
+
+        hits, misses = [], []
+        for query in calls:
+            before = registry.result_cache_stats().get("search_team_documents", {}).get("hits", 0)
+            start = time.perf_counter()
+            search(query, K)
+            elapsed = time.perf_counter() - start
+            (hits if registry.result_cache_stats()["search_team_documents"]["hits"] > before else misses).append(elapsed)
+
+        stats = registry.result_cache_stats()["search_team_documents"]
+        print(f"   miss (search)   {len(misses):5,} calls   {percentiles_us(misses)}")
+        print(f"   hit  (cache)    {len(hits):5,} calls   {percentiles_us(hits)}")
+        print(f"   hit rate {stats['hit_rate']:.1%}; mean {np.mean(hits + misses) * 1000:.2f} ms/call "
+              f"vs {np.mean(misses) * 1000:.2f} ms/call uncached")
+
+        (source / "team_docs.txt").write_text(str(CHUNKS + 1))
+        version = registry.index_version("team_docs")
+        start = time.perf_counter()
+        registry.reindex(["team_docs"])
+        reindex_ms = (time.perf_counter() - start) * 1000
+        before = registry.result_cache_stats()["search_team_documents"]["misses"]
+        search(calls[0], K)
+        missed = registry.result_cache_stats()["search_team_documents"]["misses"] > before
+        print(f"\nre-index adding 1 chunk ({reindex_ms:.0f} ms): index version {version} -> "
+              f"{registry.index_version('team_docs')}, {len(registry.result_cache._entries)} entries left, "
+              f"next repeat search {'recomputed' if missed else 'SERVED STALE'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.core.vector_backends import ChromaBackend, NumpyBackend
+
+SIZES = [5_000, 200_000]
+DIMENSIONS = 384
+QUERIES = 500
+K = 10
+
+
+def clustered_vectors(n: int, dims: int, seed: int = 0) -> np.ndarray:
+    """Gaussian blobs around random topic centres, roughly how text embeddings clump."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((max(n // 500, 8), dims)).astype(np.float32)
+    vectors = centres[rng.integers(0, len(centres), n)] + 0.6 * rng.standard_normal((n, dims)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int) -> list:
+    norms = np.einsum("ij,ij->i", vectors, vectors)
+    truth = []
+    for at in range(0, len(queries), 50):
+        distances = norms[None, :] - 2 * queries[at:at + 50] @ vectors.T
+        truth.extend({f"c{i}" for i in row} for row in np.argpartition(distances, k, axis=1)[:, :k])
+    return truth
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def build(backend_name: str, store_dir: Path, vectors: np.ndarray) -> float:
+    backend = (ChromaBackend if backend_name == "chroma" else NumpyBackend)(store_dir)
+    collection = backend.open("bench")
+    start = time.perf_counter()
+    step = backend.client.get_max_batch_size() if backend_name == "chroma" else 50_000
+    for at in range(0, len(vectors), step):
+        ids = [f"c{i}" for i in range(at, min(at + step, len(vectors)))]
+        collection.upsert(ids=ids, embeddings=vectors[at:at + step], documents=ids, metadatas=[{"n": 0}] * len(ids))
+    backend.persist(collection)
+    return time.perf_counter() - start
+
+
+def run(backend_name: str, store_dir: str, queries_path: str) -> None:
+    queries = np.load(queries_path)
+    base_rss = rss_mb()
+
+    start = time.perf_counter()
+    backend = (ChromaBackend if backend_name == "chroma" else NumpyBackend)(Path(store_dir))
+    collection = backend.open("bench")
+    collection.query(query_embeddings=queries[:1].tolist(), n_results=K)
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    latencies, ids = [], []
+    for query in queries:
+        start = time.perf_counter()
+        result = collection.query(query_embeddings=[query.tolist()], n_results=K)
+        latencies.append((time.perf_counter() - start) * 1000)
+        ids.append(result["ids"][0])
+
+    print(json.dumps({
+        "cold_ms": cold_ms,
+        "rss_mb": rss_mb() - base_rss,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "ids": ids
+    }))
+
+
+def main() -> None:
+    for n in SIZES:
+        vectors = clustered_vectors(n, DIMENSIONS)
+        queries = vectors[np.random.default_rng(1).integers(0, n, QUERIES)]
+        queries = queries + 0.05 * np.random.default_rng(2).standard_normal(queries.shape).astype(np.float32)
+        truth = exact_top_k(vectors, queries, K)
+
+        print(f"\n{n:,} vectors x {DIMENSIONS} dims, {QUERIES} queries, k={K}")
+        with tempfile.TemporaryDirectory() as tmp:
+            np.save(Path(tmp) / "queries.npy", queries)
+            for backend_name in ["chroma", "numpy"]:
+                store_dir = Path(tmp) / backend_name
+                build_s = build(backend_name, store_dir, vectors)
+                disk_mb = sum(f.stat().st_size for f in store_dir.rglob("*") if f.is_file()) / 2**20
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_vector_backends", "--run", backend_name, str(store_dir),
+                     str(Path(tmp) / "queries.npy")],
+                    check=True, capture_output=True, text=True
+                ).stdout
+                stats = json.loads(out.strip().splitlines()[-1])
+                recall = np.mean([len(set(ids) & want) / K for ids, want in zip(stats["ids"], truth)])
+                print(f"   {backend_name:7s} build {build_s:6.1f}s  disk {disk_mb:7.1f} MB  cold load {stats['cold_ms']:8.1f} ms  "
+                      f"RSS +{stats['rss_mb']:6.1f} MB  p50 {stats['p50_ms']:6.2f} ms  p99 {stats['p99_ms']:6.2f} ms  "
+                      f"recall@{K} {recall:.3f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--run":
+        run(*sys.argv[2:5])
+    else:
+        main()
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+FIRST_NAMES = [
+    "Sarah", "John", "Priya", "Michael", "Emily", "David", "Aisha", "Carlos", "Wei", "Olivia",
+    "James", "Fatima", "Liam", "Sofia", "Noah", "Maria", "Daniel", "Grace", "Omar", "Hannah",
+    "Lucas", "Mei", "Ethan", "Chloe", "Ravi", "Zoe", "Mateo", "Ava", "Kenji", "Nora",
+]
+SYLLABLES = ["ch", "en", "sm", "ith", "pa", "tel", "gar", "cia", "ki", "m", "ngu", "yen",
+             "br", "own", "lo", "pez", "kh", "an", "mil", "ler", "da", "vis", "wil", "son"]
+ROLES = ["Data Scientist", "Senior Data Scientist", "ML Engineer", "Software Engineer",
+         "Product Manager", "Engineering Manager", "Director", "Data Engineer", "Analyst"]
+DEPARTMENTS = ["Digital Workplace AI", "Lumina Platform", "Cloud Infrastructure", "Analytics",
+               "Pharmacy Systems", "Member Experience", "Security Engineering"]
+LOCATIONS = ["Boston", "Woonsocket", "New York", "Remote", "Hartford", "Scottsdale", "Dallas", "Chicago"]
+
+
+def make_employees(n: int, seed: int = 0, fanout: int = 8) -> pd.DataFrame:
+    """
+    Synthetic employees.csv with the real column layout and a balanced reporting tree.
+
+    Args:
+        n: Number of employees
+        seed: Random seed
+        fanout: Direct reports per manager
+
+    Returns:
+        DataFrame with the same columns as data/employees.csv
+    """
+    rng = np.random.default_rng(seed)
+
+    syllables = np.array(SYLLABLES, dtype=object)
+    last = (syllables[rng.integers(0, len(SYLLABLES), n)] + syllables[rng.integers(0, len(SYLLABLES), n)]
+            + syllables[rng.integers(0, len(SYLLABLES), n)])
+    last = np.array([s.capitalize() for s in last], dtype=object)
+    full_name = np.array(FIRST_NAMES, dtype=object)[rng.integers(0, len(FIRST_NAMES), n)] + " " + last
+
+    ids = np.arange(n)
+    manager_idx = (ids - 1) // fanout
+    manager = np.where(ids > 0, full_name[np.maximum(manager_idx, 0)], "")
+
+    start = pd.Timestamp("2010-01-01") + pd.to_timedelta(rng.integers(0, 5000, n), unit="D")
+
+    return pd.DataFrame({
+        "employee_id": [f"E{i:07d}" for i in ids],
+        "full_name": full_name,
+        "role": np.array(ROLES, dtype=object)[rng.integers(0, len(ROLES), n)],
+        "department": np.array(DEPARTMENTS, dtype=object)[rng.integers(0, len(DEPARTMENTS), n)],
+        "location": np.array(LOCATIONS, dtype=object)[rng.integers(0, len(LOCATIONS), n)],
+        "office": [f"Office {k}" for k in rng.integers(1, 40, n)],
+        "start_date": start.strftime("%Y-%m-%d"),
+        "manager": manager,
+        "email": [name.lower().replace(" ", ".") + f"{i}@cvs.com" for i, name in enumerate(full_name)],
+    })
+
+
+def write_employees_csv(path: str, n: int, seed: int = 0) -> None:
+    make_employees(n, seed).to_csv(path, index=False)
@@ -0,0 +1,348 @@
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Union
+
+import numpy as np
+
+from src.core.cost_utils import MODEL_PRICING
+from src.core.logging_utils import LOG_DB_PATH
+
+DAYS_PER_MONTH = 30
+DEFAULT_QUERIES_PER_USER_PER_DAY = 5
+DEFAULT_SAMPLES = 100_000
+
+CHAT_MODELS = [m for m in MODEL_PRICING if not m.startswith("text-embedding")]
+
+
+@dataclass
+class QueryDistributions:
+    """Empirical per-query distributions loaded from the query log."""
+    features: List[str]
+    models: List[str]
+    feature_codes: np.ndarray
+    model_codes: np.ndarray
+    prompt_tokens: np.ndarray
+    completion_tokens: np.ndarray
+    latency_ms: np.ndarray
+    offsets: np.ndarray
+    counts: np.ndarray
+
+    @property
+    def n_queries(self) -> int:
+        return len(self.prompt_tokens)
+
+    @property
+    def mix(self) -> np.ndarray:
+        return self.counts / self.counts.sum()
+
+
+def load_query_distributions(db_path: str = LOG_DB_PATH) -> Optional[QueryDistributions]:
+    """
+    Load successful queries from the log as per-feature empirical samples.
+
+    Args:
+        db_path: Path to the SQLite query log
+
+    Returns:
+        QueryDistributions grouped by feature, or None if the log is empty
+    """
+    if not Path(db_path).exists():
+        return None
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT feature, model, prompt_tokens, completion_tokens, COALESCE(latency_ms, 0)
+        FROM queries
+        WHERE success = 1
+        ORDER BY feature
+    """)
+    rows = cursor.fetchall()
+    conn.close()
+
+    if not rows:
+        return None
+
+    features, models, prompt, completion, latency = zip(*rows)
+    feature_names, feature_codes, counts = np.unique(features, return_inverse=True, return_counts=True)
+    model_names, model_codes = np.unique(models, return_inverse=True)
+
+    return QueryDistributions(
+        features=feature_names.tolist(),
+        models=model_names.tolist(),
+        feature_codes=feature_codes,
+        model_codes=model_codes,
+        prompt_tokens=np.asarray(prompt, dtype=np.float64),
+        completion_tokens=np.asarray(completion, dtype=np.float64),
+        latency_ms=np.asarray(latency, dtype=np.float64),
+        offsets=np.concatenate([[0], np.cumsum(counts)[:-1]]),
+        counts=counts
+    )
+
+
+def adoption_curve(
+    months: Union[int, Sequence[int]],
+    ceiling: float = 0.8,
+    midpoint: float = 6.0,
+    steepness: float = 0.8
+) -> np.ndarray:
+    """
+    Logistic adoption curve: fraction of licensed users active in a given month.
+
+    Args:
+        months: Month number(s) since launch
+        ceiling: Long-run adoption fraction
+        midpoint: Month at which adoption reaches half the ceiling
+        steepness: Logistic growth rate
+
+    Returns:
+        Adoption fraction per month
+    """
+    months = np.atleast_1d(np.asarray(months, dtype=np.float64))
+    return ceiling / (1.0 + np.exp(-steepness * (months - midpoint)))
+
+
+def _price_vectors(dist: QueryDistributions, models: Sequence[Optional[str]]) -> np.ndarray:
+    """Per-row input/output prices ($/1M tokens) for each requested model; None keeps the logged model."""
+    default = {"input": 2.50, "output": 10.00}
+    logged = np.array([
+        [MODEL_PRICING.get(m, default)["input"], MODEL_PRICING.get(m, default)["output"]]
+        for m in dist.models
+    ])
+
+    prices = np.empty((len(models), 2, dist.n_queries))
+    for i, model in enumerate(models):
+        if model is None:
+            prices[i] = logged[dist.model_codes].T
+        else:
+            pricing = MODEL_PRICING.get(model, default)
+            prices[i, 0] = pricing["input"]
+            prices[i, 1] = pricing["output"]
+    return prices
+
+
+def _sample_rows(dist: QueryDistributions, n: int, rng: np.random.Generator) -> np.ndarray:
+    """Draw log rows by first drawing a feature from the query mix, then a query within it."""
+    feature_idx = rng.choice(len(dist.features), size=n, p=dist.mix)
+    within = (rng.random(n) * dist.counts[feature_idx]).astype(np.int64)
+    return dist.offsets[feature_idx] + within
+
+
+def _sample_monthly_multipliers(
+    dist: QueryDistributions,
+    models: Sequence[Optional[str]],
+    n_samples: int,
+    activity_sigma: float,
+    adoption_sigma: float,
+    rng: np.random.Generator
+) -> Dict[str, np.ndarray]:
+    """
+    Draw Monte Carlo samples of (monthly queries per expected query, cost per expected query).
+
+    Each sample combines user-activity and adoption uncertainty (lognormal, mean 1)
+    with the sampling uncertainty of the per-query cost mean, which is estimated
+    from a query-mix draw of the log and shrinks with the log size. The same
+    random numbers are shared by every model (common random numbers), so model
+    comparisons are not blurred by sampling noise.
+    """
+    rows = _sample_rows(dist, n_samples, rng)
+    prices = _price_vectors(dist, models)[:, :, rows]
+    query_costs = (dist.prompt_tokens[rows] * prices[:, 0] + dist.completion_tokens[rows] * prices[:, 1]) / 1_000_000
+
+    mean_cost = query_costs.mean(axis=1)
+    std_cost = query_costs.std(axis=1)
+
+    activity = rng.lognormal(-activity_sigma ** 2 / 2, activity_sigma, n_samples)
+    adoption = rng.lognormal(-adoption_sigma ** 2 / 2, adoption_sigma, n_samples)
+    volume = activity * adoption
+
+    z = rng.standard_normal(n_samples)
+    per_query = np.maximum(mean_cost[:, None] + std_cost[:, None] / np.sqrt(dist.n_queries) * z, 0.0)
+
+    return {
+        "volume": volume,
+        "cost": volume * per_query,
+        "latency_ms": dist.latency_ms[rows],
+        "mean_cost_per_query": mean_cost
+    }
+
+
+def _interval(samples: np.ndarray, confidence: float) -> np.ndarray:
+    tail = (1.0 - confidence) / 2
+    return np.quantile(samples, [tail, 0.5, 1.0 - tail], axis=-1)
+
+
+def project_cost_distribution(
+    num_users: int,
+    adoption: float = 1.0,
+    queries_per_user_per_day: float = DEFAULT_QUERIES_PER_USER_PER_DAY,
+    model: Optional[str] = None,
+    n_samples: int = DEFAULT_SAMPLES,
+    confidence: float = 0.90,
+    activity_sigma: float = 0.35,
+    adoption_sigma: float = 0.15,
+    seed: Optional[int] = None,
+    db_path: str = LOG_DB_PATH
+) -> Dict[str, Any]:
+    """
+    Monte Carlo projection of monthly cost for a single scenario.
+
+    Args:
+        num_users: Number of licensed users
+        adoption: Fraction of users actively using the system
+        queries_per_user_per_day: Expected queries per active user daily
+        model: Price every query at this model's rates (None = as logged)
+        n_samples: Number of Monte Carlo samples
+        confidence: Width of the reported confidence interval
+        activity_sigma: Lognormal spread of per-user activity
+        adoption_sigma: Lognormal spread of the adoption estimate
+        seed: Random seed for reproducible projections
+        db_path: Path to the SQLite query log
+
+    Returns:
+        {
+            "monthly_cost_usd": {"mean", "low", "median", "high"},
+            "monthly_queries": {"mean", "low", "median", "high"},
+            "cost_per_user_per_month": {"low", "median", "high"},
+            "latency_ms": {"p50", "p95"},
+            "query_mix": {feature: share},
+            ...
+        }
+    """
+    dist = load_query_distributions(db_path)
+    if dist is None:
+        return {"error": "No query data found. Run some features first."}
+
+    rng = np.random.default_rng(seed)
+    samples = _sample_monthly_multipliers(dist, [model], n_samples, activity_sigma, adoption_sigma, rng)
+
+    expected_queries = num_users * adoption * queries_per_user_per_day * DAYS_PER_MONTH
+    queries = expected_queries * samples["volume"]
+    cost = expected_queries * samples["cost"][0]
+
+    cost_low, cost_median, cost_high = _interval(cost, confidence)
+    queries_low, queries_median, queries_high = _interval(queries, confidence)
+    latency_p50, latency_p95 = np.quantile(samples["latency_ms"], [0.5, 0.95])
+
+    return {
+        "num_users": num_users,
+        "adoption": adoption,
+        "queries_per_user_per_day": queries_per_user_per_day,
+        "model": model or "as_logged",
+        "confidence": confidence,
+        "n_samples": n_samples,
+        "monthly_cost_usd": {
+            "mean": round(float(cost.mean()), 2),
+            "low": round(float(cost_low), 2),
+            "median": round(float(cost_median), 2),
+            "high": round(float(cost_high), 2)
+        },
+        "monthly_queries": {
+            "mean": int(queries.mean()),
+            "low": int(queries_low),
+            "median": int(queries_median),
+            "high": int(queries_high)
+        },
+        "cost_per_user_per_month": {
+            "low": round(float(cost_low) / num_users, 4),
+            "median": round(float(cost_median) / num_users, 4),
+            "high": round(float(cost_high) / num_users, 4)
+        },
+        "latency_ms": {
+            "p50": round(float(latency_p50), 1),
+            "p95": round(float(latency_p95), 1)
+        },
+        "query_mix": {f: round(float(share), 4) for f, share in zip(dist.features, dist.mix)},
+        "log_queries": dist.n_queries
+    }
+
+
+def sweep_cost_scenarios(
+    user_counts: Sequence[int],
+    adoption: Sequence[float] = (1.0,),
+    queries_per_user_per_day: Sequence[float] = (DEFAULT_QUERIES_PER_USER_PER_DAY,),
+    models: Optional[Sequence[Optional[str]]] = None,
+    n_samples: int = DEFAULT_SAMPLES,
+    confidence: float = 0.90,
+    activity_sigma: float = 0.35,
+    adoption_sigma: float = 0.15,
+    seed: Optional[int] = None,
+    db_path: str = LOG_DB_PATH
+) -> Dict[str, Any]:
+    """
+    Monte Carlo projection over the full grid of users × adoption × usage × model.
+
+    Every scenario is a positive rescaling of its model's sample vector, so the
+    sample quantiles are computed once per price table and rescaled per scenario.
+    This is identical to sampling each scenario with common random numbers and
+    keeps a 10k-scenario sweep at 100k samples well under a second.
+
+    Args:
+        user_counts: Licensed user counts to sweep
+        adoption: Adoption fractions to sweep (see adoption_curve)
+        queries_per_user_per_day: Usage levels to sweep
+        models: Price tables to sweep (default: every chat model in MODEL_PRICING)
+        n_samples: Monte Carlo samples per scenario
+        confidence: Width of the reported confidence intervals
+        activity_sigma: Lognormal spread of per-user activity
+        adoption_sigma: Lognormal spread of the adoption estimate
+        seed: Random seed for reproducible projections
+        db_path: Path to the SQLite query log
+
+    Returns:
+        {
+            "scenarios": List of {num_users, adoption, queries_per_user_per_day, model,
+                                  monthly_cost_usd: {mean, low, median, high}},
+            "scenario_count": int,
+            "elapsed_ms": float
+        }
+    """
+    start = time.perf_counter()
+
+    dist = load_query_distributions(db_path)
+    if dist is None:
+        return {"error": "No query data found. Run some features first."}
+
+    models = list(models) if models is not None else CHAT_MODELS
+    rng = np.random.default_rng(seed)
+    samples = _sample_monthly_multipliers(dist, models, n_samples, activity_sigma, adoption_sigma, rng)
+
+    stats = np.vstack([samples["cost"].mean(axis=1)[None, :], _interval(samples["cost"], confidence)])
+
+    users, adopt, qpd, model_idx = np.meshgrid(
+        np.asarray(user_counts, dtype=np.float64),
+        np.asarray(adoption, dtype=np.float64),
+        np.asarray(queries_per_user_per_day, dtype=np.float64),
+        np.arange(len(models)),
+        indexing="ij"
+    )
+    users, adopt, qpd, model_idx = users.ravel(), adopt.ravel(), qpd.ravel(), model_idx.ravel()
+
+    scale = users * adopt * qpd * DAYS_PER_MONTH
+    projected = np.round(stats[:, model_idx] * scale, 2)
+
+    scenarios = [
+        {
+            "num_users": int(users[i]),
+            "adoption": float(adopt[i]),
+            "queries_per_user_per_day": float(qpd[i]),
+            "model": models[model_idx[i]] or "as_logged",
+            "monthly_cost_usd": {
+                "mean": float(projected[0, i]),
+                "low": float(projected[1, i]),
+                "median": float(projected[2, i]),
+                "high": float(projected[3, i])
+            }
+        }
+        for i in range(len(scale))
+    ]
+
+    return {
+        "scenarios": scenarios,
+        "scenario_count": len(scenarios),
+        "n_samples": n_samples,
+        "confidence": confidence,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)
+    }
@@ -0,0 +1,123 @@
+import re
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+GROUP_COLUMNS = ["location", "role", "department"]
+
+GroupKey = Tuple[Optional[str], ...]
+
+
+def _codes(column: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy(), column.cat.categories
+    codes, uniques = pd.factorize(column)
+    return codes, pd.Index(uniques)
+
+
+def _group_keys(df: pd.DataFrame, rows: np.ndarray) -> Counter:
+    """Count the (location, role, department) keys of the given rows; missing values become None."""
+    if len(rows) == 0:
+        return Counter()
+    values = [df[col].iloc[rows].to_numpy(dtype=object) for col in GROUP_COLUMNS]
+    return Counter(tuple(None if pd.isna(v) else v for v in key) for key in zip(*values))
+
+
+class DirectoryAggregates:
+    """
+    Head counts per (location, role, department) group.
+
+    Summaries are answered from the group table, so their cost scales with
+    the number of distinct groups rather than the number of employees.
+    """
+
+    def __init__(self, counts: Dict[GroupKey, int]):
+        self.counts = {key: count for key, count in counts.items() if count > 0}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "DirectoryAggregates":
+        sizes = df.groupby(GROUP_COLUMNS, observed=True, dropna=False).size()
+        return cls({
+            tuple(None if pd.isna(v) else v for v in key): int(count)
+            for key, count in sizes.items()
+        })
+
+    def apply_diff(self, removed: Counter, added: Counter) -> "DirectoryAggregates":
+        counts = Counter(self.counts)
+        counts.subtract(removed)
+        counts.update(added)
+        return DirectoryAggregates(counts)
+
+    def summary(self, location: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Location summary, optionally for locations containing `location`
+        (case-insensitive regex search, like Series.str.contains).
+        """
+        counts = self.counts.items()
+        if location:
+            pattern = re.compile(location, re.IGNORECASE)
+            counts = [(key, count) for key, count in counts if key[0] is not None and pattern.search(key[0])]
+
+        total = 0
+        locations: Counter = Counter()
+        by_location_and_role: Counter = Counter()
+        departments: Counter = Counter()
+        for (loc, role, department), count in counts:
+            total += count
+            if loc is not None:
+                locations[loc] += count
+                if role is not None:
+                    by_location_and_role[(loc, role)] += count
+            if department is not None:
+                departments[department] += count
+
+        return {
+            "total_employees": total,
+            "locations": dict(sorted(locations.items(), key=lambda kv: -kv[1])),
+            "by_location_and_role": [
+                {"location": loc, "role": role, "count": count}
+                for (loc, role), count in sorted(by_location_and_role.items())
+            ],
+            "departments": dict(sorted(departments.items(), key=lambda kv: -kv[1]))
+        }
+
+
+def diff_rows(old: pd.DataFrame, new: pd.DataFrame) -> Optional[Tuple[Counter, Counter]]:
+    """
+    Group keys removed from and added to the directory between two loads.
+
+    Handles the common reload shapes, edits in place and rows appended at
+    the end, by comparing category codes row by row; only rows whose group
+    columns differ are materialized. Returns None when employee_id order
+    changed otherwise (rows deleted or reordered): aligning a million ids
+    by hash costs more than recounting from scratch.
+    """
+    if "employee_id" not in old.columns or "employee_id" not in new.columns or len(new) < len(old):
+        return None
+    if not new["employee_id"].iloc[:len(old)].reset_index(drop=True).equals(old["employee_id"].reset_index(drop=True)):
+        return None
+
+    n = len(old)
+    changed = np.zeros(n, dtype=bool)
+    for col in GROUP_COLUMNS:
+        old_codes, old_categories = _codes(old[col])
+        new_codes, new_categories = _codes(new[col].iloc[:n])
+        # Express old codes in the new column's categories before comparing;
+        # a value that vanished from the categories maps to -1.
+        remap = np.append(new_categories.get_indexer(old_categories), -1)
+        old_in_new = remap[old_codes]
+        changed |= (old_in_new != new_codes) | ((old_in_new < 0) & (old_codes >= 0))
+
+    rows = np.flatnonzero(changed)
+    return _group_keys(old, rows), _group_keys(new, np.concatenate([rows, np.arange(n, len(new))]))
+
+
+def build_aggregates(df: pd.DataFrame, previous: Optional[Tuple[pd.DataFrame, DirectoryAggregates]] = None) -> DirectoryAggregates:
+    """Aggregates for a directory snapshot, patched from the previous snapshot's when the rows can be aligned."""
+    if previous is not None:
+        diff = diff_rows(previous[0], df)
+        if diff is not None:
+            return previous[1].apply_diff(*diff)
+    return DirectoryAggregates.from_frame(df)
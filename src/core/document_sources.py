@@ -0,0 +1,151 @@
+import json
+import os
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from langchain.schema import Document
+
+from src.core.markdown_chunker import split_markdown_sections
+from src.core.near_duplicates import add_signatures
+from src.core.vector_backends import QUANTIZATION_MODES
+
+# Chunk budgets in estimated tokens
+TEAM_DOC_CHUNK_TOKENS = 160
+AKS_DOC_CHUNK_TOKENS = 200
+
+
+@dataclass(frozen=True)
+class CollectionSpec:
+    """
+    Where a vector collection's documents come from and how each source file is chunked.
+
+    `quantization` ("int8" or "pq") stores the collection's vectors as
+    compact codes with full-precision re-ranking (numpy backend only, see
+    src.core.vector_backends.NumpyCollection). The built-in collections
+    take it from VECTOR_QUANTIZATION_<COLLECTION>.
+
+    `embedding_dimensions` requests shortened vectors from the embedding
+    model (the `dimensions` parameter of text-embedding-3-*) for both
+    indexing and queries; None keeps the model's native width. It is
+    recorded in the collection's manifest, and changing it re-embeds the
+    collection on the next sync.
+
+    `chunking` names the chunking rules `load_chunks` applies. It is
+    recorded in the manifest too; changing it re-chunks every source file
+    on the next sync, and only chunks whose text changed are re-embedded.
+    """
+    name: str
+    source_dir: str
+    pattern: str
+    load_chunks: Callable[[Path], List[Document]]
+    quantization: Optional[str] = None
+    embedding_dimensions: Optional[int] = None
+    chunking: str = ""
+
+    def source_files(self) -> List[Path]:
+        return sorted(Path(self.source_dir).glob(self.pattern))
+
+
+def load_team_doc_chunks(path: Path) -> List[Document]:
+    text = path.read_text(encoding="utf-8")
+    return add_signatures(
+        split_markdown_sections(text, TEAM_DOC_CHUNK_TOKENS, {"source": path.name, "type": "team_doc"})
+    )
+
+
+def load_aks_doc_chunks(path: Path) -> List[Document]:
+    text = path.read_text(encoding="utf-8")
+    return add_signatures(split_markdown_sections(
+        text, AKS_DOC_CHUNK_TOKENS, {"source": path.name, "type": "internal_kb", "doc_id": path.stem}
+    ))
+
+
+def load_video_transcript(path: Path) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def date_number(value: str) -> int:
+    """
+    An ISO date as a sortable integer ("2024-10-15" -> 20241015), since
+    Chroma's range filters ($gt, $lte, ...) only compare numbers.
+
+    Raises:
+        ValueError: If `value` is not a YYYY-MM-DD date
+    """
+    try:
+        parsed = date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid date '{value}'. Use YYYY-MM-DD") from None
+    return parsed.year * 10000 + parsed.month * 100 + parsed.day
+
+
+def load_video_chunks(path: Path) -> List[Document]:
+    """One chunk per transcript segment, carrying the video's metadata (and `date_number` for range filters)."""
+    video_data = load_video_transcript(path)
+
+    return [
+        Document(
+            page_content=segment['text'],
+            metadata={
+                "video_id": video_data['video_id'],
+                "video_title": video_data['title'],
+                "speaker": video_data['speaker'],
+                "date": video_data['date'],
+                "date_number": date_number(video_data['date']),
+                "timestamp": segment['timestamp'],
+                "duration": segment['duration'],
+                "video_url": video_data['url'],
+                "thumbnail": video_data.get('thumbnail', ''),
+                "source_type": "video_transcript"
+            }
+        )
+        for segment in video_data['transcript']
+    ]
+
+
+def _embedding_dimensions(collection: str) -> Optional[int]:
+    """Per-collection override from EMBEDDING_DIMENSIONS_<COLLECTION>, e.g. EMBEDDING_DIMENSIONS_AKS_KB=512."""
+    value = os.getenv(f"EMBEDDING_DIMENSIONS_{collection.upper()}")
+    return int(value) if value else None
+
+
+def _quantization(collection: str) -> Optional[str]:
+    """
+    Per-collection override from VECTOR_QUANTIZATION_<COLLECTION>, e.g. VECTOR_QUANTIZATION_VIDEO_TRANSCRIPTS=int8.
+
+    Raises:
+        ValueError: If the value is not one of QUANTIZATION_MODES ("none" means None)
+    """
+    value = os.getenv(f"VECTOR_QUANTIZATION_{collection.upper()}", "").strip().lower()
+    if value in ("", "none"):
+        return None
+    if value not in QUANTIZATION_MODES:
+        raise ValueError(
+            f"Invalid VECTOR_QUANTIZATION_{collection.upper()} '{value}'. Use one of {QUANTIZATION_MODES[1:]} or none"
+        )
+    return value
+
+
+TEAM_DOCS = CollectionSpec(
+    "team_docs", "data", "*.md", load_team_doc_chunks,
+    quantization=_quantization("team_docs"),
+    embedding_dimensions=_embedding_dimensions("team_docs"),
+    chunking=f"markdown-sections:{TEAM_DOC_CHUNK_TOKENS}+minhash"
+)
+AKS_KB = CollectionSpec(
+    "aks_kb", "docs", "*.md", load_aks_doc_chunks,
+    quantization=_quantization("aks_kb"),
+    embedding_dimensions=_embedding_dimensions("aks_kb"),
+    chunking=f"markdown-sections:{AKS_DOC_CHUNK_TOKENS}+minhash"
+)
+VIDEO_TRANSCRIPTS = CollectionSpec(
+    "video_transcripts", "videos", "*.json", load_video_chunks,
+    quantization=_quantization("video_transcripts"),
+    embedding_dimensions=_embedding_dimensions("video_transcripts"),
+    chunking="transcript-segments:date-number"
+)
+
+COLLECTION_SPECS = {spec.name: spec for spec in [TEAM_DOCS, AKS_KB, VIDEO_TRANSCRIPTS]}
@@ -0,0 +1,218 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+EMBEDDING_CACHE_DB = os.getenv("EMBEDDING_CACHE_DB", "./logs/embedding_cache.db")
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+# Rows kept in SQLite (~6 KB each at 1536 dimensions); the oldest writes are pruned first
+EMBEDDING_CACHE_DB_ROWS = int(os.getenv("EMBEDDING_CACHE_DB_ROWS", "20000"))
+
+_TOKEN = re.compile(r"\w+(?:[./:-]\w+)*")
+
+
+def normalize_query(text: str) -> str:
+    """
+    Canonical form of a search query for cache lookups.
+
+    Lowercases, drops punctuation around words and collapses whitespace, so
+    "NSG rules", "nsg rules " and "NSG rules?" share an entry. Punctuation
+    inside a token is kept ("10.100.0.0/16", "VID-001").
+    """
+    return " ".join(_TOKEN.findall(text.lower()))
+
+
+class QueryEmbeddingCache:
+    """
+    Two-tier cache of query embeddings: an in-process LRU in front of SQLite.
+
+    Entries are keyed by embedding model (and width, for shortened
+    embeddings) and normalized query text. The persistent tier lets
+    repeated queries skip the embedding round trip across restarts and
+    processes, and holds at most `db_rows` entries, pruning the least
+    recently written. It is best-effort: if the database cannot be opened
+    or written, a warning is printed once and the cache keeps working in
+    memory.
+    """
+
+    def __init__(
+        self,
+        db_path: str = EMBEDDING_CACHE_DB,
+        capacity: int = EMBEDDING_CACHE_SIZE,
+        db_rows: int = EMBEDDING_CACHE_DB_ROWS
+    ):
+        self.db_path = db_path
+        self.capacity = capacity
+        self.db_rows = db_rows
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Counter] = {}
+        self._db_ready = False
+        self._db_warned = False
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\x00{normalize_query(text)}".encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._db_ready:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        if not self._db_ready:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS query_embeddings (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    vector BLOB NOT NULL
+                )
+            """)
+            self._db_ready = True
+        return conn
+
+    def _disk_failed(self, error: Exception):
+        if not self._db_warned:
+            self._db_warned = True
+            print(f"Warning: Query embedding cache database {self.db_path} is unavailable ({error}); "
+                  f"caching in memory only")
+
+    def _remember(self, key: str, vector: List[float]):
+        with self._lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.capacity:
+                self._memory.popitem(last=False)
+
+    def _record(self, collection: str, outcome: str, n: int = 1):
+        with self._lock:
+            self._stats.setdefault(collection, Counter())[outcome] += n
+
+    def get(self, key: str, collection: str = "default") -> Optional[List[float]]:
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+        if vector is not None:
+            self._record(collection, "memory_hits")
+            return vector
+
+        try:
+            conn = self._connect()
+            row = conn.execute("SELECT vector FROM query_embeddings WHERE key = ?", (key,)).fetchone()
+            conn.close()
+        except (OSError, sqlite3.Error) as e:
+            self._disk_failed(e)
+            row = None
+
+        if row is None:
+            self._record(collection, "misses")
+            return None
+
+        vector = np.frombuffer(row[0], dtype=np.float32).tolist()
+        self._remember(key, vector)
+        self._record(collection, "disk_hits")
+        return vector
+
+    def put(self, model: str, entries: Dict[str, List[float]]):
+        for key, vector in entries.items():
+            self._remember(key, vector)
+
+        try:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO query_embeddings (key, model, vector) VALUES (?, ?, ?)",
+                [(key, model, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in entries.items()]
+            )
+            # INSERT OR REPLACE gives rewritten keys a new rowid, so low rowids are the oldest writes
+            conn.execute(
+                "DELETE FROM query_embeddings WHERE rowid <= (SELECT MAX(rowid) FROM query_embeddings) - ?",
+                (self.db_rows,)
+            )
+            conn.commit()
+            conn.close()
+        except (OSError, sqlite3.Error) as e:
+            # The persistent tier is best-effort; the in-memory LRU still serves repeats
+            self._disk_failed(e)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-collection lookups, memory/disk hits, misses and hit rate."""
+        with self._lock:
+            snapshot = {name: Counter(counts) for name, counts in self._stats.items()}
+
+        report = {}
+        for name, counts in snapshot.items():
+            lookups = counts["memory_hits"] + counts["disk_hits"] + counts["misses"]
+            report[name] = {
+                "lookups": lookups,
+                "memory_hits": counts["memory_hits"],
+                "disk_hits": counts["disk_hits"],
+                "misses": counts["misses"],
+                "hit_rate": round((lookups - counts["misses"]) / max(lookups, 1), 3)
+            }
+        return report
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves queries from a QueryEmbeddingCache.
+
+    Document embeddings (indexing) pass straight through. Query embeddings
+    are looked up by normalized text, and only misses are sent to the
+    underlying model, in a single request.
+    """
+
+    def __init__(self, base: Embeddings, cache: QueryEmbeddingCache, collection: str):
+        self.base = base
+        self.cache = cache
+        self.collection = collection
+        self.model = getattr(base, "model", type(base).__name__)
+        if getattr(base, "dimensions", None):
+            self.model = f"{self.model}@{base.dimensions}"
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.base.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_queries([text])[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        keys = [self.cache.key(self.model, text) for text in texts]
+        found: Dict[str, List[float]] = {}
+        missing: Dict[str, str] = {}
+
+        for key, text in zip(keys, texts):
+            if key in found or key in missing:
+                continue
+            vector = self.cache.get(key, self.collection)
+            if vector is None:
+                missing[key] = text
+            else:
+                found[key] = vector
+
+        if missing:
+            vectors = self.base.embed_documents(list(missing.values()))
+            fresh = dict(zip(missing, vectors))
+            self.cache.put(self.model, fresh)
+            found.update(fresh)
+
+        return [found[key] for key in keys]
+
+
+_query_cache: Optional[QueryEmbeddingCache] = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    global _query_cache
+
+    if _query_cache is None:
+        with _query_cache_lock:
+            if _query_cache is None:
+                _query_cache = QueryEmbeddingCache()
+
+    return _query_cache
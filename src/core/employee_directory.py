@@ -0,0 +1,173 @@
+import hashlib
+import io
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from src.core.directory_aggregates import DirectoryAggregates, build_aggregates
+from src.core.employee_index import DirectoryIndex
+from src.core.org_chart import OrgChart, build_org_chart
+
+EMPLOYEES_CSV = os.getenv("EMPLOYEES_CSV", "data/employees.csv")
+
+CATEGORICAL_COLUMNS = ["role", "department", "location", "office", "manager"]
+
+
+@dataclass(frozen=True)
+class DirectorySnapshot:
+    """An immutable, fully loaded view of the employee CSV."""
+    df: pd.DataFrame
+    version: int
+    sha256: str
+    mtime_ns: int
+    size: int
+    load_ms: float
+
+
+class EmployeeDirectory:
+    """
+    Process-wide, in-memory employee directory.
+
+    The CSV is parsed once into a DataFrame with categorical columns for the
+    low-cardinality fields. Every access stats the file; it is re-read only
+    when its mtime or size changes, and re-parsed only when its content hash
+    changes. A reload builds a complete new snapshot and swaps it in with a
+    single reference assignment, so readers never see a half-loaded table.
+    """
+
+    def __init__(self, path: str = EMPLOYEES_CSV):
+        self.path = Path(path)
+        self._snapshot: Optional[DirectorySnapshot] = None
+        self._lock = threading.Lock()
+        self._derived: Dict[str, Tuple[DirectorySnapshot, Any]] = {}
+        self._derived_locks: Dict[str, threading.Lock] = {}
+
+    @property
+    def df(self) -> pd.DataFrame:
+        return self.snapshot().df
+
+    def snapshot(self) -> DirectorySnapshot:
+        snapshot = self._snapshot
+        stat = os.stat(self.path)
+
+        if snapshot is not None and (stat.st_mtime_ns, stat.st_size) == (snapshot.mtime_ns, snapshot.size):
+            return snapshot
+
+        with self._lock:
+            return self._refresh(force=False)
+
+    def derived(
+        self,
+        name: str,
+        builder: Callable[[DirectorySnapshot, Optional[Tuple[DirectorySnapshot, Any]]], Any],
+        snapshot: Optional[DirectorySnapshot] = None
+    ) -> Any:
+        """
+        Get a structure derived from a snapshot, building it at most once per version.
+
+        Args:
+            name: Cache key for the derived structure
+            builder: Called as builder(snapshot, previous), where previous is the
+                (snapshot, value) pair from the last build or None, so builders
+                can update incrementally across reloads
+            snapshot: Snapshot to derive from (default: the current one). Pass
+                the same snapshot to derive several structures whose row
+                numbers must agree, even if the CSV reloads in between
+
+        Returns:
+            The derived value for the snapshot
+        """
+        snapshot = snapshot or self.snapshot()
+        cached = self._derived.get(name)
+        if cached is not None and cached[0].version == snapshot.version:
+            return cached[1]
+
+        with self._lock:
+            lock = self._derived_locks.setdefault(name, threading.Lock())
+
+        with lock:
+            cached = self._derived.get(name)
+            if cached is not None and cached[0].version == snapshot.version:
+                return cached[1]
+
+            value = builder(snapshot, cached)
+            # A caller holding an older snapshot must not replace a newer build
+            if cached is None or snapshot.version > cached[0].version:
+                self._derived[name] = (snapshot, value)
+            return value
+
+    def index(self, snapshot: Optional[DirectorySnapshot] = None) -> DirectoryIndex:
+        return self.derived(
+            "index",
+            lambda snapshot, previous: DirectoryIndex(snapshot.df, version=snapshot.version),
+            snapshot
+        )
+
+    def org_chart(self, snapshot: Optional[DirectorySnapshot] = None) -> OrgChart:
+        return self.derived(
+            "org_chart",
+            lambda snapshot, previous: build_org_chart(snapshot.df, (previous[0].df, previous[1]) if previous else None),
+            snapshot
+        )
+
+    def aggregates(self, snapshot: Optional[DirectorySnapshot] = None) -> DirectoryAggregates:
+        return self.derived(
+            "aggregates",
+            lambda snapshot, previous: build_aggregates(snapshot.df, (previous[0].df, previous[1]) if previous else None),
+            snapshot
+        )
+
+    def reload(self) -> DirectorySnapshot:
+        """Force a re-read and re-parse of the CSV."""
+        with self._lock:
+            return self._refresh(force=True)
+
+    def _refresh(self, force: bool) -> DirectorySnapshot:
+        current = self._snapshot
+        stat = os.stat(self.path)
+
+        if not force and current is not None and (stat.st_mtime_ns, stat.st_size) == (current.mtime_ns, current.size):
+            return current
+
+        data = self.path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+
+        if not force and current is not None and digest == current.sha256:
+            self._snapshot = replace(current, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            return self._snapshot
+
+        start = time.perf_counter()
+        df = pd.read_csv(io.BytesIO(data))
+        for col in CATEGORICAL_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype("category")
+
+        self._snapshot = DirectorySnapshot(
+            df=df,
+            version=(current.version + 1) if current else 1,
+            sha256=digest,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            load_ms=round((time.perf_counter() - start) * 1000, 1)
+        )
+        return self._snapshot
+
+
+_directory: Optional[EmployeeDirectory] = None
+_directory_lock = threading.Lock()
+
+
+def get_employee_directory() -> EmployeeDirectory:
+    global _directory
+
+    if _directory is None:
+        with _directory_lock:
+            if _directory is None:
+                _directory = EmployeeDirectory()
+
+    return _directory
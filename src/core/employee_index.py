@@ -0,0 +1,271 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+INDEXED_COLUMNS = ["full_name", "role", "department", "manager", "location"]
+
+_REGEX_METACHARACTERS = set(".^$*+?{}[]\\|()")
+
+FUZZY_POSTING_BUDGET = 20000
+FUZZY_SHORTLIST = 256
+FUZZY_CANDIDATES = 16
+
+
+def is_literal(pattern: str) -> bool:
+    return not any(ch in _REGEX_METACHARACTERS for ch in pattern)
+
+
+def _trigram_codes(data: bytes) -> np.ndarray:
+    buf = np.frombuffer(data, dtype=np.uint8).astype(np.uint32)
+    return np.unique((buf[:-2] << 16) | (buf[1:-1] << 8) | buf[2:])
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, turn punctuation into spaces and collapse whitespace ("Chen,  Sarah" -> "chen sarah")."""
+    return " ".join(re.sub(r"[^\w\s]", " ", name.lower()).split())
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance using Myers' bit-parallel algorithm (one pass over `b`)."""
+    if not a:
+        return len(b)
+
+    mask = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(a):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+
+    pv, mv, score = mask, 0, len(a)
+    for ch in b:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+
+def name_distance(query: str, name: str, max_distance: int) -> int:
+    """Edit distance between normalized names, tolerant to token order ("chen sarah" vs "sarah chen")."""
+    name = normalize_name(name)
+    distance = edit_distance(query, name)
+    if distance <= max_distance:
+        return distance
+    reordered = " ".join(sorted(query.split()))
+    return min(distance, edit_distance(reordered, " ".join(sorted(name.split()))))
+
+
+class FieldIndex:
+    """
+    Index over the distinct values of one column.
+
+    Matching runs over distinct values rather than rows, and maps the hits
+    back to rows through a value -> rows table. Literal substring queries of
+    three or more bytes are answered from a trigram inverted index: posting
+    lists are intersected, and the few surviving candidates are verified.
+    Shorter literals and regular expressions scan the distinct values, which
+    keeps the semantics of `Series.str.contains(value, case=False)` exactly.
+    """
+
+    def __init__(self, series: pd.Series):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            values = series.cat.categories.to_numpy(dtype=object)
+        else:
+            codes, values = pd.factorize(series)
+            values = np.asarray(values, dtype=object)
+
+        self.values = values
+        self.lowered: List[str] = [str(v).lower() for v in values]
+
+        present = codes >= 0
+        self._row_order = np.argsort(codes, kind="stable")[np.count_nonzero(~present):]
+        counts = np.bincount(codes[present], minlength=len(values))
+        self._row_offsets = np.concatenate([[0], np.cumsum(counts)])
+
+        self._exact: Dict[str, List[int]] = {}
+        for value_id, lowered in enumerate(self.lowered):
+            self._exact.setdefault(lowered, []).append(value_id)
+
+        self._build_trigrams()
+
+    def _build_trigrams(self):
+        encoded = [v.encode("utf-8") for v in self.lowered]
+        lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+        buf = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+
+        if len(buf) < 3:
+            self._trigrams = np.empty(0, dtype=np.uint64)
+            self._postings = np.empty(0, dtype=np.uint32)
+            self._posting_offsets = np.zeros(1, dtype=np.int64)
+            return
+
+        owner = np.repeat(np.arange(len(encoded), dtype=np.uint64), lengths)
+        same_value = owner[:-2] == owner[2:]
+        trigrams = ((buf[:-2] << 16) | (buf[1:-1] << 8) | buf[2:])[same_value]
+
+        keys = np.unique((trigrams << 32) | owner[:-2][same_value])
+        key_trigrams = keys >> 32
+
+        self._trigrams, starts = np.unique(key_trigrams, return_index=True)
+        self._postings = (keys & 0xFFFFFFFF).astype(np.uint32)
+        self._posting_offsets = np.append(starts, len(keys))
+
+    def _postings_for(self, trigram: int) -> np.ndarray:
+        i = np.searchsorted(self._trigrams, trigram)
+        if i == len(self._trigrams) or self._trigrams[i] != trigram:
+            return self._postings[:0]
+        return self._postings[self._posting_offsets[i]:self._posting_offsets[i + 1]]
+
+    def candidates(self, literal: str) -> Optional[np.ndarray]:
+        """Value ids sharing every trigram with a lowercased literal, or None if it is too short."""
+        data = literal.encode("utf-8")
+        if len(data) < 3:
+            return None
+
+        postings = sorted((self._postings_for(int(t)) for t in _trigram_codes(data)), key=len)
+        result = postings[0]
+        for posting in postings[1:]:
+            if len(result) == 0:
+                break
+            result = np.intersect1d(result, posting, assume_unique=True)
+        return result
+
+    def fuzzy_values(
+        self,
+        query: str,
+        limit: int = 5,
+        max_distance: Optional[int] = None
+    ) -> List[Tuple[int, int]]:
+        """
+        Value ids close to `query`, ranked by edit distance.
+
+        Candidates are shortlisted by trigram overlap with the query (in either
+        token order), counted over the rarest query trigrams up to a posting
+        budget. The shortlist is then re-scored against the frequent trigrams
+        by binary search into their posting lists, and only the best few are
+        re-checked with a bounded edit distance, so the cost does not grow
+        with directory size.
+
+        Returns:
+            Up to `limit` (value_id, distance) pairs with distance <= max_distance
+        """
+        query = normalize_name(query)
+        if not query:
+            return []
+        if max_distance is None:
+            max_distance = max(1, len(query) // 4)
+
+        variants = {query, " ".join(sorted(query.split())), " ".join(reversed(query.split()))}
+        trigrams = np.unique(np.concatenate([_trigram_codes(v.encode("utf-8")) for v in variants if len(v) >= 3] or
+                                            [np.empty(0, dtype=np.uint32)]))
+
+        postings = [p for p in sorted((self._postings_for(int(t)) for t in trigrams), key=len) if len(p)]
+        if not postings:
+            return []
+
+        rare, total = 1, len(postings[0])
+        while rare < len(postings) and total + len(postings[rare]) <= FUZZY_POSTING_BUDGET:
+            total += len(postings[rare])
+            rare += 1
+
+        ids, counts = np.unique(np.concatenate(postings[:rare]), return_counts=True)
+        if len(ids) > FUZZY_SHORTLIST:
+            top = np.argpartition(-counts, FUZZY_SHORTLIST)[:FUZZY_SHORTLIST]
+            ids, counts = ids[top], counts[top]
+
+        for posting in postings[rare:]:
+            found = np.minimum(np.searchsorted(posting, ids), len(posting) - 1)
+            counts = counts + (posting[found] == ids)
+
+        order = np.argsort(-counts, kind="stable")[:FUZZY_CANDIDATES]
+
+        scored = []
+        for value_id in ids[order].tolist():
+            name = self.lowered[value_id]
+            if abs(len(name) - len(query)) > max_distance:
+                continue
+            distance = name_distance(query, name, max_distance)
+            if distance <= max_distance:
+                scored.append((value_id, distance))
+
+        scored.sort(key=lambda pair: pair[1])
+        return scored[:limit]
+
+    def match_values(self, pattern: str) -> np.ndarray:
+        """Value ids whose value contains `pattern` (case-insensitive, regex semantics like pandas)."""
+        if not is_literal(pattern):
+            compiled = re.compile(pattern, re.IGNORECASE)
+            return np.array([i for i, v in enumerate(self.values) if compiled.search(str(v))], dtype=np.int64)
+
+        literal = pattern.lower()
+        candidates = self.candidates(literal)
+        if candidates is None:
+            return np.array([i for i, v in enumerate(self.lowered) if literal in v], dtype=np.int64)
+
+        return np.array([i for i in candidates.tolist() if literal in self.lowered[i]], dtype=np.int64)
+
+    def rows_for_values(self, value_ids: np.ndarray) -> np.ndarray:
+        """Sorted row positions holding any of the given values."""
+        if len(value_ids) == 0:
+            return np.empty(0, dtype=np.int64)
+        slices = [self._row_order[self._row_offsets[v]:self._row_offsets[v + 1]] for v in value_ids]
+        return np.sort(np.concatenate(slices))
+
+    def contains(self, pattern: str) -> np.ndarray:
+        return self.rows_for_values(self.match_values(pattern))
+
+    def exact(self, value: str) -> np.ndarray:
+        """Sorted row positions whose value equals `value` (case-insensitive)."""
+        return self.rows_for_values(np.asarray(self._exact.get(str(value).lower(), []), dtype=np.int64))
+
+
+class DirectoryIndex:
+    """Substring and exact-match indexes over the searchable directory columns."""
+
+    def __init__(self, df: pd.DataFrame, columns: List[str] = INDEXED_COLUMNS, version: int = 0):
+        self.df = df
+        self.version = version
+        self.fields = {col: FieldIndex(df[col]) for col in columns if col in df.columns}
+
+    def contains(self, column: str, pattern: str) -> np.ndarray:
+        """Sorted row positions where `column` contains `pattern`, like str.contains(case=False, na=False)."""
+        if column in self.fields:
+            return self.fields[column].contains(pattern)
+        mask = self.df[column].str.contains(pattern, case=False, na=False).to_numpy()
+        return np.flatnonzero(mask)
+
+    def exact(self, column: str, value: str) -> np.ndarray:
+        if column in self.fields:
+            return self.fields[column].exact(value)
+        mask = (self.df[column].astype(str).str.lower() == str(value).lower()).to_numpy()
+        return np.flatnonzero(mask)
+
+    def fuzzy_name(self, name: str, limit: int = 5, max_distance: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Typo- and order-tolerant name lookup: up to `limit` (row, distance) pairs, closest first."""
+        field = self.fields["full_name"]
+        matches = []
+        for value_id, distance in field.fuzzy_values(name, limit, max_distance):
+            matches.extend((int(row), distance) for row in field.rows_for_values(np.array([value_id])))
+        return matches[:limit]
+
+    def filter(self, criteria: Optional[Dict[str, str]]) -> np.ndarray:
+        """Sorted row positions matching every column: value pair; unknown columns are ignored."""
+        rows = None
+        for col, value in (criteria or {}).items():
+            if col not in self.df.columns:
+                continue
+            matched = self.contains(col, value)
+            rows = matched if rows is None else np.intersect1d(rows, matched, assume_unique=True)
+        return np.arange(len(self.df)) if rows is None else rows
@@ -1,27 +1,171 @@
 import re
-from typing import Dict, Tuple
+from bisect import bisect_right
+from typing import Dict, Any, Callable, List, Iterable, Optional, Tuple
+
+HARMFUL_KEYWORDS = {
+    "security": ["hack", "exploit", "vulnerability", "malware", "virus"],
+    "attack": ["sql injection", "xss", "ddos"],
+    "pii": ["personal data", "ssn", "credit card"],
+}
 
 HARMFUL_PATTERNS = [
-    r"(?i)(hack|exploit|vulnerability|malware|virus)",
-    r"(?i)(sql injection|xss|ddos)",
-    r"(?i)(personal data|ssn|credit card)",
+    r"(?i)(" + "|".join(re.escape(k) for k in keywords) + ")"
+    for keywords in HARMFUL_KEYWORDS.values()
 ]
 
+MIN_INPUT_CHARS = 3
+MAX_INPUT_CHARS = 10000
 
-def check_input_safety(text: str) -> Tuple[bool, str]:
-    if not text or len(text.strip()) < 3:
-        return False, "Input too short"
-    
-    if len(text) > 10000:
-        return False, "Input too long (max 10,000 chars)"
-    
-    for pattern in HARMFUL_PATTERNS:
-        if re.search(pattern, text):
+_BATCH_SEPARATOR = "\x00"
+
+
+class GuardrailEngine:
+    """
+    Keyword rules compiled once into a single alternation.
+
+    One pass of the combined pattern replaces one `re.search` per rule, and the
+    named group of a match identifies the rule category that fired. Text is
+    lowercased once up front instead of matching with re.IGNORECASE, which is
+    several times faster in the `re` engine.
+    """
+
+    def __init__(self, rules: Dict[str, List[str]] = HARMFUL_KEYWORDS):
+        groups = []
+        for category, keywords in rules.items():
+            ordered = sorted((k.lower() for k in keywords), key=len, reverse=True)
+            groups.append(f"(?P<{category}>" + "|".join(re.escape(k) for k in ordered) + ")")
+
+        self.rules = rules
+        self.pattern = re.compile("|".join(groups))
+        self.max_match_len = max(len(k) for keywords in rules.values() for k in keywords)
+
+    def find(self, text: str) -> Optional[str]:
+        """Return the category of the first rule that matches, or None."""
+        match = self.pattern.search(text.lower())
+        return match.lastgroup if match else None
+
+    def check(self, text: str) -> Tuple[bool, str]:
+        if not text or len(text.strip()) < MIN_INPUT_CHARS:
+            return False, "Input too short"
+
+        if len(text) > MAX_INPUT_CHARS:
+            return False, "Input too long (max 10,000 chars)"
+
+        if self.find(text):
             return False, "Input contains potentially harmful content"
-    
+
+        return True, "OK"
+
+    def check_batch(self, texts: Iterable[str]) -> List[Tuple[bool, str]]:
+        """
+        Check many inputs with a single scan over their concatenation.
+
+        Args:
+            texts: Inputs to check (e.g., documents during bulk ingestion)
+
+        Returns:
+            One (is_safe, reason) tuple per input, in order
+        """
+        texts = list(texts)
+        verdicts: List[Tuple[bool, str]] = [(True, "OK")] * len(texts)
+
+        lowered = []
+        starts = []
+        position = 0
+        for i, text in enumerate(texts):
+            if not text or len(text.strip()) < MIN_INPUT_CHARS:
+                verdicts[i] = (False, "Input too short")
+            elif len(text) > MAX_INPUT_CHARS:
+                verdicts[i] = (False, "Input too long (max 10,000 chars)")
+            lowered.append((text or "").lower())
+            starts.append(position)
+            position += len(lowered[-1]) + len(_BATCH_SEPARATOR)
+
+        joined = _BATCH_SEPARATOR.join(lowered)
+        for match in self.pattern.finditer(joined):
+            i = bisect_right(starts, match.start()) - 1
+            if verdicts[i][0]:
+                verdicts[i] = (False, "Input contains potentially harmful content")
+
+        return verdicts
+
+    def stream(self) -> "StreamingGuardrail":
+        return StreamingGuardrail(self)
+
+
+class StreamingGuardrail:
+    """
+    Incremental scanner for streamed text (e.g., LLM output chunks).
+
+    Only the last `max_match_len - 1` characters are carried over between
+    chunks, so each character is scanned a bounded number of times no matter
+    how long the stream runs, and matches split across chunks are still found.
+    """
+
+    def __init__(self, engine: GuardrailEngine):
+        self.engine = engine
+        self.violation: Optional[str] = None
+        self.chars_scanned = 0
+        self._tail = ""
+
+    def feed(self, chunk: str) -> Tuple[bool, str]:
+        if self.violation:
+            return False, "Output contains potentially harmful content"
+
+        window = self._tail + chunk
+        self.violation = self.engine.find(window)
+        self.chars_scanned += len(chunk)
+        self._tail = window[-(self.engine.max_match_len - 1):]
+
+        if self.violation:
+            return False, "Output contains potentially harmful content"
+        return True, "OK"
+
+
+_default_engine = GuardrailEngine()
+
+
+def get_guardrail_engine() -> GuardrailEngine:
+    return _default_engine
+
+
+def check_input_safety(text: str) -> Tuple[bool, str]:
+    return _default_engine.check(text)
+
+
+def check_input_batch(texts: Iterable[str]) -> List[Tuple[bool, str]]:
+    return _default_engine.check_batch(texts)
+
+
+# Checks cheap enough to run inline before anything else (microseconds)
+INPUT_CHECKS: List[Callable[[str], Tuple[bool, str]]] = [check_input_safety]
+# Checks that call a model or service; these run concurrently with the agent's first turn
+SLOW_INPUT_CHECKS: List[Callable[[str], Tuple[bool, str]]] = []
+
+
+def run_input_checks(
+    text: str,
+    checks: Optional[List[Callable[[str], Tuple[bool, str]]]] = None
+) -> Tuple[bool, str]:
+    """Run the given input checks (default: INPUT_CHECKS) in order, stopping at the first failure."""
+    for check in INPUT_CHECKS if checks is None else checks:
+        is_safe, reason = check(text)
+        if not is_safe:
+            return False, reason
     return True, "OK"
 
 
+def blocked_response(reason: str) -> Dict[str, Any]:
+    """Result returned by a run_* entry point when its input fails the guardrails."""
+    return {
+        "answer": f"Your request was blocked by input guardrails: {reason}.",
+        "tool_calls": [],
+        "tokens_used": 0,
+        "full_trace": [],
+        "blocked": True
+    }
+
+
 def check_output_quality(text: str, min_length: int = 50) -> Tuple[bool, str]:
 
     if not text or len(text.strip()) < min_length:
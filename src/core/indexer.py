@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+
+from src.core.cost_utils import calculate_embedding_cost
+from src.core.document_sources import CollectionSpec
+from src.core.ingestion import EMBED_BATCH_SIZE, INGEST_WORKERS, EmbeddingPipeline, load_source_files
+
+# Version 2: chunk IDs hash text only; metadata is tracked per chunk beside them
+MANIFEST_VERSION = 2
+
+
+@dataclass
+class SyncReport:
+    """What an incremental sync changed in one collection."""
+    collection: str
+    files_added: List[str] = field(default_factory=list)
+    files_changed: List[str] = field(default_factory=list)
+    files_removed: List[str] = field(default_factory=list)
+    files_unchanged: int = 0
+    chunks_added: int = 0
+    chunks_deleted: int = 0
+    chunks_kept: int = 0
+    chunks_relabeled: int = 0
+    embedded_tokens: int = 0
+    embedding_batches: int = 0
+    embedding_cost_usd: float = 0.0
+    full_rebuild: bool = False
+    elapsed_ms: float = 0.0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.chunks_added or self.chunks_deleted or self.chunks_relabeled)
+
+
+def chunk_ids(source: str, chunks: List[Document]) -> List[str]:
+    """
+    Stable IDs from chunk text: the same text from the same source file
+    always gets the same ID, so unchanged chunks in an edited file keep
+    their vectors even if their metadata changed (see metadata_digest()).
+    Repeated identical chunks are numbered by occurrence.
+    """
+    ids = []
+    seen: Dict[str, int] = {}
+    for chunk in chunks:
+        payload = json.dumps([source, chunk.page_content])
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+        occurrence = seen.get(digest, 0)
+        seen[digest] = occurrence + 1
+        ids.append(digest if occurrence == 0 else f"{digest}-{occurrence}")
+    return ids
+
+
+def metadata_digest(chunk: Document) -> str:
+    """Hash of a chunk's metadata, recorded in the manifest to spot metadata-only edits."""
+    payload = json.dumps(chunk.metadata, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class IncrementalIndexer:
+    """
+    Keeps a vector collection in sync with its source files.
+
+    A JSON manifest next to the vector store records each source file's
+    hash and the IDs and metadata digests of the chunks it produced. A sync
+    re-chunks only files whose hash (or the spec's chunking rules) changed,
+    embeds only chunk IDs the collection does not already have, rewrites
+    the metadata of kept chunks whose metadata changed (reusing their stored
+    vectors), and deletes the IDs that disappeared, so the work (and the
+    embedding bill) is proportional to the edit rather than the corpus.
+    Files are hashed and chunked across a process pool and new chunks are
+    streamed through an EmbeddingPipeline (see src.core.ingestion).
+
+    The collection is rebuilt from scratch when there is no usable manifest
+    (first run, or a store built before manifests existed), when the
+    embedding model or embedding dimensions changed, or when the manifest
+    and collection disagree on the number of chunks.
+    """
+
+    def __init__(
+        self,
+        spec: CollectionSpec,
+        manifest_dir: Path,
+        embedding_model: str,
+        embedding_dimensions: Optional[int] = None,
+        workers: int = INGEST_WORKERS
+    ):
+        self.spec = spec
+        self.workers = workers
+        self.manifest_path = Path(manifest_dir) / f"{spec.name}.manifest.json"
+        self.embedding_model = embedding_model
+        self.embedding_dimensions = embedding_dimensions
+
+    def vectors_incompatible(self) -> bool:
+        """
+        True if the manifest records vectors from a different model or width,
+        which cannot share a collection with the ones this indexer will write.
+        """
+        manifest = self._read_manifest()
+        return bool(manifest) and (
+            manifest.get("embedding_model") != self.embedding_model
+            or manifest.get("embedding_dimensions") != self.embedding_dimensions
+        )
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: Ignoring unreadable manifest {self.manifest_path}: {e}")
+            return {}
+
+    def _write_manifest(self, files: Dict[str, Dict[str, Any]]):
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({
+            "version": MANIFEST_VERSION,
+            "collection": self.spec.name,
+            "embedding_model": self.embedding_model,
+            "embedding_dimensions": self.embedding_dimensions,
+            "chunking": self.spec.chunking,
+            "files": files
+        }, indent=1), encoding="utf-8")
+        os.replace(tmp, self.manifest_path)
+
+    @staticmethod
+    def _relabel(collection, chunks: Dict[str, Document]):
+        """Rewrite the metadata of stored chunks, upserting each with its stored vector (no embedding)."""
+        ids = list(chunks)
+        for start in range(0, len(ids), EMBED_BATCH_SIZE):
+            stored = collection.get(ids=ids[start:start + EMBED_BATCH_SIZE], include=["embeddings"])
+            collection.upsert(
+                ids=stored["ids"],
+                embeddings=[list(vector) for vector in stored["embeddings"]],
+                documents=[chunks[chunk_id].page_content for chunk_id in stored["ids"]],
+                metadatas=[chunks[chunk_id].metadata for chunk_id in stored["ids"]]
+            )
+
+    def sync(self, collection, embeddings: Embeddings) -> SyncReport:
+        """
+        Bring `collection` (a Chroma or NumpyCollection, see src.core.vector_backends)
+        up to date with the source files, embedding new chunks with `embeddings`.
+
+        Raises:
+            ValueError: If the collection would be empty (no loadable source documents)
+        """
+        start = time.perf_counter()
+        report = SyncReport(collection=self.spec.name)
+
+        manifest = self._read_manifest()
+        files: Dict[str, Dict[str, Any]] = manifest.get("files", {})
+        indexed = sum(len(entry["chunk_ids"]) for entry in files.values())
+
+        if (manifest.get("version") != MANIFEST_VERSION
+                or manifest.get("embedding_model") != self.embedding_model
+                or manifest.get("embedding_dimensions") != self.embedding_dimensions
+                or indexed != collection.count()):
+            existing = collection.get(include=[])["ids"]
+            if existing:
+                collection.delete(ids=existing)
+            files = {}
+            report.full_rebuild = True
+
+        current = [str(path) for path in self.spec.source_files()]
+        new_files: Dict[str, Dict[str, Any]] = {}
+        to_delete: List[str] = []
+
+        for name in sorted(set(files) - set(current)):
+            report.files_removed.append(name)
+            to_delete.extend(files[name]["chunk_ids"])
+
+        relabel: Dict[str, Document] = {}
+        pipeline = EmbeddingPipeline(embeddings, collection)
+        # New chunking rules re-chunk unchanged files too; chunk IDs that survive keep their vectors
+        rechunk = manifest.get("chunking", "") != self.spec.chunking
+        known = {name: files[name]["sha256"] if name in files and not rechunk else None for name in current}
+        try:
+            for name, digest, chunks, error in load_source_files(self.spec, known, self.workers):
+                previous = files.get(name)
+                if error is not None:
+                    print(f"Warning: Could not load {name}: {error}")
+                    if previous is not None:
+                        new_files[name] = previous
+                    continue
+                if chunks is None:
+                    new_files[name] = previous
+                    report.files_unchanged += 1
+                    continue
+
+                ids = chunk_ids(name, chunks)
+                digests = [metadata_digest(chunk) for chunk in chunks]
+                old = dict(zip(previous["chunk_ids"], previous["metadata"])) if previous else {}
+                for chunk_id, chunk, metadata in zip(ids, chunks, digests):
+                    if chunk_id not in old:
+                        pipeline.put(chunk_id, chunk)
+                    elif old[chunk_id] != metadata:
+                        relabel[chunk_id] = chunk
+                to_delete.extend(set(old) - set(ids))
+                report.chunks_kept += len(set(old) & set(ids))
+                new_files[name] = {"sha256": digest, "chunk_ids": ids, "metadata": digests}
+                (report.files_changed if previous else report.files_added).append(name)
+        finally:
+            stats = pipeline.close()
+
+        if not any(entry["chunk_ids"] for entry in new_files.values()):
+            raise ValueError(f"No documents found for '{self.spec.name}' in {self.spec.source_dir}/ ({self.spec.pattern})")
+
+        if to_delete:
+            collection.delete(ids=to_delete)
+        if relabel:
+            self._relabel(collection, relabel)
+        if stats.chunks:
+            print(f"Indexed {stats.chunks} new or changed chunks into '{self.spec.name}' "
+                  f"({stats.chunks_per_sec:.0f} chunks/sec)")
+
+        self._write_manifest(new_files)
+
+        report.chunks_added = stats.chunks
+        report.chunks_deleted = len(to_delete)
+        report.chunks_relabeled = len(relabel)
+        report.embedded_tokens = stats.tokens
+        report.embedding_batches = stats.batches
+        report.embedding_cost_usd = calculate_embedding_cost(self.embedding_model, report.embedded_tokens)
+        report.elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+        return report
+
+
+if __name__ == "__main__":
+    from src.core.vector_store import get_vector_store_registry
+
+    for report in get_vector_store_registry().reindex(sys.argv[1:] or None).values():
+        print(json.dumps(asdict(report), indent=1))
@@ -0,0 +1,227 @@
+import hashlib
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+
+from src.core.cost_utils import estimate_token_count
+from src.core.document_sources import CollectionSpec
+
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", str(os.cpu_count() or 1)))
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+EMBED_BATCH_TOKENS = int(os.getenv("EMBED_BATCH_TOKENS", "20000"))
+EMBED_BATCH_SIZE = 512
+CHUNK_QUEUE_SIZE = 4096
+
+# Below this many files, a process pool costs more to start than it saves
+PROCESS_POOL_MIN_FILES = 32
+
+# Pools are started from warm-up and request threads; forking a threaded
+# process can leave a child blocked on a lock another thread held, so
+# workers come from a single-threaded fork server instead
+_POOL_CONTEXT = multiprocessing.get_context("forkserver")
+
+# One long-lived pool per worker count, shared by every sync
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+LoadedFile = Tuple[str, str, Optional[List[Document]], Optional[str]]
+
+
+def load_source_file(spec: CollectionSpec, path: str, known_sha256: Optional[str]) -> LoadedFile:
+    """
+    Hash one source file and, if it changed, chunk it.
+
+    Returns:
+        (path, sha256, chunks or None if the hash matches known_sha256, error message or None)
+    """
+    try:
+        digest = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+        if digest == known_sha256:
+            return path, digest, None, None
+        return path, digest, spec.load_chunks(Path(path)), None
+    except Exception as e:
+        return path, "", None, str(e)
+
+
+def _process_pool(workers: int) -> ProcessPoolExecutor:
+    """The shared process pool with `workers` processes, started on first use."""
+    with _pools_lock:
+        if workers not in _pools:
+            if not _pools:
+                # Import the chunkers once in the server rather than in every worker
+                _POOL_CONTEXT.set_forkserver_preload(["src.core.document_sources"])
+            _pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=_POOL_CONTEXT)
+        return _pools[workers]
+
+
+def load_source_files(
+    spec: CollectionSpec,
+    known: Dict[str, Optional[str]],
+    workers: int = INGEST_WORKERS
+) -> Iterator[LoadedFile]:
+    """
+    Hash and chunk source files across a process pool, yielding results as they complete.
+
+    At most a few files per worker are in flight at once, so memory is
+    bounded by the consumer's pace rather than the corpus size. The pool
+    is started on first use and reused by later syncs (see _process_pool()).
+
+    Args:
+        spec: Collection the files belong to
+        known: {path: sha256 from the last sync, or None for new files}
+        workers: Process count (1 loads inline)
+    """
+    paths = list(known)
+    if workers <= 1 or len(paths) < PROCESS_POOL_MIN_FILES:
+        for path in paths:
+            yield load_source_file(spec, path, known[path])
+        return
+
+    window = workers * 4
+    pool = _process_pool(workers)
+    pending = set()
+    try:
+        for path in paths:
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(pool.submit(load_source_file, spec, path, known[path]))
+
+        while pending:
+            future = pending.pop()
+            yield future.result()
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool on the next sync
+        with _pools_lock:
+            if _pools.get(workers) is pool:
+                del _pools[workers]
+        raise
+    finally:
+        # The pool outlives this sync, so drop queued work if the consumer stopped early
+        for future in pending:
+            future.cancel()
+
+
+@dataclass
+class PipelineStats:
+    chunks: int = 0
+    tokens: int = 0
+    batches: int = 0
+    elapsed_ms: float = 0.0
+
+    @property
+    def chunks_per_sec(self) -> float:
+        return self.chunks / max(self.elapsed_ms / 1000, 1e-9)
+
+
+class EmbeddingPipeline:
+    """
+    Streams chunks into embedding batches and bulk upserts.
+
+    put() feeds a bounded queue; a batcher thread cuts batches at
+    EMBED_BATCH_TOKENS estimated tokens (or EMBED_BATCH_SIZE chunks) and
+    hands them to a thread pool that embeds up to `concurrency` batches at
+    once and upserts each into the collection. When embedding falls behind,
+    the queue fills and put() blocks, so memory stays bounded.
+    """
+
+    _DONE = object()
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        collection,
+        concurrency: int = EMBED_CONCURRENCY,
+        batch_tokens: int = EMBED_BATCH_TOKENS,
+        batch_size: int = EMBED_BATCH_SIZE,
+        queue_size: int = CHUNK_QUEUE_SIZE
+    ):
+        self.embeddings = embeddings
+        self.collection = collection
+        self.batch_tokens = batch_tokens
+        self.batch_size = batch_size
+        self.stats = PipelineStats()
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="embed")
+        self._in_flight = threading.Semaphore(concurrency * 2)
+        self._upsert_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._futures = []
+        self._error: Optional[BaseException] = None
+        self._start = time.perf_counter()
+        self._batcher = threading.Thread(target=self._run_batcher, name="embed-batcher", daemon=True)
+        self._batcher.start()
+
+    def put(self, chunk_id: str, chunk: Document):
+        if self._error is not None:
+            raise self._error
+        self._queue.put((chunk_id, chunk))
+
+    def _run_batcher(self):
+        batch: List[Tuple[str, Document]] = []
+        tokens = 0
+
+        while True:
+            item = self._queue.get()
+            if item is self._DONE:
+                break
+            if self._error is not None:
+                continue
+
+            chunk_tokens = estimate_token_count(item[1].page_content)
+            if batch and (tokens + chunk_tokens > self.batch_tokens or len(batch) >= self.batch_size):
+                self._submit(batch, tokens)
+                batch, tokens = [], 0
+            batch.append(item)
+            tokens += chunk_tokens
+
+        if batch and self._error is None:
+            self._submit(batch, tokens)
+
+    def _submit(self, batch: List[Tuple[str, Document]], tokens: int):
+        self._in_flight.acquire()
+        future = self._pool.submit(self._embed_and_upsert, batch, tokens)
+        future.add_done_callback(lambda _: self._in_flight.release())
+        self._futures.append(future)
+
+    def _embed_and_upsert(self, batch: List[Tuple[str, Document]], tokens: int):
+        try:
+            texts = [chunk.page_content for _, chunk in batch]
+            vectors = self.embeddings.embed_documents(texts)
+            with self._upsert_lock:
+                self.collection.upsert(
+                    ids=[chunk_id for chunk_id, _ in batch],
+                    embeddings=vectors,
+                    documents=texts,
+                    metadatas=[chunk.metadata for _, chunk in batch]
+                )
+            with self._stats_lock:
+                self.stats.chunks += len(batch)
+                self.stats.tokens += tokens
+                self.stats.batches += 1
+        except BaseException as e:
+            self._error = self._error or e
+            raise
+
+    def close(self) -> PipelineStats:
+        """Flush the last batch and wait for every upsert; re-raises the first failure."""
+        self._queue.put(self._DONE)
+        self._batcher.join()
+        wait(self._futures)
+        self._pool.shutdown()
+        self.stats.elapsed_ms = round((time.perf_counter() - self._start) * 1000, 1)
+        if self._error is not None:
+            raise self._error
+        return self.stats
@@ -0,0 +1,201 @@
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain.schema import Document
+
+from src.core.vector_backends import matches_where
+
+# A term is rare when it appears in at most this fraction of chunks
+LEXICAL_RARE_DF = float(os.getenv("LEXICAL_RARE_DF", "0.1"))
+# Share of a query's IDF weight carried by rare terms above which BM25 alone answers it
+LEXICAL_DOMINANCE = float(os.getenv("LEXICAL_DOMINANCE", "0.5"))
+RRF_K = 60
+
+_TOKEN = re.compile(r"\w+(?:[./:-]\w+)*")
+_PART = re.compile(r"[./:-]")
+
+STOPWORDS = frozenset("""
+a an and are as at be by can do does for from how i in is it me my of on or our should the this
+to use used using we what when where which who why with you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased word tokens for BM25.
+
+    Tokens with internal punctuation (IPs, CIDRs, form IDs, hostnames) are
+    kept whole and also split into their parts, so "NET-AKS-001" matches
+    both the exact ID and a search for "aks".
+    """
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        tokens.append(token)
+        if _PART.search(token):
+            tokens.extend(part for part in _PART.split(token) if part)
+    return tokens
+
+
+class BM25Index:
+    """
+    In-process inverted index with Okapi BM25 scoring over a collection's chunks.
+
+    Keyed by the same chunk IDs as the vector collection; sync() diffs the
+    IDs against the collection, so only added and removed chunks are
+    (re)tokenized after an incremental re-index.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._docs: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, ids: List[str], texts: List[str], metadatas: List[Optional[Dict[str, Any]]]):
+        with self._lock:
+            for chunk_id, text, metadata in zip(ids, texts, metadatas):
+                if chunk_id in self._docs:
+                    self._remove(chunk_id)
+                terms = Counter(tokenize(text))
+                for term, tf in terms.items():
+                    self._postings.setdefault(term, {})[chunk_id] = tf
+                self._lengths[chunk_id] = sum(terms.values())
+                self._total_length += self._lengths[chunk_id]
+                self._docs[chunk_id] = (text, metadata or {})
+
+    def remove(self, ids: List[str]):
+        with self._lock:
+            for chunk_id in ids:
+                if chunk_id in self._docs:
+                    self._remove(chunk_id)
+
+    def _remove(self, chunk_id: str):
+        text, _ = self._docs.pop(chunk_id)
+        for term in set(tokenize(text)):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(chunk_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(chunk_id)
+
+    def sync(self, collection) -> Tuple[int, int]:
+        """
+        Bring the index in line with a Chroma collection.
+
+        Returns:
+            (chunks added, chunks removed)
+        """
+        current = set(collection.get(include=[])["ids"])
+        with self._lock:
+            indexed = set(self._docs)
+        removed = list(indexed - current)
+        added = list(current - indexed)
+
+        self.remove(removed)
+        if added:
+            rows = collection.get(ids=added, include=["documents", "metadatas"])
+            self.add(rows["ids"], rows["documents"], rows["metadatas"])
+        return len(added), len(removed)
+
+    def idf(self, term: str) -> float:
+        df = len(self._postings.get(term, ()))
+        n = len(self._docs)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def rare_share(self, query: str) -> float:
+        """
+        Share of the query's IDF weight carried by rare indexed terms.
+
+        Stopwords are ignored, and an indexed compound token ("NET-AKS-001")
+        counts as one term rather than as its parts. Terms the index has
+        never seen count against the share: BM25 cannot match them, so the
+        dense search should.
+        """
+        terms = []
+        for token in _TOKEN.findall(query.lower()):
+            if token in self._postings or not _PART.search(token):
+                terms.append(token)
+            else:
+                terms.extend(part for part in _PART.split(token) if part)
+        terms = [term for term in dict.fromkeys(terms) if term not in STOPWORDS]
+        n = len(self._docs)
+        if not terms or n == 0:
+            return 0.0
+
+        total = rare = 0.0
+        for term in terms:
+            weight = self.idf(term)
+            total += weight
+            df = len(self._postings.get(term, ()))
+            if 0 < df <= max(1.0, LEXICAL_RARE_DF * n):
+                rare += weight
+        return rare / total
+
+    def search(self, query: str, k: int = 4, where: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
+        """
+        Top-k chunks by BM25 score, highest first, as (Document with id, score) pairs.
+
+        `where` is a Chroma-style metadata filter; only matching chunks are
+        scored. Corpus statistics (IDF, average length) stay those of the
+        whole collection, so scores are comparable with unfiltered searches.
+        """
+        with self._lock:
+            n = len(self._docs)
+            if n == 0:
+                return []
+            avg_length = self._total_length / n
+
+            scores: Dict[str, float] = {}
+            allowed: Dict[str, bool] = {}
+            for term in dict.fromkeys(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = self.idf(term)
+                for chunk_id, tf in postings.items():
+                    if where:
+                        if chunk_id not in allowed:
+                            allowed[chunk_id] = matches_where(self._docs[chunk_id][1], where)
+                        if not allowed[chunk_id]:
+                            continue
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[chunk_id] / avg_length)
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+            top = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+            return [
+                (Document(id=chunk_id, page_content=self._docs[chunk_id][0], metadata=self._docs[chunk_id][1]), score)
+                for chunk_id, score in top
+            ]
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[Tuple[Document, float]]],
+    k: int = 4,
+    rrf_k: int = RRF_K
+) -> List[Tuple[Document, float]]:
+    """
+    Fuse ranked result lists by reciprocal rank: score = sum of 1 / (rrf_k + rank).
+
+    Only ranks matter, so BM25 scores and vector distances need no
+    normalization. Documents are matched across lists by Document.id.
+    """
+    fused: Dict[str, float] = {}
+    docs: Dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, (doc, _) in enumerate(ranking, start=1):
+            fused[doc.id] = fused.get(doc.id, 0.0) + 1.0 / (rrf_k + rank)
+            docs.setdefault(doc.id, doc)
+
+    top = sorted(fused.items(), key=lambda item: -item[1])[:k]
+    return [(docs[chunk_id], score) for chunk_id, score in top]
@@ -1,11 +1,27 @@
+import atexit
 import os
 import sqlite3
 import json
+import threading
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from src.core.cost_utils import calculate_cost
 
 LOG_DB_PATH = os.getenv("LOG_DB_PATH", "./logs/queries.db")
+# Tool-result log rows are buffered in memory and written in one transaction this often
+TOOL_RESULT_FLUSH_SECONDS = float(os.getenv("TOOL_RESULT_FLUSH_SECONDS", "5"))
+
+TOOL_RESULTS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS tool_results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT NOT NULL,
+        tool TEXT NOT NULL,
+        rows_matched INTEGER NOT NULL,
+        rows_returned INTEGER NOT NULL,
+        full_tokens INTEGER NOT NULL,
+        returned_tokens INTEGER NOT NULL
+    )
+"""
 
 
 def init_db():
@@ -31,10 +47,121 @@ def init_db():
         )
     """)
     
+    cursor.execute(TOOL_RESULTS_SCHEMA)
+    
     conn.commit()
     conn.close()
 
 
+_db_ready = False
+_pending_tool_results: List[Tuple[str, str, int, int, int, int]] = []
+_flush_timer: Optional[threading.Timer] = None
+_tool_results_lock = threading.Lock()
+_tool_results_write_lock = threading.Lock()
+
+
+def flush_tool_results():
+    """Write buffered tool-result rows in one transaction, creating the tables on first use."""
+    global _db_ready, _flush_timer
+    
+    with _tool_results_lock:
+        rows = list(_pending_tool_results)
+        _pending_tool_results.clear()
+        _flush_timer = None
+    if not rows:
+        return
+    
+    # Writes take their own lock, so tool calls only ever wait on the buffer
+    with _tool_results_write_lock:
+        try:
+            if not _db_ready:
+                init_db()
+                _db_ready = True
+            conn = sqlite3.connect(LOG_DB_PATH)
+            with conn:
+                conn.executemany("""
+                    INSERT INTO tool_results (
+                        timestamp, tool, rows_matched, rows_returned, full_tokens, returned_tokens
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                """, rows)
+            conn.close()
+        except (OSError, sqlite3.Error):
+            # Savings logging is best-effort; never fail a tool call over it
+            pass
+
+
+atexit.register(flush_tool_results)
+
+
+def log_tool_result(
+    tool: str,
+    rows_matched: int,
+    rows_returned: int,
+    full_tokens: int,
+    returned_tokens: int
+):
+    """
+    Log the size of a paginated tool result against the unpaginated output.
+    
+    The row is buffered and written with others by flush_tool_results()
+    within TOOL_RESULT_FLUSH_SECONDS (and at exit), so a tool call never
+    waits on SQLite.
+    
+    Args:
+        tool: Tool name
+        rows_matched: Total rows matching the query
+        rows_returned: Rows included in this result
+        full_tokens: Estimated tokens of all matches as full records (0 for continuation pages)
+        returned_tokens: Estimated tokens of the result actually returned
+    """
+    global _flush_timer
+    
+    with _tool_results_lock:
+        _pending_tool_results.append((
+            datetime.utcnow().isoformat(),
+            tool,
+            rows_matched,
+            rows_returned,
+            full_tokens,
+            returned_tokens
+        ))
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(TOOL_RESULT_FLUSH_SECONDS, flush_tool_results)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+
+def get_tool_result_savings() -> Dict[str, Any]:
+    """
+    Tokens saved by paginated tool results, per tool.
+    
+    Returns:
+        {tool: {"calls": int, "full_tokens": int, "returned_tokens": int, "tokens_saved": int}}
+    """
+    flush_tool_results()
+    
+    conn = sqlite3.connect(LOG_DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+        SELECT tool, COUNT(*), SUM(full_tokens), SUM(returned_tokens)
+        FROM tool_results
+        GROUP BY tool
+    """)
+    
+    savings = {}
+    for tool, calls, full_tokens, returned_tokens in cursor.fetchall():
+        savings[tool] = {
+            "calls": calls,
+            "full_tokens": full_tokens or 0,
+            "returned_tokens": returned_tokens or 0,
+            "tokens_saved": (full_tokens or 0) - (returned_tokens or 0)
+        }
+    
+    conn.close()
+    return savings
+
+
 def log_query(
     feature: str,
     model: str,
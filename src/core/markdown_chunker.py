@@ -0,0 +1,109 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from langchain.schema import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from src.core.cost_utils import estimate_token_count
+
+# Headings at or above this level always start a new chunk, so packing
+# changes after an edit stay within that top-level section
+PACK_BOUNDARY_LEVEL = 1
+
+_HEADING = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t#]*$")
+_FENCE = re.compile(r"^(```|~~~)")
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n")
+
+
+@dataclass
+class _Section:
+    path: Tuple[str, ...]
+    level: int
+    text: str
+
+
+def _sections(text: str) -> List[_Section]:
+    """Split markdown at headings (ignoring '#' lines inside fenced code); text before the first heading has level 0."""
+    sections = [_Section((), 0, "")]
+    path: List[Tuple[int, str]] = []
+    lines: List[str] = []
+    in_fence = False
+
+    def close():
+        sections[-1].text = "\n".join(lines).strip()
+
+    for line in text.splitlines():
+        if _FENCE.match(line.lstrip()):
+            in_fence = not in_fence
+        match = None if in_fence else _HEADING.match(line)
+        if match:
+            close()
+            level, title = len(match.group(1)), match.group(2).strip()
+            path = [(l, t) for l, t in path if l < level] + [(level, title)]
+            sections.append(_Section(tuple(t for _, t in path), level, ""))
+            lines = []
+        lines.append(line)
+    close()
+    return [section for section in sections if section.text]
+
+
+def _split_oversized(text: str, max_tokens: int) -> List[str]:
+    """Pack a long section's paragraphs up to the budget; paragraphs over it are split without overlap."""
+    splitter = RecursiveCharacterTextSplitter(chunk_size=max_tokens * 4, chunk_overlap=0, length_function=len)
+    pieces: List[str] = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if estimate_token_count(paragraph) > max_tokens:
+            pieces.extend(splitter.split_text(paragraph))
+        elif pieces and estimate_token_count(pieces[-1]) + estimate_token_count(paragraph) <= max_tokens:
+            pieces[-1] = f"{pieces[-1]}\n\n{paragraph}"
+        else:
+            pieces.append(paragraph)
+    return pieces
+
+
+def split_markdown_sections(text: str, max_tokens: int, metadata: Dict[str, str]) -> List[Document]:
+    """
+    Chunk markdown along its heading structure, without overlap.
+
+    Each heading starts a section. Consecutive small sections are packed
+    into one chunk up to `max_tokens` (estimated), but never across a
+    heading of level PACK_BOUNDARY_LEVEL or above; a section over the
+    budget is split at paragraph boundaries. Every chunk carries
+    `heading_path` metadata ("Guide > Network Architecture > NSG") naming
+    the heading of its first section.
+
+    Chunking is deterministic, and chunk IDs are derived from chunk text
+    (see src.core.indexer.chunk_ids), so an edit changes the
+    IDs of the edited chunk and, where it shifts the packing, of later
+    chunks up to the next top-level heading; every other chunk keeps its
+    ID and its vector.
+    """
+    groups: List[List[_Section]] = []
+    for section in _sections(text):
+        starts_group = (
+            not groups
+            or 0 < section.level <= PACK_BOUNDARY_LEVEL
+            or sum(estimate_token_count(s.text) for s in groups[-1]) + estimate_token_count(section.text) > max_tokens
+        )
+        if starts_group:
+            groups.append([section])
+        else:
+            groups[-1].append(section)
+
+    chunks = []
+    for group in groups:
+        head = group[0]
+        pieces = (
+            _split_oversized(head.text, max_tokens) if len(group) == 1
+            else ["\n\n".join(section.text for section in group)]
+        )
+        for piece in pieces:
+            chunks.append(Document(
+                page_content=piece,
+                metadata={**metadata, "heading_path": " > ".join(head.path), "section": head.path[-1] if head.path else ""}
+            ))
+    return chunks
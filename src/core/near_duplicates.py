@@ -0,0 +1,132 @@
+import hashlib
+import math
+import os
+import re
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain.schema import Document
+
+# A result is a near-duplicate when at least this share of its 3-word shingles is already
+# in a better-ranked result: ~0.9 for a copy with 3% of its words changed, or for a
+# section re-packed with a short intro; under 0.2 for unrelated passages
+NEAR_DUPLICATE_COVERAGE = float(os.getenv("NEAR_DUPLICATE_COVERAGE", "0.8"))
+# Candidates retrieved per requested result, so folding duplicates still leaves k distinct
+# results. The extra candidates replace folded ones, so a search returns about as many tokens
+# as without folding; 1 keeps exactly k candidates and returns fewer results (and tokens)
+# whenever duplicates fold
+NEAR_DUPLICATE_OVERFETCH = float(os.getenv("NEAR_DUPLICATE_OVERFETCH", "2"))
+
+SHINGLE_WORDS = 3
+MINHASH_PERMUTATIONS = 64
+SIGNATURE_KEY = "minhash"
+SHINGLE_COUNT_KEY = "shingles"
+
+_WORD = re.compile(r"\w+")
+_rng = np.random.default_rng(20240601)
+# Odd multipliers and offsets of the universal hash family (a * x + b mod 2**64, high 32 bits)
+_A = _rng.integers(1, 2**63, MINHASH_PERMUTATIONS, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_B = _rng.integers(0, 2**63, MINHASH_PERMUTATIONS, dtype=np.uint64)
+# Two different minima share their low 8 bits by chance 1 time in 256
+_CHANCE = 1 / 256
+
+
+def near_duplicate_candidates(k: int, overfetch: float = NEAR_DUPLICATE_OVERFETCH) -> int:
+    """How many results to retrieve so that k remain after suppress_near_duplicates()."""
+    return max(k, math.ceil(k * overfetch))
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    """64-bit hashes of a text's distinct overlapping 3-word shingles (lowercased)."""
+    words = _WORD.findall(text.lower())
+    shingles = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(max(len(words) - SHINGLE_WORDS + 1, 1))}
+    shingles.discard("")
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in shingles],
+        dtype=np.uint64
+    )
+
+
+def minhash(text: str) -> np.ndarray:
+    """
+    b-bit MinHash signature: the low 8 bits of the minimum of each of 64
+    hash permutations over the text's shingles (64 bytes).
+
+    The share of positions where two signatures agree estimates the
+    Jaccard similarity of the texts' shingle sets (see similarity()).
+    """
+    hashes = shingle_hashes(text)
+    if not len(hashes):
+        return np.zeros(MINHASH_PERMUTATIONS, dtype=np.uint8)
+    with np.errstate(over="ignore"):
+        permuted = (hashes[:, None] * _A + _B) >> np.uint64(32)
+    return (permuted.min(axis=0) & np.uint64(0xFF)).astype(np.uint8)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures, corrected for 8-bit collisions."""
+    return max(0.0, (float(np.mean(a == b)) - _CHANCE) / (1 - _CHANCE))
+
+
+def coverage(candidate: Tuple[int, np.ndarray], kept: Tuple[int, np.ndarray]) -> float:
+    """
+    Estimated share of the candidate's shingles that also occur in `kept`,
+    from (shingle count, signature) pairs: |A & B| = J * (|A| + |B|) / (1 + J).
+    """
+    (candidate_count, candidate_signature), (kept_count, kept_signature) = candidate, kept
+    if not candidate_count:
+        return 1.0 if not kept_count else 0.0
+    jaccard = similarity(candidate_signature, kept_signature)
+    return min(1.0, jaccard * (candidate_count + kept_count) / (1 + jaccard) / candidate_count)
+
+
+def add_signatures(chunks: List[Document]) -> List[Document]:
+    """Record each chunk's shingle count and MinHash signature (as hex, which every vector store accepts) in its metadata."""
+    for chunk in chunks:
+        chunk.metadata[SHINGLE_COUNT_KEY] = len(shingle_hashes(chunk.page_content))
+        chunk.metadata[SIGNATURE_KEY] = minhash(chunk.page_content).tobytes().hex()
+    return chunks
+
+
+def signature(doc: Document) -> Tuple[int, np.ndarray]:
+    """A chunk's (shingle count, signature) from its metadata, or computed from its text for chunks indexed without one."""
+    stored: Optional[str] = doc.metadata.get(SIGNATURE_KEY)
+    if stored and len(stored) == 2 * MINHASH_PERMUTATIONS and SHINGLE_COUNT_KEY in doc.metadata:
+        return int(doc.metadata[SHINGLE_COUNT_KEY]), np.frombuffer(bytes.fromhex(stored), dtype=np.uint8)
+    return len(shingle_hashes(doc.page_content)), minhash(doc.page_content)
+
+
+def suppress_near_duplicates(
+    results: Sequence[Tuple[Document, float]],
+    threshold: float = NEAR_DUPLICATE_COVERAGE
+) -> List[Tuple[Document, float, List[Document]]]:
+    """
+    Collapse near-duplicate chunks in a ranked result list.
+
+    Results are taken best first. One whose text is mostly (`threshold`
+    of its shingles) already in a kept result adds little but tokens, so
+    it is folded into that result rather than returned again. One that
+    mostly contains a kept result (the same section packed with more
+    text) takes that result's place and rank, with the kept one folded
+    into it.
+
+    Returns:
+        (Document, score, near-duplicates folded into it) for each kept result, in the original order
+    """
+    kept: List[Tuple[Document, float, List[Document]]] = []
+    signatures: List[Tuple[int, np.ndarray]] = []
+    for doc, score in results:
+        current = signature(doc)
+        match = next((i for i, other in enumerate(signatures) if coverage(current, other) >= threshold), None)
+        if match is not None:
+            kept[match][2].append(doc)
+            continue
+        contained = next((i for i, other in enumerate(signatures) if coverage(other, current) >= threshold), None)
+        if contained is not None:
+            smaller, rank_score, duplicates = kept[contained]
+            kept[contained] = (doc, rank_score, duplicates + [smaller])
+            signatures[contained] = current
+        else:
+            kept.append((doc, score, []))
+            signatures.append(current)
+    return kept
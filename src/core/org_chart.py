@@ -0,0 +1,289 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Above this share of rows with an edited name or manager, a full rebuild is cheaper than an update
+INCREMENTAL_MAX_CHANGED_SHARE = 0.1
+
+
+def _lowered(column: pd.Series) -> pd.Series:
+    return column.astype(str).str.lower()
+
+
+def _changed_rows(old: pd.DataFrame, new: pd.DataFrame, col: str) -> np.ndarray:
+    """Mask over the first len(old) rows of `new`: where `col` differs from `old`, row by row."""
+    old_values = old[col].to_numpy(dtype=object)
+    new_values = new[col].iloc[:len(old)].to_numpy(dtype=object)
+    differs = old_values != new_values
+    # Missing values compare unequal to themselves; only the few differing rows need the check
+    rows = np.flatnonzero(differs)
+    differs[rows[pd.isna(old_values[rows]) & pd.isna(new_values[rows])]] = False
+    return differs
+
+
+def _gather(order: np.ndarray, offsets: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """Concatenate the CSR slices order[offsets[n]:offsets[n + 1]] for every node, vectorized."""
+    starts = offsets[nodes]
+    counts = offsets[nodes + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return order[:0]
+    shift = np.repeat(starts - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+    return order[shift + np.arange(total)]
+
+
+class OrgChart:
+    """
+    Reporting tree over the employee directory with precomputed closure.
+
+    Each employee's manager name is resolved to a row once (the first
+    employee with that exact name, case-insensitive). A pre-order numbering
+    of the tree gives every manager an interval [pre, pre + size) that holds
+    exactly their direct and indirect reports, so "everyone under X" is one
+    contiguous slice and "is A under X" is two comparisons. Binary-lifting
+    ancestor tables answer common-manager queries in O(log depth).
+
+    Rows whose manager is blank or unknown are roots. Reporting cycles in the
+    data are broken at one member, which then becomes a root.
+
+    Names are resolved once per full build; after a reload, updated()
+    re-links only the rows whose name or manager changed (see
+    build_org_chart()).
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        n = len(df)
+        full_names = _lowered(df["full_name"])
+        if "manager" in df.columns:
+            codes, names = pd.factorize(pd.concat([full_names, _lowered(df["manager"])], ignore_index=True))
+            manager_codes = codes[n:]
+        else:
+            codes, names = pd.factorize(full_names)
+            manager_codes = np.full(n, -1)
+
+        # Employee and manager names share one code space, so a manager
+        # nobody is named yet resolves once someone is
+        self._names = pd.Index(names)
+        self._added_names: Dict[str, int] = {}
+        self._name_codes = codes[:n].astype(np.int64)
+        self._manager_codes = np.asarray(manager_codes, dtype=np.int64)
+        self._first_row = np.full(len(names), -1, dtype=np.int64)
+        self._first_row[self._name_codes[::-1]] = np.arange(n - 1, -1, -1)
+
+        # Resolved manager rows before cycle breaking, kept for updated()
+        self._links = self._resolve(np.arange(n))
+        self._build(self._links.copy())
+
+    def _codes(self, values: pd.Series) -> np.ndarray:
+        """Name codes for lowercased names, assigning new codes to names not seen before."""
+        codes = self._names.get_indexer(values)
+        for i in np.flatnonzero(codes < 0):
+            codes[i] = self._added_names.setdefault(values.iloc[i], len(self._names) + len(self._added_names))
+        return codes.astype(np.int64)
+
+    def _resolve(self, rows: np.ndarray) -> np.ndarray:
+        """Manager row of each given row (-1 for none, unknown or themselves)."""
+        manager_codes = self._manager_codes[rows]
+        links = np.where(manager_codes >= 0, self._first_row[np.maximum(manager_codes, 0)], -1)
+        links[links == rows] = -1
+        return links
+
+    def _build(self, parent: np.ndarray):
+        """Depths, subtree sizes, pre-order intervals, children and ancestor tables for a parent array."""
+        n = len(parent)
+        levels = self._levels(parent)
+        reached = sum(len(level) for level in levels)
+        if reached < n:
+            self._break_cycles(parent, levels)
+            levels = self._levels(parent)
+
+        self.parent = parent
+        self.depth = np.zeros(n, dtype=np.int32)
+        for d, level in enumerate(levels):
+            self.depth[level] = d
+
+        self.size = np.ones(n, dtype=np.int64)
+        for level in reversed(levels[1:]):
+            self.size += np.bincount(parent[level], weights=self.size[level], minlength=n).astype(np.int64)
+
+        self.pre = np.zeros(n, dtype=np.int64)
+        roots = levels[0] if levels else parent[:0]
+        self.pre[roots] = np.concatenate([[0], np.cumsum(self.size[roots])[:-1]])
+        for level in levels[1:]:
+            # Children arrive grouped by parent, so each sibling's offset is
+            # the running size total within its group.
+            sizes = self.size[level]
+            running = np.cumsum(sizes) - sizes
+            group_start = np.concatenate([[True], parent[level][1:] != parent[level][:-1]])
+            running -= np.maximum.accumulate(np.where(group_start, running, 0))
+            self.pre[level] = self.pre[parent[level]] + 1 + running
+
+        self.by_pre = np.empty(n, dtype=np.int64)
+        self.by_pre[self.pre] = np.arange(n)
+
+        self._children_order, self._children_offsets = self._children(parent)
+
+        up = np.where(parent >= 0, parent, np.arange(n))
+        self._up = [up]
+        for _ in range(max(1, int(self.depth.max(initial=0))).bit_length() - 1):
+            up = up[up]
+            self._up.append(up)
+
+    def updated(self, old: pd.DataFrame, new: pd.DataFrame) -> Optional["OrgChart"]:
+        """
+        The chart for `new`, given that this chart was built from `old`.
+
+        Only rows whose name or manager changed (or were appended), and rows
+        whose manager's name now resolves to a different employee, are
+        re-linked; no other name is looked up again. The tree arrays are
+        then rebuilt from the links, which is vectorized and a fraction of
+        a full build.
+
+        Returns:
+            The updated chart (this one if no name or manager changed), or
+            None when rows were removed or too many changed to be worth it
+        """
+        n_old, n = len(old), len(new)
+        has_manager = "manager" in new.columns
+        if n < n_old or n_old != len(self.parent) or has_manager != ("manager" in old.columns):
+            return None
+
+        changed = _changed_rows(old, new, "full_name")
+        if has_manager:
+            changed |= _changed_rows(old, new, "manager")
+        rows = np.concatenate([np.flatnonzero(changed), np.arange(n_old, n)])
+        if not len(rows):
+            return self
+        if len(rows) > n * INCREMENTAL_MAX_CHANGED_SHARE:
+            return None
+
+        chart = OrgChart.__new__(OrgChart)
+        chart._names = self._names
+        chart._added_names = dict(self._added_names)
+        appended = np.full(n - n_old, -1, dtype=np.int64)
+        chart._name_codes = np.concatenate([self._name_codes, appended])
+        chart._manager_codes = np.concatenate([self._manager_codes, appended])
+
+        renamed_from = chart._name_codes[rows]
+        chart._name_codes[rows] = chart._codes(_lowered(new["full_name"].iloc[rows]))
+        if has_manager:
+            chart._manager_codes[rows] = chart._codes(_lowered(new["manager"].iloc[rows]))
+
+        # Recompute the first holder of every name a changed row left or took
+        previous_first = np.full(len(chart._names) + len(chart._added_names), -1, dtype=np.int64)
+        previous_first[:len(self._first_row)] = self._first_row
+        touched = np.unique(np.concatenate([renamed_from[renamed_from >= 0], chart._name_codes[rows]]))
+        holders = np.flatnonzero(np.isin(chart._name_codes, touched))
+        chart._first_row = previous_first.copy()
+        chart._first_row[touched] = -1
+        codes, first = np.unique(chart._name_codes[holders], return_index=True)
+        chart._first_row[codes] = holders[first]
+
+        # Reports of a name whose first holder changed now report to someone else
+        moved = touched[chart._first_row[touched] != previous_first[touched]]
+        if len(moved):
+            rows = np.union1d(rows, np.flatnonzero(np.isin(chart._manager_codes, moved)))
+
+        chart._links = np.concatenate([self._links, appended])
+        chart._links[rows] = chart._resolve(rows)
+        chart._build(chart._links.copy())
+        return chart
+
+    @staticmethod
+    def _children(parent: np.ndarray):
+        has_parent = parent >= 0
+        order = np.flatnonzero(has_parent)
+        order = order[np.argsort(parent[order], kind="stable")]
+        counts = np.bincount(parent[order], minlength=len(parent))
+        return order, np.concatenate([[0], np.cumsum(counts)])
+
+    @classmethod
+    def _levels(cls, parent: np.ndarray) -> List[np.ndarray]:
+        order, offsets = cls._children(parent)
+        frontier = np.flatnonzero(parent < 0)
+        levels = []
+        while len(frontier):
+            levels.append(frontier)
+            frontier = _gather(order, offsets, frontier)
+        return levels
+
+    @staticmethod
+    def _break_cycles(parent: np.ndarray, levels: List[np.ndarray]):
+        settled = np.zeros(len(parent), dtype=bool)
+        for level in levels:
+            settled[level] = True
+
+        for start in np.flatnonzero(~settled).tolist():
+            path = []
+            on_path = set()
+            node = start
+            while node >= 0 and not settled[node] and node not in on_path:
+                path.append(node)
+                on_path.add(node)
+                node = int(parent[node])
+            if node >= 0 and node in on_path:
+                parent[node] = -1
+            settled[path] = True
+
+    def is_under(self, row: int, manager_row: int) -> bool:
+        """True if `row` reports to `manager_row` directly or indirectly."""
+        offset = self.pre[row] - self.pre[manager_row]
+        return 0 < offset < self.size[manager_row]
+
+    def reports(self, row: int, max_depth: Optional[int] = None) -> np.ndarray:
+        """Rows under `row` in org-chart order; max_depth=1 gives direct reports."""
+        if max_depth == 1:
+            return self.direct_reports(row)
+        rows = self.by_pre[self.pre[row] + 1:self.pre[row] + self.size[row]]
+        if max_depth is not None:
+            rows = rows[self.depth[rows] <= self.depth[row] + max_depth]
+        return rows
+
+    def direct_reports(self, row: int) -> np.ndarray:
+        return self._children_order[self._children_offsets[row]:self._children_offsets[row + 1]]
+
+    def chain_of_command(self, row: int) -> List[int]:
+        """Managers of `row` from the direct manager up to the top of the tree."""
+        chain = []
+        node = int(self.parent[row])
+        while node >= 0:
+            chain.append(node)
+            node = int(self.parent[node])
+        return chain
+
+    def ancestor(self, row: int, levels_up: int) -> int:
+        for k, up in enumerate(self._up):
+            if levels_up >> k & 1:
+                row = int(up[row])
+        return row
+
+    def common_manager(self, a: int, b: int) -> Optional[int]:
+        """Lowest employee both rows roll up to (possibly one of them), or None across separate trees."""
+        if self.depth[a] < self.depth[b]:
+            a, b = b, a
+        a = self.ancestor(a, int(self.depth[a] - self.depth[b]))
+        if a == b:
+            return a
+
+        for up in reversed(self._up):
+            if up[a] != up[b]:
+                a, b = int(up[a]), int(up[b])
+
+        if self.parent[a] < 0 or self.parent[a] != self.parent[b]:
+            return None
+        return int(self.parent[a])
+
+
+def build_org_chart(df: pd.DataFrame, previous: Optional[Tuple[pd.DataFrame, OrgChart]] = None) -> OrgChart:
+    """
+    Build the org chart for a directory snapshot, updating the previous
+    snapshot's chart in place of a full rebuild when the reload edited or
+    appended rows (see OrgChart.updated()). A reload that did not touch
+    names or managers (e.g. only roles or locations changed) reuses it as is.
+    """
+    if previous is not None:
+        chart = previous[1].updated(previous[0], df)
+        if chart is not None:
+            return chart
+    return OrgChart(df)
@@ -0,0 +1,150 @@
+import copy
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from src.core.embedding_cache import normalize_query
+
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "600"))
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "1024"))
+
+
+class SearchResultCache:
+    """
+    In-process LRU cache of search tool results.
+
+    Entries are keyed by tool, the index version of every collection the
+    tool reads (see VectorStoreRegistry.index_version), the normalized
+    query and the tool's other arguments (k, filters, mode). A re-index
+    that changes a collection bumps its version, so earlier entries stop
+    matching at once; invalidate() then frees them. Entries also expire
+    after `ttl` seconds, and the least recently used are evicted beyond
+    `capacity`. Hits and misses are counted per tool.
+
+    Results are copied in and out, so callers may modify what they get.
+    """
+
+    def __init__(self, ttl: float = RESULT_CACHE_TTL_SECONDS, capacity: int = RESULT_CACHE_SIZE):
+        self.ttl = ttl
+        self.capacity = capacity
+        self._entries: "OrderedDict[str, Tuple[float, Tuple[str, ...], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Counter] = {}
+
+    @staticmethod
+    def key(tool: str, versions: Dict[str, int], arguments: Dict[str, Any]) -> str:
+        """Cache key for one call; "query" and "keywords" arguments are compared in normalized form."""
+        normalized = dict(arguments)
+        if isinstance(normalized.get("query"), str):
+            normalized["query"] = normalize_query(normalized["query"])
+        if isinstance(normalized.get("keywords"), list):
+            normalized["keywords"] = [normalize_query(str(keyword)) for keyword in normalized["keywords"]]
+        payload = json.dumps([tool, versions, normalized], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _record(self, tool: str, outcome: str):
+        self._stats.setdefault(tool, Counter())[outcome] += 1
+
+    def get(self, tool: str, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self._record(tool, "expired")
+                entry = None
+            if entry is None:
+                self._record(tool, "misses")
+                return None
+            self._entries.move_to_end(key)
+            self._record(tool, "hits")
+        return copy.deepcopy(entry[2])
+
+    def put(self, key: str, collections: Sequence[str], value: Any):
+        entry = (time.monotonic() + self.ttl, tuple(collections), copy.deepcopy(value))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, collection: str) -> int:
+        """Drop every entry that read `collection`; returns how many were dropped."""
+        with self._lock:
+            stale = [key for key, (_, collections, _) in self._entries.items() if collection in collections]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-tool lookups, hits, misses (of which expired) and hit rate."""
+        with self._lock:
+            snapshot = {tool: Counter(counts) for tool, counts in self._stats.items()}
+
+        return {
+            tool: {
+                "lookups": counts["hits"] + counts["misses"],
+                "hits": counts["hits"],
+                "misses": counts["misses"],
+                "expired": counts["expired"],
+                "hit_rate": round(counts["hits"] / max(counts["hits"] + counts["misses"], 1), 3)
+            }
+            for tool, counts in snapshot.items()
+        }
+
+
+def cached_search(*collections: str) -> Callable:
+    """
+    Serve repeated calls of a search tool from the registry's SearchResultCache.
+
+    Apply under @tool. `collections` names what the tool reads; with none,
+    an entry depends on every registered collection. Results with an
+    "error" key are not cached, and neither is a result computed while one
+    of its collections was re-indexed.
+    """
+    def decorate(func: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> Dict[str, Any]:
+            from src.core.vector_store import get_vector_store_registry
+
+            registry = get_vector_store_registry()
+            cache = registry.result_cache
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+
+            names = collections or tuple(registry.specs)
+            versions = {name: registry.index_version(name) for name in names}
+            key = cache.key(func.__name__, versions, bound.arguments)
+            cached = cache.get(func.__name__, key)
+            if cached is not None:
+                return cached
+
+            result = func(*args, **kwargs)
+            if "error" not in result and versions == {name: registry.index_version(name) for name in names}:
+                cache.put(key, names, result)
+            return result
+
+        return wrapper
+    return decorate
+
+
+_result_cache: Optional[SearchResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_search_result_cache() -> SearchResultCache:
+    global _result_cache
+
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                _result_cache = SearchResultCache()
+
+    return _result_cache
@@ -0,0 +1,301 @@
+import hashlib
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.document_sources import CollectionSpec
+from src.core.vector_backends import NumpyCollection
+
+VECTOR_SNAPSHOT = os.getenv("VECTOR_SNAPSHOT")
+
+_MAGIC = b"LSNP"
+_FORMAT_VERSION = 1
+_PREFIX = struct.Struct("<4sII")
+# Sections start on page boundaries so each collection can be memory-mapped in place
+_ALIGN = 4096
+_COPY_BYTES = 1 << 20
+# Under Chroma's default max batch size
+_IMPORT_BATCH = 5000
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot is unreadable, corrupt, or built for a different embedding configuration."""
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def _copy_hashed(src, dst, length: int) -> str:
+    digest = hashlib.sha256()
+    while length:
+        block = src.read(min(_COPY_BYTES, length))
+        if not block:
+            raise SnapshotError("Unexpected end of file")
+        digest.update(block)
+        dst.write(block)
+        length -= len(block)
+    return digest.hexdigest()
+
+
+class VectorSnapshot:
+    """
+    A prebuilt, read-only copy of a registry's collections in one file.
+
+    Layout: "LSNP", a format version and a JSON header, then one
+    page-aligned section per collection holding a NumpyCollection file
+    (vectors, IVF lists, codes, IDs, documents, metadata) and one holding
+    its IncrementalIndexer manifest. The header records the embedding
+    model, each collection's embedding dimensions and quantization, and a
+    SHA-256 per section.
+
+    The NumpyBackend maps collections straight out of the snapshot (see
+    NumpyBackend.mount), so a container built with one serves its first
+    query without embedding or copying anything. Other backends load it
+    with import_snapshot().
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        try:
+            with open(self.path, "rb") as f:
+                magic, version, header_length = _PREFIX.unpack(f.read(_PREFIX.size))
+                if magic != _MAGIC:
+                    raise SnapshotError(f"{self.path} is not a vector snapshot")
+                if version != _FORMAT_VERSION:
+                    raise SnapshotError(f"{self.path} is snapshot format {version}; this build reads {_FORMAT_VERSION}")
+                self.header: Dict[str, Any] = json.loads(f.read(header_length))
+        except (OSError, struct.error, json.JSONDecodeError) as e:
+            raise SnapshotError(f"Could not read vector snapshot {self.path}: {e}") from e
+
+        self._data_offset = _align(_PREFIX.size + header_length)
+        self._verified: set = set()
+        self._lock = threading.Lock()
+
+    @property
+    def embedding_model(self) -> str:
+        return self.header["embedding_model"]
+
+    @property
+    def collections(self) -> Dict[str, Dict[str, Any]]:
+        return self.header["collections"]
+
+    def check_compatible(self, spec: CollectionSpec, embedding_model: str):
+        """
+        Raises:
+            SnapshotError: If the snapshot lacks the collection or its vectors
+                come from a different model or width than `spec` would embed queries with
+        """
+        entry = self.collections.get(spec.name)
+        if entry is None:
+            raise SnapshotError(f"Snapshot {self.path} has no collection '{spec.name}'")
+        if self.embedding_model != embedding_model:
+            raise SnapshotError(
+                f"Snapshot {self.path} was built with embedding model '{self.embedding_model}', "
+                f"but '{embedding_model}' is configured"
+            )
+        if entry["embedding_dimensions"] != spec.embedding_dimensions:
+            raise SnapshotError(
+                f"Snapshot {self.path} has '{spec.name}' at embedding dimensions {entry['embedding_dimensions']}, "
+                f"but {spec.embedding_dimensions} is configured"
+            )
+
+    def _section(self, name: str, section: str) -> Tuple[int, int, str]:
+        offset, length, sha256 = self.collections[name][section]
+        return self._data_offset + offset, length, sha256
+
+    def verify(self, name: str):
+        """
+        Check a collection's sections against their checksums (once per process).
+
+        Raises:
+            SnapshotError: If either section is truncated or corrupt
+        """
+        with self._lock:
+            if name in self._verified:
+                return
+            with open(self.path, "rb") as f:
+                for section in ("vectors", "manifest"):
+                    offset, length, expected = self._section(name, section)
+                    f.seek(offset)
+                    digest = hashlib.sha256()
+                    remaining = length
+                    while remaining:
+                        block = f.read(min(_COPY_BYTES, remaining))
+                        if not block:
+                            break
+                        digest.update(block)
+                        remaining -= len(block)
+                    if remaining or digest.hexdigest() != expected:
+                        raise SnapshotError(f"Snapshot {self.path} is corrupt: '{name}' {section} checksum mismatch")
+            self._verified.add(name)
+
+    def source(self, name: str) -> Tuple[Path, int]:
+        """The verified (file, offset) of a collection's vectors, for NumpyCollection(source=...)."""
+        self.verify(name)
+        return self.path, self._section(name, "vectors")[0]
+
+    def open(self, name: str, path: Path, quantization: Optional[str] = None) -> NumpyCollection:
+        """A collection mapped from the snapshot; persisting changes to it writes `path`."""
+        return NumpyCollection(name, path, quantization=quantization, source=self.source(name))
+
+    def manifest(self, name: str) -> bytes:
+        self.verify(name)
+        offset, length, _ = self._section(name, "manifest")
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def install_manifest(self, name: str, manifest_dir: Path):
+        """Write a collection's manifest into `manifest_dir` unless one is already there."""
+        path = Path(manifest_dir) / f"{name}.manifest.json"
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(self.manifest(name))
+        os.replace(tmp, path)
+
+
+def export_snapshot(registry, path: str, names: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Sync the given collections (default: all registered) and write them to one snapshot file.
+
+    Collections are re-encoded as NumpyCollection files whatever the
+    registry's backend, with each spec's quantization applied.
+
+    Returns:
+        The snapshot header
+    """
+    names = names or list(registry.specs)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    header: Dict[str, Any] = {
+        "embedding_model": registry.embedding_model,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "collections": {}
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        staged = []
+        for name in names:
+            spec = registry.specs[name]
+            collection = registry.get(name)
+            rows = collection.get(include=["embeddings", "documents", "metadatas"])
+
+            vec_path = Path(tmp) / f"{name}.vec"
+            staged_collection = NumpyCollection(name, vec_path, quantization=spec.quantization)
+            staged_collection.upsert(rows["ids"], rows["embeddings"], rows["documents"], rows["metadatas"])
+            staged_collection.persist()
+
+            manifest_path = Path(tmp) / f"{name}.manifest.json"
+            shutil.copyfile(Path(registry.backend.manifest_dir) / f"{name}.manifest.json", manifest_path)
+            staged.append((name, spec, len(rows["ids"]), vec_path, manifest_path))
+
+        # Section offsets are relative to the end of the header, so the header can be sized last
+        offset = 0
+        for name, spec, count, vec_path, manifest_path in staged:
+            entry = {
+                "embedding_dimensions": spec.embedding_dimensions,
+                "quantization": spec.quantization,
+                "count": count
+            }
+            for section, file in (("vectors", vec_path), ("manifest", manifest_path)):
+                length = file.stat().st_size
+                entry[section] = [offset, length, "0" * 64]
+                offset = _align(offset + length)
+            header["collections"][name] = entry
+
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as out:
+            # Checksums are filled in while copying, then the header is rewritten
+            # in place; hex digests are the same length as the placeholders
+            encoded = json.dumps(header).encode("utf-8")
+            data_offset = _align(_PREFIX.size + len(encoded))
+
+            for name, _, _, vec_path, manifest_path in staged:
+                entry = header["collections"][name]
+                for section, file in (("vectors", vec_path), ("manifest", manifest_path)):
+                    out.seek(data_offset + entry[section][0])
+                    with open(file, "rb") as src:
+                        entry[section][2] = _copy_hashed(src, out, entry[section][1])
+
+            out.truncate(data_offset + offset)
+            out.seek(0)
+            out.write(_PREFIX.pack(_MAGIC, _FORMAT_VERSION, len(encoded)))
+            out.write(json.dumps(header).encode("utf-8"))
+        os.replace(tmp_path, path)
+
+    return header
+
+
+def import_snapshot(registry, path: str, names: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Replace the registry's stored collections with the snapshot's, without embedding anything.
+
+    Every collection is checked for compatibility and integrity before any
+    is replaced, then its rows are upserted into the registry's backend in
+    batches. (The numpy backend can instead map a snapshot in place: set
+    VECTOR_SNAPSHOT.)
+
+    Returns:
+        Chunks imported per collection
+
+    Raises:
+        SnapshotError: If the snapshot is corrupt or built for a different embedding configuration
+    """
+    snapshot = VectorSnapshot(path)
+    names = names or [name for name in registry.specs if name in snapshot.collections]
+    for name in names:
+        snapshot.check_compatible(registry.specs[name], registry.embedding_model)
+        snapshot.verify(name)
+
+    backend = registry.backend
+    imported = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in names:
+            spec = registry.specs[name]
+            backend.drop(name)
+            (Path(backend.manifest_dir) / f"{name}.manifest.json").unlink(missing_ok=True)
+
+            rows = snapshot.open(name, Path(tmp) / f"{name}.vec").get(include=["embeddings", "documents", "metadatas"])
+            collection = backend.open(name, spec.quantization)
+            for start in range(0, len(rows["ids"]), _IMPORT_BATCH):
+                end = start + _IMPORT_BATCH
+                collection.upsert(
+                    ids=rows["ids"][start:end],
+                    embeddings=rows["embeddings"][start:end],
+                    documents=rows["documents"][start:end],
+                    metadatas=rows["metadatas"][start:end]
+                )
+            backend.persist(collection)
+            snapshot.install_manifest(name, backend.manifest_dir)
+            imported[name] = len(rows["ids"])
+    return imported
+
+
+if __name__ == "__main__":
+    from src.core.vector_store import get_vector_store_registry
+
+    usage = "Usage: python -m src.core.snapshots {export|import|info} <snapshot file> [collection ...]"
+    if len(sys.argv) < 3 or sys.argv[1] not in ("export", "import", "info"):
+        raise SystemExit(usage)
+
+    command, file, collections = sys.argv[1], sys.argv[2], sys.argv[3:] or None
+    if command == "export":
+        print(json.dumps(export_snapshot(get_vector_store_registry(), file, collections), indent=1))
+    elif command == "import":
+        print(json.dumps(import_snapshot(get_vector_store_registry(), file, collections), indent=1))
+    else:
+        snapshot = VectorSnapshot(file)
+        for name in collections or list(snapshot.collections):
+            snapshot.verify(name)
+        print(json.dumps(snapshot.header, indent=1))
@@ -0,0 +1,96 @@
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
+from typing import Callable, Dict, Any, Optional, Tuple
+
+from src.core.guardrails import SLOW_INPUT_CHECKS, run_input_checks
+
+SPECULATIVE_GUARDRAILS = os.getenv("SPECULATIVE_GUARDRAILS", "true").lower() == "true"
+
+_check_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="guardrail-check")
+_agent_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SPECULATIVE_AGENT_WORKERS", "16")),
+    thread_name_prefix="guardrail-agent"
+)
+
+_pending_verdict: ContextVar[Optional[Future]] = ContextVar("pending_verdict", default=None)
+
+
+class GuardrailRejected(Exception):
+    """Raised inside a speculative graph run when its input check fails."""
+
+
+def await_input_verdict():
+    """
+    Gate for agent nodes: wait for a speculative input check to resolve.
+
+    Called right after an agent's LLM turn and before its tool calls are
+    returned to the graph. Outside a speculative run, or once the verdict is
+    in, this returns immediately. If the check failed it raises
+    GuardrailRejected, which aborts the graph before any tool executes.
+    """
+    verdict = _pending_verdict.get()
+    if verdict is None:
+        return
+
+    is_safe, reason = verdict.result()
+    if not is_safe:
+        raise GuardrailRejected(reason)
+
+
+def _invoke_gated(agent, inputs: Dict[str, Any], verdict: Future):
+    _pending_verdict.set(verdict)
+    return agent.invoke(inputs)
+
+
+def invoke_with_guardrails(
+    get_agent: Callable[[], Any],
+    inputs: Dict[str, Any],
+    text: str,
+    speculative: Optional[bool] = None
+) -> Tuple[Optional[Dict[str, Any]], str]:
+    """
+    Invoke a compiled agent graph behind the input guardrails.
+
+    The cheap checks (guardrails.INPUT_CHECKS) run inline first, and a
+    rejected input returns before the agent is even fetched. Only checks
+    registered as slow (guardrails.SLOW_INPUT_CHECKS) go to a thread.
+
+    In speculative mode the slow checks run concurrently with the agent's
+    first LLM turn, so their cost is hidden from end-to-end latency. The
+    caller waits for the verdict before anything is returned; if the input
+    is rejected the caller returns at once, and the abandoned run is stopped
+    by await_input_verdict() at the end of its in-flight LLM turn, before
+    any tool runs. Its response is discarded.
+
+    Args:
+        get_agent: Returns the compiled LangGraph agent (e.g. a get_compiled_agent() call)
+        inputs: Initial graph state
+        text: User input to check
+        speculative: Overlap slow checks with the first turn (default: SPECULATIVE_GUARDRAILS)
+
+    Returns:
+        (graph result, "OK") on success, or (None, reason) if the input was rejected
+    """
+    if speculative is None:
+        speculative = SPECULATIVE_GUARDRAILS
+
+    is_safe, reason = run_input_checks(text)
+    if is_safe and SLOW_INPUT_CHECKS and not speculative:
+        is_safe, reason = run_input_checks(text, SLOW_INPUT_CHECKS)
+    if not is_safe:
+        return None, reason
+
+    agent = get_agent()
+    if not SLOW_INPUT_CHECKS or not speculative:
+        return agent.invoke(inputs), "OK"
+
+    verdict = _check_executor.submit(run_input_checks, text, SLOW_INPUT_CHECKS)
+    run = _agent_executor.submit(copy_context().run, _invoke_gated, agent, inputs, verdict)
+
+    is_safe, reason = verdict.result()
+    if not is_safe:
+        run.cancel()
+        return None, reason
+
+    return run.result(), "OK"
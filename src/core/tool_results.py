@@ -0,0 +1,148 @@
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from src.core.cost_utils import estimate_token_count
+from src.core.logging_utils import log_tool_result
+
+TOOL_RESULT_TOKEN_BUDGET = int(os.getenv("TOOL_RESULT_TOKEN_BUDGET", "2000"))
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+DEFAULT_EMPLOYEE_COLUMNS = ["full_name", "role", "department", "location", "manager", "email"]
+
+
+def encode_cursor(version: int, offset: int) -> str:
+    return f"{version}:{offset}"
+
+
+def decode_cursor(cursor: Optional[str], version: int) -> int:
+    """
+    Offset encoded in a cursor from a previous page.
+
+    Raises:
+        ValueError: If the cursor is malformed or the directory has been
+            reloaded since it was issued (row positions are no longer valid)
+    """
+    if not cursor:
+        return 0
+    try:
+        cursor_version, offset = (int(part) for part in cursor.split(":"))
+    except ValueError:
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    if cursor_version != version:
+        raise ValueError("The directory changed since this cursor was issued; rerun the query without a cursor")
+    return offset
+
+
+def columnar(df: pd.DataFrame) -> Dict[str, List[Any]]:
+    """Encode rows as {column: [values]} so each key appears once instead of once per record."""
+    return {col: df[col].astype(object).where(df[col].notna(), None).tolist() for col in df.columns}
+
+
+def _tokens(data: Any) -> int:
+    return estimate_token_count(json.dumps(data, default=str, separators=(",", ":")))
+
+
+def _clip(value: Any, chars: int, items: int) -> Any:
+    """Cut strings to `chars` characters and lists to `items` entries, recursively."""
+    if isinstance(value, str):
+        return value if len(value) <= chars else value[:chars] + "..."
+    if isinstance(value, list):
+        return [_clip(v, chars, items) for v in value[:items]]
+    if isinstance(value, dict):
+        return {k: _clip(v, chars, items) for k, v in value.items()}
+    return value
+
+
+def paginate_frame(
+    df: pd.DataFrame,
+    version: int,
+    tool_name: str,
+    cursor: Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    columns: Optional[List[str]] = None,
+    token_budget: int = TOOL_RESULT_TOKEN_BUDGET,
+    records_key: str = "data",
+    fields: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    A complete tool result around one page of rows, projected, columnar and held under a token budget.
+
+    The budget applies to the whole result, including the tool's own
+    `fields`. Rows are dropped from the end of the page until it fits, and
+    `next_cursor` resumes right after the last row returned. If a single
+    row (or `fields` alone) is still over budget, long strings and lists
+    are cut short and the result is marked "truncated". Tokens saved
+    against the old output (every matching row as a full record, estimated
+    from the page) are logged per call.
+
+    Args:
+        df: All matching rows
+        version: Directory version the rows came from (bound into the cursor)
+        tool_name: Tool name for the savings log
+        cursor: Cursor from a previous page, or None for the first page
+        page_size: Maximum rows per page
+        columns: Columns to return (default: DEFAULT_EMPLOYEE_COLUMNS)
+        token_budget: Hard cap on the estimated tokens of the whole result
+        records_key: Result key holding the columnar rows
+        fields: Other result fields (summaries, the matched manager, ...),
+            placed before the page
+
+    Returns:
+        {
+            **fields,
+            "count": Total matching rows,
+            "returned": Rows in this page,
+            "columns": Column names,
+            records_key: {column: [values]},
+            "next_cursor": Cursor for the next page, or None on the last page
+        }
+    """
+    offset = decode_cursor(cursor, version)
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    fields = fields or {}
+
+    projected = [c for c in (columns or DEFAULT_EMPLOYEE_COLUMNS) if c in df.columns]
+    page = df.iloc[offset:offset + page_size]
+
+    def assemble(data: Dict[str, List[Any]], rows: int) -> Dict[str, Any]:
+        end = offset + rows
+        return {
+            **fields,
+            "count": len(df),
+            "returned": rows,
+            "columns": projected,
+            records_key: data,
+            "next_cursor": encode_cursor(version, end) if end < len(df) else None
+        }
+
+    data = columnar(page[projected])
+    result = assemble(data, len(page))
+    tokens = _tokens(result)
+
+    while tokens > token_budget and len(page) > 1:
+        page_tokens = _tokens(data)
+        room = max(token_budget - (tokens - page_tokens), 0)
+        keep = max(1, min(len(page) - 1, int(len(page) * room / max(page_tokens, 1))))
+        page = page.iloc[:keep]
+        data = {col: values[:keep] for col, values in data.items()}
+        result = assemble(data, keep)
+        tokens = _tokens(result)
+
+    chars, items = 1024, 1024
+    while tokens > token_budget and chars >= 16:
+        clipped = _clip(fields, chars, items)
+        result = {**assemble(_clip(data, chars, items), len(page)), **clipped, "truncated": True}
+        tokens = _tokens(result)
+        chars, items = chars // 2, max(1, items // 2)
+
+    if len(page):
+        # Continuation pages had no counterpart before (the first call
+        # returned everything), so they count as pure cost.
+        full_tokens = _tokens(page.to_dict('records')) * len(df) // len(page) if offset == 0 else 0
+        log_tool_result(tool_name, len(df), len(page), full_tokens, tokens)
+
+    return result
@@ -0,0 +1,898 @@
+import bisect
+import json
+import operator
+import os
+import struct
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma")
+NUMPY_VECTOR_DTYPE = os.getenv("NUMPY_VECTOR_DTYPE", "float32")
+# Collections up to this size are searched exactly; larger ones get an IVF index
+EXACT_SEARCH_MAX_ROWS = int(os.getenv("EXACT_SEARCH_MAX_ROWS", "20000"))
+IVF_NPROBE = int(os.getenv("IVF_NPROBE", "16"))
+# Quantized collections re-rank this many times k candidates at full precision
+QUANTIZED_RERANK_FACTOR = int(os.getenv("QUANTIZED_RERANK_FACTOR", "8"))
+QUANTIZATION_MODES = (None, "int8", "pq")
+PQ_SUBVECTOR_DIMS = 8
+PQ_CENTROIDS = 256
+
+# Per-vector overhead of Chroma's HNSW graph (M=16 links per level 0 node, 4 bytes each, two directions)
+_HNSW_LINK_BYTES = 16 * 2 * 4
+
+_MAGIC = b"LVEC"
+_FORMAT_VERSION = 1
+_HEADER_BYTES = 4096
+_ALIGN = 64
+_SCAN_BLOCK_ROWS = 2048
+_KMEANS_ITERATIONS = 10
+_KMEANS_SAMPLE_PER_LIST = 64
+# PQ codebooks have few dimensions per subspace and converge on a smaller sample
+_PQ_SAMPLE_PER_CENTROID = 16
+
+_WHERE_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "$eq": operator.eq,
+    "$ne": operator.ne,
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le,
+    "$in": lambda value, options: value in options,
+    "$nin": lambda value, options: value not in options,
+}
+
+
+def matches_where(metadata: Dict[str, Any], where: Dict[str, Any]) -> bool:
+    """
+    Evaluate a Chroma-style metadata filter ({"key": value}, {"key": {"$op": value}},
+    {"$and": [...]}, {"$or": [...]}) against one chunk's metadata.
+
+    Raises:
+        ValueError: On an unknown operator
+    """
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key not in metadata:
+            return False
+        elif isinstance(condition, dict):
+            for op, value in condition.items():
+                if op not in _WHERE_OPERATORS:
+                    raise ValueError(f"Unsupported filter operator '{op}'. Use one of {sorted(_WHERE_OPERATORS)}")
+                if not _WHERE_OPERATORS[op](metadata[key], value):
+                    return False
+        elif metadata[key] != condition:
+            return False
+    return True
+
+
+def where_all(clauses: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Combine filter clauses into one Chroma-style filter: None, the clause itself, or {"$and": clauses}."""
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+_RANGE_OPERATORS = ("$gt", "$gte", "$lt", "$lte")
+
+
+class MetadataIndex:
+    """
+    Inverted index over a collection's chunk metadata: key -> value -> rows.
+
+    Answers the filters matches_where() understands with set operations on
+    sorted row arrays instead of a check per row, so a filter costs time in
+    proportion to the rows it matches. Equality, $in and $nin look values
+    up directly; range operators binary-search the key's distinct values,
+    kept sorted per type (numbers and strings), and take the rows of the
+    matching values as one slice. As with matches_where(), a chunk without
+    the key never matches a condition on it, not even $ne or $nin.
+
+    A key with an unhashable value on any chunk is left unindexed and
+    conditions on it are checked row by row.
+    """
+
+    def __init__(self, metadatas: Sequence[Optional[Dict[str, Any]]]):
+        self.count = len(metadatas)
+        self._metadatas = metadatas
+        self._unindexed: set = set()
+        postings: Dict[str, Dict[Any, List[int]]] = {}
+        for row, metadata in enumerate(metadatas):
+            for key, value in (metadata or {}).items():
+                try:
+                    postings.setdefault(key, {}).setdefault(value, []).append(row)
+                except TypeError:
+                    self._unindexed.add(key)
+
+        self._postings: Dict[str, Dict[Any, np.ndarray]] = {
+            key: {value: np.array(rows, dtype=np.int64) for value, rows in values.items()}
+            for key, values in postings.items() if key not in self._unindexed
+        }
+        self._present = {key: np.sort(np.concatenate(list(values.values()))) for key, values in self._postings.items()}
+        # (key, str or float) -> (sorted distinct values, their rows in value order, offsets into those rows)
+        self._sorted: Dict[Tuple[str, type], Tuple[List[Any], np.ndarray, np.ndarray]] = {}
+
+    @staticmethod
+    def _kind(value: Any) -> Optional[type]:
+        if isinstance(value, str):
+            return str
+        if isinstance(value, (int, float)):
+            return float
+        return None
+
+    def _sorted_values(self, key: str, kind: type) -> Tuple[List[Any], np.ndarray, np.ndarray]:
+        if (key, kind) not in self._sorted:
+            values = sorted(value for value in self._postings[key] if self._kind(value) is kind)
+            rows = [self._postings[key][value] for value in values]
+            self._sorted[(key, kind)] = (
+                values,
+                np.concatenate(rows) if rows else np.empty(0, dtype=np.int64),
+                np.concatenate([[0], np.cumsum([len(r) for r in rows])]).astype(np.int64)
+            )
+        return self._sorted[(key, kind)]
+
+    def _equal(self, key: str, value: Any) -> np.ndarray:
+        try:
+            return self._postings[key].get(value, _NO_ROWS)
+        except TypeError:
+            return _NO_ROWS
+
+    def _range(self, key: str, bounds: List[Tuple[str, Any]]) -> np.ndarray:
+        """Rows within every (operator, value) bound, taken as one slice of the key's rows in value order."""
+        kinds = {self._kind(value) for _, value in bounds}
+        if None in kinds:
+            op, value = next((op, value) for op, value in bounds if self._kind(value) is None)
+            raise ValueError(f"Filter operator '{op}' needs a number or string, got {value!r}")
+        if len(kinds) > 1:
+            return _intersect([self._range(key, [bound]) for bound in bounds], self.count)
+
+        values, rows, offsets = self._sorted_values(key, kinds.pop())
+        start, stop = 0, len(values)
+        for op, value in bounds:
+            if op == "$gt":
+                start = max(start, bisect.bisect_right(values, value))
+            elif op == "$gte":
+                start = max(start, bisect.bisect_left(values, value))
+            elif op == "$lt":
+                stop = min(stop, bisect.bisect_left(values, value))
+            else:
+                stop = min(stop, bisect.bisect_right(values, value))
+        if start >= stop:
+            return _NO_ROWS
+        return np.sort(rows[offsets[start]:offsets[stop]])
+
+    def _conditions(self, key: str, condition: Dict[str, Any]) -> np.ndarray:
+        """Rows meeting every operator in `condition`; range bounds on the key are combined into one interval."""
+        for op in condition:
+            if op not in _WHERE_OPERATORS:
+                raise ValueError(f"Unsupported filter operator '{op}'. Use one of {sorted(_WHERE_OPERATORS)}")
+        if key not in self._postings:
+            return _NO_ROWS
+        matched = [self._condition(key, op, value) for op, value in condition.items() if op not in _RANGE_OPERATORS]
+        bounds = [(op, value) for op, value in condition.items() if op in _RANGE_OPERATORS]
+        if bounds:
+            matched.append(self._range(key, bounds))
+        return _intersect(matched, self.count)
+
+    def _condition(self, key: str, op: str, value: Any) -> np.ndarray:
+        if op == "$eq":
+            return self._equal(key, value)
+        if op == "$in":
+            return _union([self._equal(key, option) for option in value])
+        if op == "$ne":
+            return np.setdiff1d(self._present[key], self._equal(key, value), assume_unique=True)
+        if op == "$nin":
+            matched = _union([self._equal(key, option) for option in value])
+            return np.setdiff1d(self._present[key], matched, assume_unique=True)
+        return self._range(key, [(op, value)])
+
+    def rows(self, where: Dict[str, Any]) -> np.ndarray:
+        """
+        Sorted rows whose metadata matches a Chroma-style filter (same semantics as matches_where).
+
+        Raises:
+            ValueError: On an unknown operator, or a range bound that is neither a number nor a string
+        """
+        matched = []
+        for key, condition in where.items():
+            if key == "$and":
+                matched.append(_intersect([self.rows(clause) for clause in _merge_ranges(condition)], self.count))
+            elif key == "$or":
+                matched.append(_union([self.rows(clause) for clause in condition]))
+            elif key in self._unindexed:
+                matched.append(np.array(
+                    [row for row, metadata in enumerate(self._metadatas) if matches_where(metadata or {}, {key: condition})],
+                    dtype=np.int64
+                ))
+            elif isinstance(condition, dict):
+                matched.append(self._conditions(key, condition))
+            else:
+                matched.append(self._equal(key, condition) if key in self._postings else _NO_ROWS)
+        return _intersect(matched, self.count)
+
+
+_NO_ROWS = np.empty(0, dtype=np.int64)
+
+
+def _merge_ranges(clauses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Fold $and clauses that each put one range bound on a key ({"date": {"$gte": a}},
+    {"date": {"$lte": b}}) into one clause per key, so the range is one slice of
+    the index rather than two large row sets intersected.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    rest = []
+    for clause in clauses:
+        if len(clause) == 1:
+            (key, condition), = clause.items()
+            if (not key.startswith("$") and isinstance(condition, dict) and len(condition) == 1
+                    and set(condition) <= set(_RANGE_OPERATORS) and not set(condition) & set(merged.get(key, {}))):
+                merged.setdefault(key, {}).update(condition)
+                continue
+        rest.append(clause)
+    return rest + [{key: condition} for key, condition in merged.items()]
+
+
+def _union(row_sets: List[np.ndarray]) -> np.ndarray:
+    row_sets = [rows for rows in row_sets if len(rows)]
+    if not row_sets:
+        return _NO_ROWS
+    return row_sets[0] if len(row_sets) == 1 else np.unique(np.concatenate(row_sets))
+
+
+def _intersect(row_sets: List[np.ndarray], count: int) -> np.ndarray:
+    """Rows in every set; all `count` rows when there are no sets."""
+    if not row_sets:
+        return np.arange(count, dtype=np.int64)
+    row_sets = sorted(row_sets, key=len)
+    result = row_sets[0]
+    for rows in row_sets[1:]:
+        if not len(result):
+            break
+        # Binary-search the smaller set's rows in the larger one
+        found = np.minimum(np.searchsorted(rows, result), len(rows) - 1)
+        result = result[rows[found] == result]
+    return result
+
+
+def _nearest_centroid(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    centroid_norms = np.einsum("ij,ij->i", centroids, centroids)
+    assign = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), _SCAN_BLOCK_ROWS):
+        block = np.asarray(vectors[start:start + _SCAN_BLOCK_ROWS], dtype=np.float32)
+        distances = block @ centroids.T
+        distances *= -2
+        distances += centroid_norms
+        assign[start:start + len(block)] = np.argmin(distances, axis=1)
+    return assign
+
+
+def _sample(vectors: np.ndarray, size: int, rng: np.random.Generator) -> np.ndarray:
+    rows = np.sort(rng.choice(len(vectors), min(len(vectors), size), replace=False))
+    return np.asarray(vectors[rows], dtype=np.float32)
+
+
+def _kmeans(sample: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    centroids = sample[rng.choice(len(sample), k, replace=False)].copy()
+    for _ in range(_KMEANS_ITERATIONS):
+        assign = _nearest_centroid(sample, centroids)
+        counts = np.bincount(assign, minlength=k)
+        filled = counts > 0
+        # Sum each cluster's members as one contiguous segment of the sorted sample;
+        # empty clusters keep their previous centroid
+        starts = np.cumsum(counts) - counts
+        sums = np.add.reduceat(sample[np.argsort(assign, kind="stable")], starts[filled], axis=0)
+        centroids[filled] = sums / counts[filled, None]
+    return centroids
+
+
+def train_ivf(vectors: np.ndarray, nlist: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    k-means coarse quantizer for an inverted-file index.
+
+    Returns:
+        (centroids as float32 [nlist, dims], list assignment of every row)
+    """
+    rng = np.random.default_rng(seed)
+    centroids = _kmeans(_sample(vectors, nlist * _KMEANS_SAMPLE_PER_LIST, rng), nlist, rng)
+    return centroids, _nearest_centroid(vectors, centroids)
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-dimension scalar quantization to int8 (4x smaller than float32).
+
+    Returns:
+        (codes as int8 [n, dims], codebook as float32 [2, dims] of scale and
+        offset, so a vector decodes as codes * scale + offset)
+    """
+    low = np.full(vectors.shape[1], np.inf, dtype=np.float32)
+    high = np.full(vectors.shape[1], -np.inf, dtype=np.float32)
+    for start in range(0, len(vectors), _SCAN_BLOCK_ROWS):
+        block = np.asarray(vectors[start:start + _SCAN_BLOCK_ROWS], dtype=np.float32)
+        low, high = np.minimum(low, block.min(axis=0)), np.maximum(high, block.max(axis=0))
+
+    scale = np.where(high > low, (high - low) / 255, 1).astype(np.float32)
+    codes = np.empty(vectors.shape, dtype=np.int8)
+    for start in range(0, len(vectors), _SCAN_BLOCK_ROWS):
+        block = np.asarray(vectors[start:start + _SCAN_BLOCK_ROWS], dtype=np.float32)
+        codes[start:start + len(block)] = np.clip(np.rint((block - low) / scale) - 128, -128, 127)
+    return codes, np.stack([scale, low + 128 * scale])
+
+
+def train_pq(vectors: np.ndarray, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Product quantization: split each vector into subvectors of about
+    PQ_SUBVECTOR_DIMS dimensions and store each as the uint8 index of its
+    nearest of PQ_CENTROIDS k-means centroids (one byte per subvector, 32x
+    smaller than float32 at 8 dimensions per byte).
+
+    Returns:
+        (codes as uint8 [n, subspaces], codebook as float32 [subspaces, centroids, subvector dims])
+    """
+    dims = vectors.shape[1]
+    sub_dims = max(d for d in range(1, PQ_SUBVECTOR_DIMS + 1) if dims % d == 0)
+    subspaces = dims // sub_dims
+    centroids = min(PQ_CENTROIDS, len(vectors))
+
+    rng = np.random.default_rng(seed)
+    sample = _sample(vectors, centroids * _PQ_SAMPLE_PER_CENTROID, rng)
+    codebook = np.stack([
+        _kmeans(np.ascontiguousarray(sample[:, j * sub_dims:(j + 1) * sub_dims]), centroids, rng)
+        for j in range(subspaces)
+    ])
+
+    codes = np.empty((len(vectors), subspaces), dtype=np.uint8)
+    for start in range(0, len(vectors), _SCAN_BLOCK_ROWS):
+        block = np.asarray(vectors[start:start + _SCAN_BLOCK_ROWS], dtype=np.float32)
+        for j in range(subspaces):
+            codes[start:start + len(block), j] = _nearest_centroid(
+                np.ascontiguousarray(block[:, j * sub_dims:(j + 1) * sub_dims]), codebook[j]
+            )
+    return codes, codebook
+
+
+class NumpyCollection:
+    """
+    A vector collection held as one float matrix plus parallel ID, document
+    and metadata lists, persisted in a single file.
+
+    Implements the subset of chromadb's Collection API that the indexer and
+    registry use (count, get, peek, upsert, delete, query), with Chroma's
+    squared-L2 distances, so the two backends are interchangeable.
+
+    The file is a fixed header, then 64-byte aligned vector, norm and IVF
+    sections, then the IDs, documents and metadata as JSON. Vectors and
+    norms are np.memmap views of the file, so opening a collection copies
+    nothing and pages are read on first touch. Writes go to RAM and reach
+    the file on persist(), which compacts deletions and rewrites it
+    atomically.
+
+    Up to EXACT_SEARCH_MAX_ROWS vectors are searched exactly by a blocked
+    matrix product. Larger collections are stored grouped by k-means list
+    (an IVF index, sqrt(n) lists) and each query scans only the IVF_NPROBE
+    lists nearest to it; unpersisted writes fall back to an exact scan.
+
+    Filtered queries look the matching rows up in a MetadataIndex (built on
+    first use after each change) and scan only those, exactly. When a filter
+    matches more rows than the IVF probe would scan, only its matches within
+    the probed lists are scanned, unless fewer than k of them are there.
+
+    With `quantization` ("int8" or "pq"), persist() also stores compact
+    codes for every vector and searches scan the codes instead of the
+    vectors, then re-rank the best QUANTIZED_RERANK_FACTOR * k candidates by
+    exact distance. Only the codes need to stay resident; the full-precision
+    rows are paged in for the shortlist alone. Changing a collection's
+    quantization re-encodes it on the next persist() without re-embedding.
+
+    `source` is a (file, byte offset) holding a collection file to map when
+    `path` does not exist yet, e.g. a section of a prebuilt snapshot (see
+    src.core.snapshots). The source is only read; the first persist() with
+    changes writes `path`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: Path,
+        dtype: str = NUMPY_VECTOR_DTYPE,
+        quantization: Optional[str] = None,
+        source: Optional[Tuple[Path, int]] = None
+    ):
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization '{quantization}'. Use one of {QUANTIZATION_MODES}")
+        self.name = name
+        self.path = Path(path)
+        self.dtype = np.dtype(dtype)
+        self.quantization = quantization
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._documents: List[Optional[str]] = []
+        self._metadatas: List[Optional[Dict[str, Any]]] = []
+        self._rows: Dict[str, int] = {}
+        self._vectors = np.zeros((0, 0), dtype=self.dtype)
+        self._norms = np.zeros(0, dtype=np.float32)
+        self._centroids: Optional[np.ndarray] = None
+        self._list_offsets: Optional[np.ndarray] = None
+        self._codes: Optional[np.ndarray] = None
+        self._codebook: Optional[np.ndarray] = None
+        self._pending: List[np.ndarray] = []
+        self._deleted: set = set()
+        self._dirty = False
+        self._mapped = False
+        self._metadata_index: Optional[MetadataIndex] = None
+
+        if self.path.exists():
+            self._open(self.path)
+        elif source is not None:
+            self._open(*source)
+
+    def _open(self, file: Path, base: int = 0):
+        with open(file, "rb") as f:
+            f.seek(base)
+            magic, version, header_length = struct.unpack("<4sII", f.read(12))
+            if magic != _MAGIC or version != _FORMAT_VERSION:
+                raise ValueError(f"{file} is not a version {_FORMAT_VERSION} vector file")
+            header = json.loads(f.read(header_length))
+            f.seek(base + header["meta"][0])
+            meta = json.loads(f.read(header["meta"][1]))
+
+        count, dims = header["count"], header["dimensions"]
+        self.dtype = np.dtype(header["dtype"])
+
+        def section(name: str, dtype, shape: Tuple[int, ...]) -> np.ndarray:
+            if not int(np.prod(shape)):
+                return np.zeros(shape, dtype=dtype)
+            return np.memmap(file, dtype=dtype, mode="r", offset=base + header["sections"][name], shape=shape)
+
+        self._vectors = section("vectors", self.dtype, (count, dims))
+        self._norms = section("norms", np.float32, (count,))
+        nlist = header["nlist"]
+        self._centroids = section("centroids", np.float32, (nlist, dims)) if nlist else None
+        self._list_offsets = section("list_offsets", np.int64, (nlist + 1,)) if nlist else None
+        self._codes = self._codebook = None
+        if header.get("quantization") and count:
+            self._codes = section("codes", header["codes_dtype"], tuple(header["codes_shape"]))
+            self._codebook = section("codebook", np.float32, tuple(header["codebook_shape"]))
+        self._ids = meta["ids"]
+        self._documents = meta["documents"]
+        self._metadatas = meta["metadatas"]
+        self._rows = {chunk_id: row for row, chunk_id in enumerate(self._ids)}
+        self._pending, self._deleted = [], set()
+        self._metadata_index = None
+        self._mapped = True
+        # A file written with different quantization settings is re-encoded on the next persist()
+        self._dirty = header.get("quantization") != self.quantization
+
+    def count(self) -> int:
+        return len(self._rows)
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        documents: Optional[Sequence[str]] = None,
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None
+    ):
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        with self._lock:
+            for i, chunk_id in enumerate(ids):
+                if chunk_id in self._rows:
+                    self._deleted.add(self._rows[chunk_id])
+                self._rows[chunk_id] = len(self._ids)
+                self._ids.append(chunk_id)
+                self._documents.append(documents[i] if documents is not None else None)
+                self._metadatas.append(metadatas[i] if metadatas is not None else None)
+            self._pending.append(vectors)
+            self._dirty = True
+
+    def delete(self, ids: Sequence[str]):
+        with self._lock:
+            for chunk_id in ids:
+                row = self._rows.pop(chunk_id, None)
+                if row is not None:
+                    self._deleted.add(row)
+                    self._dirty = True
+
+    def _compact(self):
+        """Fold pending writes and deletions into one in-memory matrix (drops the IVF lists and codes)."""
+        if not self._pending and not self._deleted:
+            return
+        parts = [np.asarray(self._vectors, dtype=np.float32)] if len(self._vectors) else []
+        parts.extend(self._pending)
+        vectors = np.concatenate(parts) if parts else np.zeros((0, 0), dtype=np.float32)
+        keep = np.array([row for row in range(len(self._ids)) if row not in self._deleted], dtype=np.int64)
+        vectors = vectors[keep] if len(keep) else np.zeros((0, vectors.shape[1] if vectors.ndim == 2 else 0), dtype=np.float32)
+
+        self._ids = [self._ids[row] for row in keep]
+        self._documents = [self._documents[row] for row in keep]
+        self._metadatas = [self._metadatas[row] for row in keep]
+        self._rows = {chunk_id: row for row, chunk_id in enumerate(self._ids)}
+        self._vectors = vectors.astype(self.dtype, copy=False)
+        self._norms = np.einsum("ij,ij->i", vectors, vectors).astype(np.float32)
+        self._centroids = self._list_offsets = None
+        self._codes = self._codebook = None
+        self._pending, self._deleted = [], set()
+        self._metadata_index = None
+
+    def persist(self):
+        """Compact, (re)build the IVF lists and quantized codes, and atomically rewrite the file."""
+        with self._lock:
+            if not self._dirty and self._mapped:
+                return
+            self._compact()
+            count = len(self._ids)
+            dims = self._vectors.shape[1] if count else 0
+
+            order = None
+            centroids = np.zeros((0, dims), dtype=np.float32)
+            list_offsets = np.zeros(0, dtype=np.int64)
+            if count > EXACT_SEARCH_MAX_ROWS:
+                nlist = int(np.sqrt(count))
+                centroids, assign = train_ivf(self._vectors, nlist)
+                order = np.argsort(assign, kind="stable")
+                list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=nlist))]).astype(np.int64)
+
+            vectors, norms = self._vectors, self._norms
+            ids, documents, metadatas = self._ids, self._documents, self._metadatas
+            if order is not None:
+                vectors, norms = vectors[order], norms[order]
+                ids = [ids[row] for row in order]
+                documents = [documents[row] for row in order]
+                metadatas = [metadatas[row] for row in order]
+
+            codes = np.zeros((0, 0), dtype=np.int8)
+            codebook = np.zeros(0, dtype=np.float32)
+            if self.quantization == "int8" and count:
+                codes, codebook = quantize_int8(vectors)
+            elif self.quantization == "pq" and count:
+                codes, codebook = train_pq(vectors)
+
+            self._write(vectors, norms, centroids, list_offsets, codes, codebook, ids, documents, metadatas)
+            self._open(self.path)
+
+    def _write(self, vectors, norms, centroids, list_offsets, codes, codebook, ids, documents, metadatas):
+        meta = json.dumps({"ids": ids, "documents": documents, "metadatas": metadatas}).encode("utf-8")
+        sections = {}
+        offset = _HEADER_BYTES
+        arrays = [
+            ("vectors", np.ascontiguousarray(vectors, dtype=self.dtype)),
+            ("norms", np.ascontiguousarray(norms, dtype=np.float32)),
+            ("centroids", np.ascontiguousarray(centroids, dtype=np.float32)),
+            ("list_offsets", np.ascontiguousarray(list_offsets, dtype=np.int64)),
+            ("codes", np.ascontiguousarray(codes)),
+            ("codebook", np.ascontiguousarray(codebook, dtype=np.float32)),
+        ]
+        for name, array in arrays:
+            sections[name] = offset
+            offset += -(-array.nbytes // _ALIGN) * _ALIGN
+
+        header = json.dumps({
+            "name": self.name,
+            "dtype": self.dtype.name,
+            "count": len(ids),
+            "dimensions": int(vectors.shape[1]) if len(ids) else 0,
+            "nlist": len(centroids),
+            "quantization": self.quantization,
+            "codes_dtype": codes.dtype.name,
+            "codes_shape": list(codes.shape),
+            "codebook_shape": list(codebook.shape),
+            "sections": sections,
+            "meta": [offset, len(meta)]
+        }).encode("utf-8")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(struct.pack("<4sII", _MAGIC, _FORMAT_VERSION, len(header)))
+            f.write(header)
+            for name, array in arrays:
+                f.seek(sections[name])
+                f.write(array.tobytes())
+            f.seek(offset)
+            f.write(meta)
+        os.replace(tmp, self.path)
+
+    def _filter(self, where: Dict[str, Any]) -> np.ndarray:
+        """Sorted rows matching `where`, from the metadata index (call with the lock held, after _compact)."""
+        if self._metadata_index is None:
+            self._metadata_index = MetadataIndex(self._metadatas)
+        return self._metadata_index.rows(where)
+
+    def _select(self, ids: Optional[Sequence[str]], where: Optional[Dict[str, Any]]) -> List[int]:
+        if ids is None:
+            return self._filter(where).tolist() if where else list(range(len(self._ids)))
+        rows = [self._rows[chunk_id] for chunk_id in ids if chunk_id in self._rows]
+        if where:
+            rows = [row for row in rows if matches_where(self._metadatas[row] or {}, where)]
+        return rows
+
+    def _result(self, rows: Sequence[int], include: Sequence[str]) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"ids": [self._ids[row] for row in rows]}
+        if "documents" in include:
+            result["documents"] = [self._documents[row] for row in rows]
+        if "metadatas" in include:
+            result["metadatas"] = [self._metadatas[row] for row in rows]
+        if "embeddings" in include:
+            result["embeddings"] = np.asarray(self._vectors[list(rows)], dtype=np.float32)
+        return result
+
+    def get(
+        self,
+        ids: Optional[Sequence[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        include: Sequence[str] = ("metadatas", "documents")
+    ) -> Dict[str, Any]:
+        with self._lock:
+            self._compact()
+            rows = self._select(ids, where)[:limit]
+            return self._result(rows, include)
+
+    def peek(self, limit: int = 10) -> Dict[str, Any]:
+        with self._lock:
+            self._compact()
+            return self._result(range(min(limit, len(self._ids))), ("documents", "metadatas", "embeddings"))
+
+    def query(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include: Sequence[str] = ("metadatas", "documents", "distances")
+    ) -> Dict[str, Any]:
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        with self._lock:
+            self._compact()
+            # Compaction and _open() replace these objects rather than mutating
+            # them, so the scan below can run outside the lock
+            vectors, norms = self._vectors, self._norms
+            centroids, list_offsets = self._centroids, self._list_offsets
+            codes, codebook = self._codes, self._codebook
+            ids, documents, metadatas = self._ids, self._documents, self._metadatas
+            candidates = self._filter(where) if where else None
+
+        results: Dict[str, List] = {"ids": [], "distances": []}
+        if "documents" in include:
+            results["documents"] = []
+        if "metadatas" in include:
+            results["metadatas"] = []
+
+        for query in queries:
+            rows = candidates
+            # A filter matching more rows than the probe would scan (about nprobe/nlist of
+            # them) is searched within the probed lists, as an unfiltered query would be
+            if centroids is not None and (rows is None or len(rows) * len(centroids) > len(vectors) * IVF_NPROBE):
+                probed = self._probe(query, centroids, list_offsets)
+                if rows is None:
+                    rows = probed
+                else:
+                    narrowed = np.intersect1d(probed, rows, assume_unique=True)
+                    if len(narrowed) >= n_results:
+                        rows = narrowed
+            if codes is not None:
+                approximate = self._code_distances(query, codes, codebook, norms)
+                _, shortlist = self._top_k(approximate, len(codes), rows, n_results * QUANTIZED_RERANK_FACTOR)
+                rows = np.sort(np.array(shortlist, dtype=np.int64))
+            distances, top = self._top_k(self._exact_distances(query, vectors, norms), len(vectors), rows, n_results)
+            results["ids"].append([ids[row] for row in top])
+            results["distances"].append(distances.tolist())
+            if "documents" in results:
+                results["documents"].append([documents[row] for row in top])
+            if "metadatas" in results:
+                results["metadatas"].append([metadatas[row] for row in top])
+        return results
+
+    def scan_bytes(self) -> int:
+        """Bytes a search scans, i.e. what must stay resident for fast queries."""
+        if self._codes is not None:
+            return self._codes.nbytes + self._codebook.nbytes + self._norms.nbytes
+        return self._vectors.nbytes + self._norms.nbytes
+
+    @staticmethod
+    def _probe(query: np.ndarray, centroids: np.ndarray, list_offsets: np.ndarray) -> np.ndarray:
+        nprobe = min(IVF_NPROBE, len(centroids))
+        distances = np.einsum("ij,ij->i", centroids, centroids) - 2 * centroids @ query
+        lists = np.argpartition(distances, nprobe - 1)[:nprobe]
+        return np.concatenate([np.arange(list_offsets[i], list_offsets[i + 1]) for i in np.sort(lists)])
+
+    @staticmethod
+    def _exact_distances(query: np.ndarray, vectors: np.ndarray, norms: np.ndarray) -> Callable:
+        query_norm = float(query @ query)
+        return lambda index: norms[index] + query_norm - 2 * (np.asarray(vectors[index], dtype=np.float32) @ query)
+
+    @staticmethod
+    def _code_distances(query: np.ndarray, codes: np.ndarray, codebook: np.ndarray, norms: np.ndarray) -> Callable:
+        if codes.dtype == np.int8:
+            # Decoded vectors are codes * scale + offset, so q.x = codes.(q * scale) + q.offset
+            scaled, shift = query * codebook[0], float(query @ codebook[1])
+            query_norm = float(query @ query)
+            return lambda index: norms[index] + query_norm - 2 * (codes[index].astype(np.float32) @ scaled + shift)
+
+        # Asymmetric distance: a per-query table of distances from each query
+        # subvector to every centroid, summed over the stored code bytes
+        subspaces, centroids, sub_dims = codebook.shape
+        table = ((query.reshape(subspaces, 1, sub_dims) - codebook) ** 2).sum(axis=2).ravel()
+        table_offsets = np.arange(subspaces) * centroids
+        return lambda index: table[codes[index].astype(np.intp) + table_offsets].sum(axis=1)
+
+    @staticmethod
+    def _top_k(
+        distances_for: Callable,
+        count: int,
+        rows: Optional[np.ndarray],
+        k: int
+    ) -> Tuple[np.ndarray, List[int]]:
+        """Top-k by `distances_for` over `rows` (all `count` rows if None), scanned in blocks."""
+        total = count if rows is None else len(rows)
+        best_distances = np.zeros(0, dtype=np.float32)
+        best_rows = np.zeros(0, dtype=np.int64)
+
+        for start in range(0, total, _SCAN_BLOCK_ROWS):
+            if rows is None:
+                index = slice(start, min(start + _SCAN_BLOCK_ROWS, total))
+                block_rows = np.arange(index.start, index.stop)
+            else:
+                index = block_rows = rows[start:start + _SCAN_BLOCK_ROWS]
+            best_distances = np.concatenate([best_distances, distances_for(index)])
+            best_rows = np.concatenate([best_rows, block_rows])
+            if len(best_distances) > k:
+                keep = np.argpartition(best_distances, k - 1)[:k]
+                best_distances, best_rows = best_distances[keep], best_rows[keep]
+
+        order = np.argsort(best_distances, kind="stable")
+        return np.maximum(best_distances[order], 0), best_rows[order].tolist()
+
+
+class VectorBackend(ABC):
+    """Where a registry's collections live: opens them by name and persists their writes."""
+
+    name: str
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    @property
+    @abstractmethod
+    def manifest_dir(self) -> Path:
+        """Directory for IncrementalIndexer manifests, so each backend's sync state is its own."""
+
+    @abstractmethod
+    def open(self, collection_name: str, quantization: Optional[str] = None):
+        """
+        Open (creating if needed) a collection with the Chroma Collection methods the indexer uses.
+
+        Args:
+            collection_name: Collection name
+            quantization: Stored vector encoding, one of QUANTIZATION_MODES
+        """
+
+    @abstractmethod
+    def drop(self, collection_name: str):
+        """Delete a collection and its vectors, e.g. before re-embedding it at a different width."""
+
+    def persist(self, collection):
+        """Make writes since the last persist durable (no-op for backends that write through)."""
+
+    def mount(self, snapshot) -> bool:
+        """
+        Serve collections this store lacks straight from a VectorSnapshot
+        (see src.core.snapshots). Returns False if the backend cannot map
+        snapshots and needs them imported instead.
+        """
+        return False
+
+    @abstractmethod
+    def index_bytes(self, collection, count: int, dimensions: int) -> int:
+        """Estimated resident memory for searching `collection` (`count` vectors of `dimensions`)."""
+
+    def disk_bytes(self) -> int:
+        return sum(f.stat().st_size for f in self.path.rglob("*") if f.is_file())
+
+
+class ChromaBackend(VectorBackend):
+    """Chroma PersistentClient collections (SQLite plus an HNSW index per collection)."""
+
+    name = "chroma"
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import chromadb
+                    from chromadb.config import Settings
+
+                    self._client = chromadb.PersistentClient(
+                        path=str(self.path),
+                        settings=Settings(anonymized_telemetry=False)
+                    )
+        return self._client
+
+    @property
+    def manifest_dir(self) -> Path:
+        return self.path / "manifests"
+
+    def open(self, collection_name: str, quantization: Optional[str] = None):
+        if quantization:
+            print(f"Warning: The chroma vector backend stores full-precision vectors; "
+                  f"ignoring quantization '{quantization}' for '{collection_name}'")
+        return self.client.get_or_create_collection(collection_name)
+
+    def drop(self, collection_name: str):
+        try:
+            self.client.delete_collection(collection_name)
+        except ValueError:
+            pass  # Never created
+
+    def index_bytes(self, collection, count: int, dimensions: int) -> int:
+        return count * (dimensions * 4 + _HNSW_LINK_BYTES)
+
+
+class NumpyBackend(VectorBackend):
+    """In-process NumpyCollections, one memory-mapped file each under <path>/numpy/."""
+
+    name = "numpy"
+
+    def __init__(self, path: Path, dtype: str = NUMPY_VECTOR_DTYPE):
+        super().__init__(path)
+        self.dtype = dtype
+        self.snapshot = None
+
+    @property
+    def manifest_dir(self) -> Path:
+        return self.path / "numpy" / "manifests"
+
+    def open(self, collection_name: str, quantization: Optional[str] = None) -> NumpyCollection:
+        path = self._file(collection_name)
+        if self.snapshot is not None and not path.exists() and collection_name in self.snapshot.collections:
+            # The snapshot's manifest lets the first sync confirm the mapped vectors are current
+            self.snapshot.install_manifest(collection_name, self.manifest_dir)
+            return self.snapshot.open(collection_name, path, quantization)
+        return NumpyCollection(collection_name, path, self.dtype, quantization)
+
+    def mount(self, snapshot) -> bool:
+        self.snapshot = snapshot
+        return True
+
+    def drop(self, collection_name: str):
+        self._file(collection_name).unlink(missing_ok=True)
+
+    def _file(self, collection_name: str) -> Path:
+        return self.path / "numpy" / f"{collection_name}.vec"
+
+    def persist(self, collection: NumpyCollection):
+        collection.persist()
+
+    def index_bytes(self, collection: NumpyCollection, count: int, dimensions: int) -> int:
+        return collection.scan_bytes()
+
+    def disk_bytes(self) -> int:
+        root = self.path / "numpy"
+        return sum(f.stat().st_size for f in root.rglob("*") if f.is_file()) if root.exists() else 0
+
+
+VECTOR_BACKENDS = {backend.name: backend for backend in [ChromaBackend, NumpyBackend]}
+
+
+def create_vector_backend(name: str, path: Path) -> VectorBackend:
+    """
+    Raises:
+        ValueError: If no backend with that name exists
+    """
+    if name not in VECTOR_BACKENDS:
+        raise ValueError(f"Unknown vector backend '{name}'. Use one of {sorted(VECTOR_BACKENDS)}")
+    return VECTOR_BACKENDS[name](path)
@@ -0,0 +1,531 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+
+from src.core.document_sources import COLLECTION_SPECS, CollectionSpec
+from src.core.embedding_cache import CachedQueryEmbeddings, QueryEmbeddingCache, get_query_embedding_cache
+from src.core.indexer import IncrementalIndexer, SyncReport
+from src.core.lexical_index import LEXICAL_DOMINANCE, BM25Index, reciprocal_rank_fusion
+from src.core.result_cache import SearchResultCache, get_search_result_cache
+from src.core.snapshots import VECTOR_SNAPSHOT, SnapshotError, VectorSnapshot
+from src.core.vector_backends import VECTOR_BACKEND, VectorBackend, create_vector_backend
+
+VECTOR_STORE_DIR = os.getenv("CHROMA_PERSIST_DIR", "./chroma_db")
+
+SEARCH_MODES = ("auto", "hybrid", "vector", "lexical")
+
+_federated_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("FEDERATED_SEARCH_WORKERS", "8")),
+    thread_name_prefix="federated-search"
+)
+
+
+class VectorStoreError(Exception):
+    """Raised when a persisted collection exists but cannot be opened or queried."""
+
+
+@dataclass
+class CollectionStats:
+    name: str
+    backend: str
+    count: int
+    dimensions: int
+    load_ms: float
+    memory_bytes: int
+    last_sync: Dict[str, Any]
+
+
+def distance_to_similarity(distance: float) -> float:
+    """Cosine similarity from the squared L2 distance between unit vectors (what both backends return)."""
+    return 1.0 - distance / 2
+
+
+def shorten_embeddings(vectors: np.ndarray, dimensions: int) -> np.ndarray:
+    """
+    The first `dimensions` components of each row, re-normalized to unit
+    length: what text-embedding-3-* does server-side for its `dimensions`
+    argument.
+
+    Raises:
+        ValueError: If the vectors are narrower than `dimensions`
+    """
+    if vectors.shape[1] < dimensions:
+        raise ValueError(f"Cannot shorten {vectors.shape[1]}-d embeddings to {dimensions}")
+    vectors = vectors[:, :dimensions]
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+class TruncatedEmbeddings(Embeddings):
+    """Shortened embeddings (see shorten_embeddings) from a model without a `dimensions` parameter."""
+
+    def __init__(self, base: Embeddings, dimensions: int):
+        self.base = base
+        self.dimensions = dimensions
+        self.model = getattr(base, "model", type(base).__name__)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return shorten_embeddings(np.asarray(self.base.embed_documents(texts), dtype=np.float32), self.dimensions).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def with_dimensions(embeddings: Embeddings, dimensions: Optional[int]) -> Embeddings:
+    """
+    `embeddings` producing `dimensions`-wide vectors. OpenAI clients ask the
+    API for short vectors (less to transfer); other models are truncated locally.
+    """
+    if dimensions is None or getattr(embeddings, "dimensions", None) == dimensions:
+        return embeddings
+    if dimensions <= 0:
+        raise ValueError(f"Embedding dimensions must be positive, got {dimensions}")
+    if isinstance(embeddings, OpenAIEmbeddings):
+        return embeddings.model_copy(update={"dimensions": dimensions})
+    return TruncatedEmbeddings(embeddings, dimensions)
+
+
+class VectorStoreRegistry:
+    """
+    Named vector collections on one storage backend and one embedding client.
+
+    The backend (VECTOR_BACKEND: "chroma", or "numpy" for the in-process
+    memory-mapped store, see src.core.vector_backends) only stores vectors
+    and answers nearest-neighbour queries; syncing, caching and lexical
+    search live here and work the same over either.
+
+    Each collection is opened on first use and incrementally synced with
+    its CollectionSpec sources (see IncrementalIndexer), so edited, added
+    and removed source files are picked up at startup or on reindex(). A
+    collection that exists but cannot be read raises VectorStoreError
+    instead of being silently rebuilt or ignored.
+
+    A collection whose spec sets `embedding_dimensions` is indexed and
+    queried through the same shortened embedding client (see
+    with_dimensions()); when the width (or model) recorded in its manifest
+    changes, the stored collection is dropped and re-embedded.
+
+    Query embeddings go through a shared QueryEmbeddingCache, so repeated
+    searches (up to casing, whitespace and punctuation) skip the embedding
+    request; hit rates are tracked per collection.
+
+    Each collection has an index version, bumped whenever a sync changes
+    its chunks. Search tools cache their results per version (see
+    src.core.result_cache), so a re-index retires stale results at once.
+
+    A BM25 index over the same chunks is built on first use of
+    lexical()/hybrid_search() and re-synced with the collection on reindex().
+
+    With a prebuilt snapshot (VECTOR_SNAPSHOT, see src.core.snapshots) the
+    numpy backend maps collections it does not have yet straight from the
+    snapshot file. Each is checked against the configured embedding model
+    and dimensions first, and a mismatch raises VectorStoreError rather than
+    serving vectors that queries cannot be compared with.
+    """
+
+    def __init__(
+        self,
+        path: str = VECTOR_STORE_DIR,
+        specs: Dict[str, CollectionSpec] = COLLECTION_SPECS,
+        embeddings: Optional[Embeddings] = None,
+        query_cache: Optional[QueryEmbeddingCache] = None,
+        result_cache: Optional[SearchResultCache] = None,
+        backend: Optional[str] = None,
+        snapshot: Optional[str] = VECTOR_SNAPSHOT
+    ):
+        self.path = Path(path)
+        self.specs = dict(specs)
+        self._embeddings = embeddings
+        self.query_cache = query_cache or get_query_embedding_cache()
+        self.result_cache = result_cache or get_search_result_cache()
+        self.backend: VectorBackend = create_vector_backend(backend or VECTOR_BACKEND, self.path)
+        self.snapshot: Optional[VectorSnapshot] = None
+        if snapshot:
+            self.snapshot = VectorSnapshot(snapshot)
+            if not self.backend.mount(self.snapshot):
+                print(f"Warning: The {self.backend.name} vector backend cannot map snapshots; ignoring {snapshot}. "
+                      f"Load it with: python -m src.core.snapshots import {snapshot}")
+                self.snapshot = None
+        self._collection_embeddings: Dict[Optional[int], Embeddings] = {}
+        self._query_embeddings: Dict[str, CachedQueryEmbeddings] = {}
+        self._collections: Dict[str, Any] = {}
+        self._stats: Dict[str, CollectionStats] = {}
+        self._versions: Dict[str, int] = {}
+        self._lexical: Dict[str, BM25Index] = {}
+        self._lock = threading.Lock()
+        self._locks: Dict[str, threading.Lock] = {}
+
+    @property
+    def embeddings(self) -> Embeddings:
+        if self._embeddings is None:
+            with self._lock:
+                if self._embeddings is None:
+                    self._embeddings = OpenAIEmbeddings(
+                        model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
+                        api_key=os.getenv("OPENAI_API_KEY")
+                    )
+        return self._embeddings
+
+    @property
+    def embedding_model(self) -> str:
+        """Name of the embedding model, as recorded in manifests and snapshots."""
+        return getattr(self.embeddings, "model", type(self.embeddings).__name__)
+
+    def collection_embeddings(self, name: str) -> Embeddings:
+        """The embedding client for one collection, shortened to its spec's `embedding_dimensions`."""
+        dimensions = self.specs[name].embedding_dimensions
+        if dimensions not in self._collection_embeddings:
+            embeddings = with_dimensions(self.embeddings, dimensions)
+            with self._lock:
+                self._collection_embeddings.setdefault(dimensions, embeddings)
+        return self._collection_embeddings[dimensions]
+
+    def query_embeddings(self, name: str) -> CachedQueryEmbeddings:
+        """The cached query-embedding view of one collection's embedding client."""
+        if name not in self._query_embeddings:
+            embeddings = self.collection_embeddings(name)
+            with self._lock:
+                self._query_embeddings.setdefault(name, CachedQueryEmbeddings(embeddings, self.query_cache, name))
+        return self._query_embeddings[name]
+
+    def index_version(self, name: str) -> int:
+        """Counter bumped each time a re-index changes the collection's chunks (0 until then)."""
+        return self._versions.get(name, 0)
+
+    def get(self, name: str):
+        """
+        Get a synced collection (Chroma Collection API: query, get, count, ...).
+
+        Raises:
+            KeyError: If no collection with that name is registered
+            VectorStoreError: If the persisted collection is unreadable
+            ValueError: If the collection is empty and has no source documents
+        """
+        collection = self._collections.get(name)
+        if collection is not None:
+            return collection
+
+        if name not in self.specs:
+            raise KeyError(f"Unknown vector collection '{name}'. Registered: {sorted(self.specs)}")
+
+        with self._lock:
+            lock = self._locks.setdefault(name, threading.Lock())
+
+        with lock:
+            if name not in self._collections:
+                self._collections[name] = self._load(self.specs[name])
+            return self._collections[name]
+
+    def _load(self, spec: CollectionSpec):
+        start = time.perf_counter()
+
+        if self.snapshot is not None and spec.name in self.snapshot.collections:
+            try:
+                self.snapshot.check_compatible(spec, self.embedding_model)
+            except SnapshotError as e:
+                raise VectorStoreError(str(e)) from e
+
+        try:
+            collection = self.backend.open(spec.name, spec.quantization)
+            collection.count()
+        except Exception as e:
+            raise VectorStoreError(f"Could not open vector collection '{spec.name}' in {self.path}: {e}") from e
+
+        collection, report = self._sync(spec, collection)
+        self._record_stats(spec, collection, report, start)
+        return collection
+
+    def _sync(self, spec: CollectionSpec, collection) -> Tuple[Any, SyncReport]:
+        """Sync a collection with its sources; returns the (possibly recreated) collection and the report."""
+        embeddings = self.collection_embeddings(spec.name)
+        indexer = IncrementalIndexer(spec, self.backend.manifest_dir, self.embedding_model, spec.embedding_dimensions)
+        if indexer.vectors_incompatible() and collection.count():
+            # Neither backend accepts vectors of a new width next to the old ones
+            self.backend.drop(spec.name)
+            collection = self.backend.open(spec.name, spec.quantization)
+        report = indexer.sync(collection, embeddings)
+        self.backend.persist(collection)
+        return collection, report
+
+    def _record_stats(self, spec: CollectionSpec, collection, report: SyncReport, start: float):
+        try:
+            count = collection.count()
+            dimensions = 0
+            if count:
+                # Querying with a stored vector forces the index to load, so a
+                # damaged index fails here rather than on a user's search.
+                embedding = list(collection.peek(1)["embeddings"][0])
+                collection.query(query_embeddings=[embedding], n_results=1)
+                dimensions = len(embedding)
+        except Exception as e:
+            raise VectorStoreError(
+                f"Vector collection '{spec.name}' in {self.path} is unreadable: {e}. "
+                f"Delete the collection (or the directory) to rebuild it from {spec.source_dir}/."
+            ) from e
+
+        self._stats[spec.name] = CollectionStats(
+            name=spec.name,
+            backend=self.backend.name,
+            count=count,
+            dimensions=dimensions,
+            load_ms=round((time.perf_counter() - start) * 1000, 1),
+            memory_bytes=self.backend.index_bytes(collection, count, dimensions),
+            last_sync=asdict(report)
+        )
+
+    def search_batch(
+        self,
+        name: str,
+        queries: Sequence[str],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Run several similarity searches with at most one embedding request and one index query.
+
+        Args:
+            name: Collection name
+            queries: Query strings
+            k: Results per query
+            filter: Optional Chroma metadata filter applied to every query
+
+        Returns:
+            One list of (Document, distance) pairs per query, closest first.
+            Each Document carries its chunk ID in `Document.id`.
+        """
+        if not queries:
+            return []
+
+        collection = self.get(name)
+        vectors = self.query_embeddings(name).embed_queries(list(queries))
+        results = collection.query(
+            query_embeddings=vectors,
+            n_results=k,
+            where=filter,
+            include=["documents", "metadatas", "distances"]
+        )
+
+        return [
+            [
+                (Document(id=chunk_id, page_content=text, metadata=metadata or {}), distance)
+                for chunk_id, text, metadata, distance in zip(ids, texts, metadatas, distances)
+            ]
+            for ids, texts, metadatas, distances in zip(
+                results["ids"], results["documents"], results["metadatas"], results["distances"]
+            )
+        ]
+
+    def search(
+        self,
+        name: str,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Document, float]]:
+        """Similarity search for one query: (Document, distance) pairs, closest first."""
+        return self.search_batch(name, [query], k=k, filter=filter)[0]
+
+    def federated_search(
+        self,
+        query: str,
+        names: Optional[Sequence[str]] = None,
+        k: int = 5,
+        filters: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> List[Tuple[Document, float]]:
+        """
+        Search several collections concurrently and merge the hits into one ranking.
+
+        The query is embedded once, at the widest width among the
+        collections, and shortened for narrower ones (truncated and
+        re-normalized, which is what text-embedding-3's `dimensions`
+        parameter does). The collections are then queried in parallel, so
+        the call takes as long as the slowest one rather than the sum.
+
+        Both backends return squared L2 distances between unit vectors,
+        which are converted to cosine similarity (1 - distance / 2), a score
+        with the same meaning in every collection, and merged by it.
+
+        Args:
+            query: Query string
+            names: Collections to search (default: all registered)
+            k: Results in the merged ranking
+            filters: Optional Chroma metadata filter per collection name
+
+        Returns:
+            [(Document, similarity)], most similar first. Each Document
+            carries its chunk ID in `Document.id` and its collection's name in
+            `metadata["collection"]`.
+
+        Raises:
+            KeyError: If a collection is not registered
+        """
+        names = list(dict.fromkeys(names or self.specs))
+        unknown = [name for name in names if name not in self.specs]
+        if unknown:
+            raise KeyError(f"Unknown vector collection(s) {unknown}. Registered: {sorted(self.specs)}")
+        if not names:
+            return []
+
+        widths = {name: self.specs[name].embedding_dimensions for name in names}
+        widest = next((name for name in names if widths[name] is None), None) or max(names, key=lambda n: widths[n])
+        vector = np.asarray(self.query_embeddings(widest).embed_query(query), dtype=np.float32)
+
+        def search_one(name: str) -> List[Tuple[Document, float]]:
+            width = widths[name]
+            query_vector = vector if width is None or width >= len(vector) else shorten_embeddings(vector[None], width)[0]
+            results = self.get(name).query(
+                query_embeddings=[query_vector.tolist()],
+                n_results=k,
+                where=(filters or {}).get(name),
+                include=["documents", "metadatas", "distances"]
+            )
+            return [
+                (Document(id=chunk_id, page_content=text, metadata={**(metadata or {}), "collection": name}),
+                 distance_to_similarity(distance))
+                for chunk_id, text, metadata, distance in zip(
+                    results["ids"][0], results["documents"][0], results["metadatas"][0], results["distances"][0]
+                )
+            ]
+
+        futures = [_federated_executor.submit(search_one, name) for name in names]
+        merged = [hit for future in futures for hit in future.result()]
+        merged.sort(key=lambda hit: -hit[1])
+        return merged[:k]
+
+    def lexical(self, name: str) -> BM25Index:
+        """The BM25 index over a collection's chunks, built from the collection on first use."""
+        index = self._lexical.get(name)
+        if index is not None:
+            return index
+
+        collection = self.get(name)
+        with self._locks[name]:
+            if name not in self._lexical:
+                index = BM25Index()
+                index.sync(collection)
+                self._lexical[name] = index
+            return self._lexical[name]
+
+    def hybrid_search(
+        self,
+        name: str,
+        query: str,
+        k: int = 4,
+        mode: str = "auto",
+        filter: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, List[Tuple[Document, float]]]:
+        """
+        Search a collection lexically (BM25), densely, or both fused by reciprocal rank.
+
+        In "auto" mode, queries dominated by rare terms (IDs, port numbers,
+        priorities, product names) are answered by BM25 alone, locally and
+        without an embedding request; everything else goes to "hybrid".
+
+        Args:
+            name: Collection name
+            query: Query string
+            k: Number of results
+            mode: "auto", "hybrid", "vector" or "lexical"
+            filter: Optional Chroma metadata filter applied to both retrievers
+
+        Returns:
+            (mode used, [(Document, score)]), best first. Higher is better in
+            every mode, but the scale depends on it: cosine similarity in
+            "vector" mode, BM25 scores in "lexical" and RRF scores in "hybrid".
+
+        Raises:
+            ValueError: If mode is not one of SEARCH_MODES
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode '{mode}'. Use one of {SEARCH_MODES}")
+
+        if mode == "vector":
+            return mode, [
+                (doc, distance_to_similarity(distance)) for doc, distance in self.search(name, query, k=k, filter=filter)
+            ]
+
+        index = self.lexical(name)
+        if mode == "auto":
+            mode = "hybrid"
+            if index.rare_share(query) >= LEXICAL_DOMINANCE:
+                lexical = index.search(query, k, where=filter)
+                if lexical:
+                    return "lexical", lexical
+
+        if mode == "lexical":
+            return mode, index.search(query, k, where=filter)
+
+        # Each ranking gets a deeper candidate list than k so fusion can promote
+        # chunks that only one retriever ranked highly
+        depth = max(k * 4, 20)
+        return mode, reciprocal_rank_fusion(
+            [index.search(query, depth, where=filter), self.search(name, query, k=depth, filter=filter)],
+            k=k
+        )
+
+    def reindex(self, names: Optional[List[str]] = None) -> Dict[str, SyncReport]:
+        """Sync the given collections, or all registered ones, with their source files now."""
+        reports = {}
+        for name in names or list(self.specs):
+            collection = self.get(name)
+            start = time.perf_counter()
+            with self._locks[name]:
+                collection, reports[name] = self._sync(self.specs[name], collection)
+                self._collections[name] = collection
+                if name in self._lexical:
+                    self._lexical[name].sync(collection)
+                self._record_stats(self.specs[name], collection, reports[name], start)
+                if reports[name].changed:
+                    self._versions[name] = self.index_version(name) + 1
+                    self.result_cache.invalidate(name)
+        return reports
+
+    def warm_up(self, names: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Open (building if needed) the given collections, or all registered ones, and return their stats."""
+        for name in names or list(self.specs):
+            self.get(name)
+        return self.stats()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-collection count, dimensions, load time and estimated index memory for loaded collections."""
+        return {name: asdict(stats) for name, stats in self._stats.items()}
+
+    def query_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-collection query-embedding cache lookups, hits (memory/disk), misses and hit rate."""
+        return self.query_cache.stats()
+
+    def result_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-tool search result cache lookups, hits, misses (of which expired) and hit rate."""
+        return self.result_cache.stats()
+
+    def disk_bytes(self) -> int:
+        return self.backend.disk_bytes()
+
+
+_registry: Optional[VectorStoreRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_vector_store_registry() -> VectorStoreRegistry:
+    global _registry
+
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = VectorStoreRegistry()
+
+    return _registry
+
+
+def get_vector_store(name: str):
+    return get_vector_store_registry().get(name)
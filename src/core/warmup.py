@@ -0,0 +1,168 @@
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Optional
+
+WARMUP_ON_START = os.getenv("WARMUP_ON_START", "true").lower() == "true"
+
+
+@dataclass
+class WarmupStep:
+    """Progress of one warm-up step."""
+    name: str
+    state: str = "pending"  # pending, running, ready or failed
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+
+
+class Warmup:
+    """
+    Loads the process's shared, expensive-to-build state in background threads.
+
+    Each step runs in its own daemon thread and goes through the same
+    accessor a request would use (VectorStoreRegistry.get, EmployeeDirectory,
+    get_compiled_agent), all of which load under a per-resource lock. A
+    request that arrives mid-warm-up therefore waits for the load already in
+    progress rather than starting a second one, and anything warm-up has
+    not reached yet is loaded on demand as before.
+
+    A failed step is recorded, not raised: the request that needs the
+    resource retries the load and surfaces the error itself.
+    """
+
+    def __init__(self, steps: Callable[[], Dict[str, Callable[[], Any]]]):
+        self._steps_factory = steps
+        self._status: Dict[str, WarmupStep] = {}
+        self._done = threading.Event()
+        self._remaining = 0
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self) -> "Warmup":
+        """
+        Start warm-up in the background and return immediately. Later calls
+        are no-ops, so this is safe on every app rerun.
+        """
+        with self._lock:
+            if self._started:
+                return self
+            self._started = True
+
+        # Building the step list imports the graph and vector store modules,
+        # which is itself slow, so it happens off the caller's thread too
+        threading.Thread(target=self._launch, name="warmup", daemon=True).start()
+        return self
+
+    def _launch(self):
+        try:
+            steps = self._steps_factory()
+        except Exception as e:
+            print(f"Warning: Warm-up could not start: {type(e).__name__}: {e}")
+            self._done.set()
+            return
+
+        with self._lock:
+            self._status = {name: WarmupStep(name) for name in steps}
+            self._remaining = len(steps)
+        if not steps:
+            self._done.set()
+        for name, step in steps.items():
+            threading.Thread(target=self._run, args=(name, step), name=f"warmup-{name}", daemon=True).start()
+
+    def _run(self, name: str, step: Callable[[], Any]):
+        status = self._status[name]
+        status.state = "running"
+        start = time.perf_counter()
+        try:
+            step()
+            status.state = "ready"
+        except Exception as e:
+            status.state = "failed"
+            status.error = f"{type(e).__name__}: {e}"
+            print(f"Warning: Warm-up step '{name}' failed: {status.error}")
+        finally:
+            status.elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+            with self._lock:
+                self._remaining -= 1
+                if self._remaining == 0:
+                    self._done.set()
+
+    @property
+    def ready(self) -> bool:
+        """True once every step has finished (including failed ones)."""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until warm-up finishes or `timeout` seconds pass; returns `ready`."""
+        return self._done.wait(timeout)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-step state, elapsed time and error (empty until the steps are known)."""
+        with self._lock:
+            steps = list(self._status.values())
+        return {step.name: asdict(step) for step in steps}
+
+
+def default_steps() -> Dict[str, Callable[[], Any]]:
+    """
+    One step per vector collection (vectors and BM25 index), one for the
+    employee directory and its derived indexes, and one per agent graph.
+    """
+    from src.core.employee_directory import get_employee_directory
+    from src.core.vector_store import get_vector_store_registry
+    from src.graphs.agent_cache import get_compiled_agent
+    from src.graphs.aks_graph import create_aks_agent
+    from src.graphs.askme_graph import create_askme_agent
+    from src.graphs.colleague_graph import create_colleague_agent
+    from src.graphs.image_analysis_graph import create_image_analysis_agent
+    from src.graphs.policy_graph import create_policy_agent
+    from src.graphs.video_graph import create_video_agent
+
+    registry = get_vector_store_registry()
+    directory = get_employee_directory()
+
+    def warm_directory():
+        directory.index()
+        directory.org_chart()
+        directory.aggregates()
+
+    steps: Dict[str, Callable[[], Any]] = {
+        f"collection:{name}": (lambda name=name: registry.lexical(name))
+        for name in registry.specs
+    }
+    steps["employee_directory"] = warm_directory
+    for factory in [create_askme_agent, create_image_analysis_agent, create_colleague_agent,
+                    create_aks_agent, create_video_agent, create_policy_agent]:
+        name = factory.__name__.replace("create_", "").replace("_agent", "")
+        steps[f"agent:{name}"] = (lambda factory=factory: get_compiled_agent(factory))
+    return steps
+
+
+_warmup: Optional[Warmup] = None
+_warmup_lock = threading.Lock()
+
+
+def get_warmup() -> Warmup:
+    global _warmup
+
+    if _warmup is None:
+        with _warmup_lock:
+            if _warmup is None:
+                _warmup = Warmup(default_steps)
+
+    return _warmup
+
+
+def start_warmup() -> Warmup:
+    """Start the process-wide warm-up (once) and return it."""
+    return get_warmup().start()
+
+
+if __name__ == "__main__":
+    # Pre-start hook for workers and containers: load everything, then report
+    warmup = start_warmup()
+    warmup.wait()
+    print(json.dumps(warmup.status(), indent=1))
+    raise SystemExit(int(any(step["state"] == "failed" for step in warmup.status().values())))
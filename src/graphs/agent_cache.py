@@ -0,0 +1,28 @@
+import threading
+from typing import Any, Callable, Dict
+
+_agents: Dict[Callable[[], Any], Any] = {}
+_locks: Dict[Callable[[], Any], threading.Lock] = {}
+_lock = threading.Lock()
+
+
+def get_compiled_agent(factory: Callable[[], Any]) -> Any:
+    """
+    Get the compiled graph built by `factory` (e.g. create_aks_agent), compiling it once per process.
+
+    Compiled graphs hold no per-run state, so one instance serves every
+    request. Callers that arrive while the graph is being compiled (by a
+    request or by the start-up warm-up, see src.core.warmup) wait for that
+    compile instead of starting another.
+    """
+    agent = _agents.get(factory)
+    if agent is not None:
+        return agent
+
+    with _lock:
+        lock = _locks.setdefault(factory, threading.Lock())
+
+    with lock:
+        if factory not in _agents:
+            _agents[factory] = factory()
+        return _agents[factory]
@@ -7,11 +7,15 @@ from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
 import operator
 
+from src.core.guardrails import blocked_response
+from src.core.speculative import invoke_with_guardrails, await_input_verdict
+from src.graphs.agent_cache import get_compiled_agent
 from src.tools.aks_tools import (
     search_internal_aks_kb,
     search_web_for_aks_info,
     suggest_it_forms
 )
+from src.tools.search_tools import search_knowledge_sources
 
 
 class SourceReference(BaseModel):
@@ -67,7 +71,8 @@ def create_aks_agent():
     tools = [
         search_internal_aks_kb,
         search_web_for_aks_info,
-        suggest_it_forms
+        suggest_it_forms,
+        search_knowledge_sources
     ]
     
     llm_with_tools = llm_tools.bind_tools(tools)
@@ -77,6 +82,7 @@ def create_aks_agent():
 Your task: Search BOTH internal CVS docs AND Azure web documentation.
 
 1. Call search_internal_aks_kb to get CVS-specific information
+   (or search_knowledge_sources with collections ["aks_kb", "video_transcripts"] to include internal training videos in the same call)
 2. Call search_web_for_aks_info to get Azure best practices
 3. Call suggest_it_forms to find relevant forms
 
@@ -113,6 +119,7 @@ REMEMBER: Keep internal and web information completely separate in their respect
             messages = [SystemMessage(content=search_prompt)] + messages
         
         response = llm_with_tools.invoke(messages)
+        await_input_verdict()
         return {"messages": [response]}
     
     def should_continue_search(state: AKSAgentState):
@@ -217,13 +224,14 @@ def run_aks_query(query: str) -> dict:
     """
     Run AKS query with enforced dual-source format.
     """
-    agent = create_aks_agent()
-    
-    result = agent.invoke({
+    result, reason = invoke_with_guardrails(lambda: get_compiled_agent(create_aks_agent), {
         "messages": [HumanMessage(content=query)],
         "query": query,
         "structured_answer": None
-    })
+    }, query)
+    
+    if result is None:
+        return blocked_response(reason)
     
     messages = result["messages"]
     structured_answer = result.get("structured_answer")
@@ -6,6 +6,9 @@ from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
 import operator
 
+from src.core.guardrails import blocked_response
+from src.core.speculative import invoke_with_guardrails, await_input_verdict
+from src.graphs.agent_cache import get_compiled_agent
 from src.tools.askme_tools import explain_with_architecture_diagram, get_performance_metrics
 
 
@@ -77,6 +80,7 @@ IMPORTANT: When explaining workflows, ALWAYS use the diagram tool so users can s
             messages = [SystemMessage(content=system_prompt)] + messages
         
         response = llm_with_tools.invoke(messages)
+        await_input_verdict()
         return {"messages": [response]}
     
     def should_continue(state: AskMeAgentState):
@@ -119,12 +123,13 @@ def run_askme_query(query: str) -> dict:
     Returns:
         Answer with optional diagrams and metrics
     """
-    agent = create_askme_agent()
-    
-    result = agent.invoke({
+    result, reason = invoke_with_guardrails(lambda: get_compiled_agent(create_askme_agent), {
         "messages": [HumanMessage(content=query)],
         "query": query
-    })
+    }, query)
+    
+    if result is None:
+        return blocked_response(reason)
     
     messages = result["messages"]
     
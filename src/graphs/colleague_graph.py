@@ -7,12 +7,18 @@ from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
 import operator
 
+from src.core.guardrails import blocked_response
+from src.core.speculative import invoke_with_guardrails, await_input_verdict
+from src.graphs.agent_cache import get_compiled_agent
 from src.tools.search_tools import search_team_documents, search_for_people
 from src.tools.data_tools import (
     query_employee_database,
     get_employee_by_name,
     get_team_members,
-    get_location_summary
+    get_location_summary,
+    get_org_members,
+    get_reporting_chain,
+    get_common_manager
 )
 
 
@@ -47,7 +53,10 @@ def create_colleague_agent():
         query_employee_database,
         get_employee_by_name,
         get_team_members,
-        get_location_summary
+        get_location_summary,
+        get_org_members,
+        get_reporting_chain,
+        get_common_manager
     ]
     
     llm_with_tools = llm.bind_tools(tools)
@@ -69,6 +78,9 @@ Your goal is to help users find information about team members, their roles, and
 
 **Important:**
 - Always verify names from documents with the HR database
+- get_employee_by_name tolerates typos and "Last, First" order; check "fuzzy_match" results before retrying other tools
+- For reporting-line questions ("who is in X's org", "who does Y report to", "how are A and B connected") use get_org_members, get_reporting_chain or get_common_manager; each answers in a single call
+- Employee lists come back one page at a time as {column: [values]}; "count" is the total. Only pass "next_cursor" back if you need more rows than you were given
 - If location/contact info is requested, you MUST query the employee database
 - Be concise but complete"""
 
@@ -80,6 +92,7 @@ Your goal is to help users find information about team members, their roles, and
             messages = [SystemMessage(content=system_prompt)] + messages
         
         response = llm_with_tools.invoke(messages)
+        await_input_verdict()
         return {"messages": [response]}
     
     def should_continue(state: ColleagueAgentState):
@@ -127,13 +140,14 @@ def run_colleague_lookup(query: str) -> dict:
             "tokens_used": int
         }
     """
-    agent = create_colleague_agent()
-    
-    result = agent.invoke({
+    result, reason = invoke_with_guardrails(lambda: get_compiled_agent(create_colleague_agent), {
         "messages": [HumanMessage(content=query)],
         "query": query,
         "search_complete": False
-    })
+    }, query)
+    
+    if result is None:
+        return blocked_response(reason)
     
     messages = result["messages"]
     tool_calls = []
@@ -7,6 +7,9 @@ from langgraph.prebuilt import ToolNode
 import operator
 import os
 
+from src.core.guardrails import blocked_response
+from src.core.speculative import invoke_with_guardrails, await_input_verdict
+from src.graphs.agent_cache import get_compiled_agent
 from src.tools.vision_tools import (
     analyze_architecture_diagram,
     compare_architecture_patterns,
@@ -40,6 +43,7 @@ def create_image_analysis_agent():
     def agent_node(state: AgentState):
         messages = state["messages"]
         response = llm_with_tools.invoke(messages)
+        await_input_verdict()
         return {"messages": [response]}
     
     def should_continue(state: AgentState):
@@ -92,8 +96,6 @@ def run_image_analysis(
             "tokens_used": int
         }
     """
-    agent = create_image_analysis_agent()
-    
     initial_message = f"""I have an architecture diagram at: {image_path}
 
 User Question: {question}
@@ -107,12 +109,15 @@ Please analyze this diagram and answer the question. Use the available tools:
 
 Start by using the appropriate tool(s) to analyze the diagram."""
 
-    result = agent.invoke({
+    result, reason = invoke_with_guardrails(lambda: get_compiled_agent(create_image_analysis_agent), {
         "messages": [HumanMessage(content=initial_message)],
         "image_path": image_path,
         "focus_areas": focus_areas,
         "analysis_complete": False
-    })
+    }, question)
+    
+    if result is None:
+        return blocked_response(reason)
     
     messages = result["messages"]
     tool_calls = []
@@ -6,6 +6,9 @@ from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
 import operator
 
+from src.core.guardrails import blocked_response
+from src.core.speculative import invoke_with_guardrails, await_input_verdict
+from src.graphs.agent_cache import get_compiled_agent
 from src.tools.policy_tools import (
     compare_policy_versions,
     detect_semantic_drift,
@@ -91,6 +94,7 @@ def create_policy_agent():
             messages = [SystemMessage(content=system_prompt)] + messages
         
         response = llm_with_tools.invoke(messages)
+        await_input_verdict()
         return {"messages": [response]}
     
     def should_continue(state: PolicyAgentState):
@@ -138,15 +142,16 @@ def run_policy_detection(old_version: str, new_version: str) -> dict:
             "tokens_used": Total tokens
         }
     """
-    agent = create_policy_agent()
-    
     query = f"Analyze the policy changes between {old_version} and {new_version}. Identify what changed, who needs to be notified, and provide recommendations."
     
-    result = agent.invoke({
+    result, reason = invoke_with_guardrails(lambda: get_compiled_agent(create_policy_agent), {
         "messages": [HumanMessage(content=query)],
         "old_version": old_version,
         "new_version": new_version
-    })
+    }, query)
+    
+    if result is None:
+        return blocked_response(reason)
     
     messages = result["messages"]
     
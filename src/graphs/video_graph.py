@@ -6,11 +6,15 @@ from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
 import operator
 
+from src.core.guardrails import blocked_response
+from src.core.speculative import invoke_with_guardrails, await_input_verdict
+from src.graphs.agent_cache import get_compiled_agent
 from src.tools.video_tools import (
     search_video_transcripts,
     get_video_summary,
     search_by_speaker
 )
+from src.tools.search_tools import search_knowledge_sources
 
 
 class VideoAgentState(TypedDict):
@@ -29,7 +33,8 @@ def create_video_agent():
     tools = [
         search_video_transcripts,
         get_video_summary,
-        search_by_speaker
+        search_by_speaker,
+        search_knowledge_sources
     ]
     
     llm_with_tools = llm.bind_tools(tools)
@@ -40,7 +45,8 @@ def create_video_agent():
 Help users find relevant information in video transcripts with exact timestamps.
 
 **Workflow:**
-1. Use search_video_transcripts to find relevant segments
+1. Use search_video_transcripts to find relevant segments (set speaker, video_id or date_from/date_to when the user names a presenter, a video or a time period)
+   - If the videos may not cover it, call search_knowledge_sources once with collections ["video_transcripts", "aks_kb"] instead of searching each source separately
 2. Extract step-by-step instructions from the transcript text
 3. Include EXACT timestamps for each step
 4. Create "video cards" with clickable links
@@ -82,6 +88,7 @@ Help users find relevant information in video transcripts with exact timestamps.
             messages = [SystemMessage(content=system_prompt)] + messages
         
         response = llm_with_tools.invoke(messages)
+        await_input_verdict()
         return {"messages": [response]}
     
     def should_continue(state: VideoAgentState):
@@ -116,12 +123,13 @@ Help users find relevant information in video transcripts with exact timestamps.
 
 def run_video_search(query: str) -> dict:
     
-    agent = create_video_agent()
-    
-    result = agent.invoke({
+    result, reason = invoke_with_guardrails(lambda: get_compiled_agent(create_video_agent), {
         "messages": [HumanMessage(content=query)],
         "query": query
-    })
+    }, query)
+    
+    if result is None:
+        return blocked_response(reason)
     
     messages = result["messages"]
     
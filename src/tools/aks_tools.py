@@ -1,132 +1,93 @@
-import os
 import json
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from langchain_core.tools import tool
-from langchain_community.vectorstores import Chroma
-from langchain_openai import OpenAIEmbeddings
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import TextLoader
 from langchain_community.utilities import GoogleSearchAPIWrapper
 from dotenv import load_dotenv
 
-load_dotenv()
-
-_aks_embeddings: Optional[OpenAIEmbeddings] = None
-_aks_vector_store: Optional[Chroma] = None
-_web_search: Optional[GoogleSearchAPIWrapper] = None
+from src.core.near_duplicates import near_duplicate_candidates, suppress_near_duplicates
+from src.core.result_cache import cached_search
+from src.core.vector_backends import where_all
+from src.core.vector_store import get_vector_store_registry
 
+# What "relevance_score" measures for each retrieval mode (higher is better in all)
+_SCORE_KINDS = {"vector": "cosine_similarity", "lexical": "bm25", "hybrid": "rrf"}
 
-def _get_aks_embeddings():
-    global _aks_embeddings
-    
-    if _aks_embeddings is None:
-        _aks_embeddings = OpenAIEmbeddings(
-            model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
-    
-    return _aks_embeddings
-
+load_dotenv()
 
-def _get_aks_vector_store():
-    global _aks_vector_store
-    
-    if _aks_vector_store is not None:
-        return _aks_vector_store
-    
-    embeddings = _get_aks_embeddings()
-    persist_dir = "./chroma_db_aks"
-    
-    if os.path.exists(persist_dir) and os.listdir(persist_dir):
-        try:
-            _aks_vector_store = Chroma(
-                persist_directory=persist_dir,
-                embedding_function=embeddings
-            )
-            return _aks_vector_store
-        except:
-            pass
-    
-    docs_dir = Path("docs")
-    all_docs = []
-    
-    for md_file in docs_dir.glob("*.md"):
-        try:
-            loader = TextLoader(str(md_file), encoding='utf-8')
-            docs = loader.load()
-            
-            for doc in docs:
-                doc.metadata["source"] = md_file.name
-                doc.metadata["type"] = "internal_kb"
-                doc.metadata["doc_id"] = md_file.stem
-            
-            all_docs.extend(docs)
-        except Exception as e:
-            print(f"Warning: Could not load {md_file}: {e}")
-    
-    if not all_docs:
-        raise ValueError("No AKS documents found in docs/ directory")
-    
-    print(f"Indexing {len(all_docs)} AKS documents...")
-    
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=600,
-        chunk_overlap=100,
-        length_function=len
-    )
-    splits = text_splitter.split_documents(all_docs)
-    
-    print(f"Created {len(splits)} chunks")
-    
-    _aks_vector_store = Chroma.from_documents(
-        documents=splits,
-        embedding=embeddings,
-        persist_directory=persist_dir
-    )
-    
-    print(f"AKS vector store created")
-    
-    return _aks_vector_store
+_web_search: Optional[GoogleSearchAPIWrapper] = None
 
 
 @tool
-def search_internal_aks_kb(query: str, top_k: int = 5) -> Dict[str, Any]:
+@cached_search("aks_kb")
+def search_internal_aks_kb(
+    query: str,
+    top_k: int = 5,
+    mode: str = "auto",
+    doc_id: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Search CVS Health's internal AKS knowledge base.
     
+    Near-duplicate passages (the same text in several documents) are
+    returned once, with the other documents listed in "also_in". Extra
+    candidates are retrieved so top_k distinct results usually still come
+    back; with NEAR_DUPLICATE_OVERFETCH=1 none are, and fewer than top_k
+    results come back when duplicates fold.
+    
     Args:
         query: Technical question about AKS networking
         top_k: Number of results (default: 5)
+        mode: "auto" (default), "hybrid", "vector" or "lexical". Auto answers
+              exact-term lookups (priorities, ports, form IDs) by keyword match
+              and everything else by hybrid keyword + semantic search
+        doc_id: Only search this document (a doc_id from earlier results,
+                e.g. "aks_networking_guide"); omit to search the whole KB
     
     Returns:
         {
             "results": List of relevant chunks with citations,
             "count": Number of results,
-            "sources": Document IDs
+            "sources": Document IDs,
+            "retrieval": Search mode used,
+            "score_kind": What relevance_score measures for that mode
+                          ("cosine_similarity", "bm25" or "rrf"; higher is
+                          better, but only comparable within one kind),
+            "duplicates_removed": Near-duplicate chunks folded into the returned results
         }
     """
-    vector_store = _get_aks_vector_store()
-    
-    results = vector_store.similarity_search_with_score(query, k=top_k)
+    where = where_all([{"doc_id": doc_id}] if doc_id else [])
+    try:
+        retrieval, results = get_vector_store_registry().hybrid_search(
+            "aks_kb", query, k=near_duplicate_candidates(top_k), mode=mode, filter=where
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+    distinct = suppress_near_duplicates(results)[:top_k]
     
     formatted_results = []
     sources = set()
     
-    for doc, score in results:
+    for doc, score, duplicates in distinct:
+        also_in = sorted({dup.metadata.get("doc_id", "unknown") for dup in duplicates} - {doc.metadata.get("doc_id", "unknown")})
         formatted_results.append({
             "content": doc.page_content,
             "source": doc.metadata.get("source", "unknown"),
             "doc_id": doc.metadata.get("doc_id", "unknown"),
+            "also_in": also_in,
             "relevance_score": round(float(score), 3)
         })
         sources.add(doc.metadata.get("doc_id", "unknown"))
+        sources.update(also_in)
     
     return {
         "results": formatted_results,
         "count": len(formatted_results),
         "sources": list(sources),
-        "source_type": "internal_kb"
+        "source_type": "internal_kb",
+        "retrieval": retrieval,
+        "score_kind": _SCORE_KINDS[retrieval],
+        "duplicates_removed": sum(len(duplicates) for _, _, duplicates in distinct)
     }
 
 
@@ -1,12 +1,16 @@
-import pandas as pd
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
 from langchain_core.tools import tool
+from src.core.employee_directory import get_employee_directory
+from src.core.tool_results import DEFAULT_EMPLOYEE_COLUMNS, DEFAULT_PAGE_SIZE, paginate_frame
 
 
 @tool
 def query_employee_database(
     filter_criteria: Dict[str, str] = None,
-    columns: List[str] = None
+    columns: List[str] = None,
+    cursor: str = None,
+    page_size: int = DEFAULT_PAGE_SIZE
 ) -> Dict[str, Any]:
     """
     Query the HR employee database (CSV).
@@ -17,51 +21,64 @@ def query_employee_database(
             - {"department": "Digital Workplace AI"}
             - {"role": "Data Scientist", "location": "Boston"}
             - {"full_name": "Sarah Chen"}
-        columns: List of columns to return (None = all columns)
+        columns: List of columns to return (None = full_name, role, department,
+            location, manager, email)
             Available: employee_id, full_name, role, department, 
                       location, office, start_date, manager, email
+        cursor: next_cursor from a previous call, to fetch the next page
+        page_size: Maximum employees per page
     
     Returns:
         {
-            "employees": List of matching employee records,
-            "count": Number of matches,
-            "columns": List of column names returned
+            "employees": Matching employees as {column: [values]},
+            "count": Total number of matches,
+            "returned": Number of employees in this page,
+            "columns": List of column names returned,
+            "next_cursor": Pass as `cursor` for more results (None when done)
         }
     """
-    df = pd.read_csv("data/employees.csv")
+    index = get_employee_directory().index()
+    df = index.df.iloc[index.filter(filter_criteria)]
     
-    if filter_criteria:
-        for col, value in filter_criteria.items():
-            if col in df.columns:
-                df = df[df[col].str.contains(value, case=False, na=False)]
-    
-    if columns:
-        available_cols = [c for c in columns if c in df.columns]
-        df = df[available_cols]
-    
-    employees = df.to_dict('records')
-    
-    return {
-        "employees": employees,
-        "count": len(employees),
-        "columns": list(df.columns)
-    }
+    try:
+        return paginate_frame(
+            df, index.version, "query_employee_database",
+            cursor=cursor, page_size=page_size, columns=columns, records_key="employees"
+        )
+    except ValueError as e:
+        return {"error": str(e)}
 
 
 @tool
-def get_employee_by_name(name: str) -> Dict[str, Any]:
+def get_employee_by_name(name: str, fuzzy: bool = True) -> Dict[str, Any]:
     """
     Look up a specific employee by name (partial match supported).
     
     Args:
         name: Full or partial name to search for
+        fuzzy: If no name contains `name`, return the closest names instead
+            (tolerates typos like "Sara Chen" and "Last, First" order)
     
     Returns:
         Employee record with all details, or None if not found
     """
-    df = pd.read_csv("data/employees.csv")
+    index = get_employee_directory().index()
     
-    matches = df[df['full_name'].str.contains(name, case=False, na=False)]
+    matches = index.df.iloc[index.contains('full_name', name)]
+    
+    if len(matches) == 0 and fuzzy:
+        candidates = index.fuzzy_name(name)
+        if candidates:
+            employees = index.df.iloc[[row for row, _ in candidates]].to_dict('records')
+            for employee, (_, distance) in zip(employees, candidates):
+                employee["match_distance"] = distance
+            return {
+                "found": True,
+                "fuzzy_match": True,
+                "message": f"No exact match for '{name}'; closest names ranked by edit distance",
+                "count": len(employees),
+                "employees": employees
+            }
     
     if len(matches) == 0:
         return {
@@ -84,24 +101,34 @@ def get_employee_by_name(name: str) -> Dict[str, Any]:
 
 
 @tool
-def get_team_members(department: str = None, manager: str = None) -> Dict[str, Any]:
+def get_team_members(
+    department: str = None,
+    manager: str = None,
+    cursor: str = None,
+    page_size: int = DEFAULT_PAGE_SIZE
+) -> Dict[str, Any]:
     """
     Get all members of a team or department.
     
     Args:
         department: Department name (partial match)
         manager: Manager name (partial match)
+        cursor: next_cursor from a previous call, to fetch the next page
+        page_size: Maximum team members per page
     
     Returns:
-        List of team members with their details
+        Team size, roles and locations across the whole team, and one page
+        of team members as {column: [values]}
     """
-    df = pd.read_csv("data/employees.csv")
+    index = get_employee_directory().index()
     
+    criteria = {}
     if department:
-        df = df[df['department'].str.contains(department, case=False, na=False)]
-    
+        criteria['department'] = department
     if manager:
-        df = df[df['manager'].str.contains(manager, case=False, na=False)]
+        criteria['manager'] = manager
+    
+    df = index.df.iloc[index.filter(criteria)]
     
     if len(df) == 0:
         return {
@@ -109,13 +136,18 @@ def get_team_members(department: str = None, manager: str = None) -> Dict[str, A
             "message": "No team members found matching criteria"
         }
     
-    return {
-        "found": True,
-        "count": len(df),
-        "team_members": df.to_dict('records'),
-        "roles": df['role'].unique().tolist(),
-        "locations": df['location'].unique().tolist()
-    }
+    try:
+        return paginate_frame(
+            df, index.version, "get_team_members",
+            cursor=cursor, page_size=page_size, records_key="team_members",
+            fields={
+                "found": True,
+                "roles": df['role'].unique().tolist(),
+                "locations": df['location'].unique().tolist()
+            }
+        )
+    except ValueError as e:
+        return {"found": False, "message": str(e)}
 
 
 @tool
@@ -129,16 +161,153 @@ def get_location_summary(location: str = None) -> Dict[str, Any]:
     Returns:
         Summary statistics by location
     """
-    df = pd.read_csv("data/employees.csv")
+    return get_employee_directory().aggregates().summary(location)
+
+
+def _resolve_employee(index, name: str) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+    """Resolve a name to one directory row: exact match, then a unique partial match, then the closest fuzzy match."""
+    rows = index.exact('full_name', name)
+    if len(rows) == 0:
+        rows = index.contains('full_name', name)
+    if len(rows) == 0:
+        rows = [row for row, _ in index.fuzzy_name(name, limit=1)]
     
-    if location:
-        df = df[df['location'].str.contains(location, case=False, na=False)]
+    if len(rows) == 0:
+        return None, {
+            "found": False,
+            "message": f"No employee found matching '{name}'"
+        }
     
-    summary = df.groupby(['location', 'role']).size().reset_index(name='count')
+    if len(rows) > 1:
+        return None, {
+            "found": False,
+            "ambiguous": True,
+            "message": f"'{name}' matches {len(rows)} employees; use a full name",
+            "candidates": index.df['full_name'].iloc[list(rows[:10])].tolist()
+        }
+    
+    return int(rows[0]), None
+
+
+@tool
+def get_org_members(
+    manager: str,
+    max_depth: int = None,
+    cursor: str = None,
+    page_size: int = DEFAULT_PAGE_SIZE
+) -> Dict[str, Any]:
+    """
+    Get everyone in a manager's organization (direct and indirect reports).
+    
+    Args:
+        manager: Manager's name
+        max_depth: Levels below the manager to include (1 = direct reports only, None = whole org)
+        cursor: next_cursor from a previous call, to fetch the next page
+        page_size: Maximum members per page
+    
+    Returns:
+        Org size, head count per level below the manager, and one page of
+        members as {column: [values]}
+    """
+    directory = get_employee_directory()
+    # One snapshot for both, so row numbers agree even if the CSV reloads meanwhile
+    snapshot = directory.snapshot()
+    index = directory.index(snapshot)
+    org = directory.org_chart(snapshot)
+    
+    row, error = _resolve_employee(index, manager)
+    if error:
+        return error
+    
+    rows = org.reports(row, max_depth)
+    levels = org.depth[rows] - org.depth[row]
+    members = index.df.iloc[rows].assign(levels_below=levels)
+    
+    try:
+        return paginate_frame(
+            members, index.version, "get_org_members",
+            cursor=cursor, page_size=page_size,
+            columns=DEFAULT_EMPLOYEE_COLUMNS + ["levels_below"], records_key="members",
+            fields={
+                "found": True,
+                "manager": index.df.iloc[row].to_dict(),
+                "org_size": len(rows),
+                "direct_reports": len(org.direct_reports(row)),
+                "by_level": {int(k): int(v) for k, v in zip(*np.unique(levels, return_counts=True))}
+            }
+        )
+    except ValueError as e:
+        return {"found": False, "message": str(e)}
+
+
+@tool
+def get_reporting_chain(name: str) -> Dict[str, Any]:
+    """
+    Get an employee's chain of command, from their direct manager to the top of the org.
+    
+    Args:
+        name: Employee name
+    
+    Returns:
+        The employee and the ordered list of managers above them
+    """
+    directory = get_employee_directory()
+    # One snapshot for both, so row numbers agree even if the CSV reloads meanwhile
+    snapshot = directory.snapshot()
+    index = directory.index(snapshot)
+    org = directory.org_chart(snapshot)
+    
+    row, error = _resolve_employee(index, name)
+    if error:
+        return error
+    
+    chain = org.chain_of_command(row)
+    
+    return {
+        "found": True,
+        "employee": index.df.iloc[row].to_dict(),
+        "chain_of_command": index.df.iloc[chain].to_dict('records'),
+        "levels": len(chain)
+    }
+
+
+@tool
+def get_common_manager(name_a: str, name_b: str) -> Dict[str, Any]:
+    """
+    Find the lowest manager two employees both report up to.
+    
+    Args:
+        name_a: First employee name
+        name_b: Second employee name
+    
+    Returns:
+        The common manager and how many levels below them each employee sits
+    """
+    directory = get_employee_directory()
+    # One snapshot for both, so row numbers agree even if the CSV reloads meanwhile
+    snapshot = directory.snapshot()
+    index = directory.index(snapshot)
+    org = directory.org_chart(snapshot)
+    
+    row_a, error = _resolve_employee(index, name_a)
+    if error:
+        return error
+    row_b, error = _resolve_employee(index, name_b)
+    if error:
+        return error
+    
+    common = org.common_manager(row_a, row_b)
+    if common is None:
+        return {
+            "found": False,
+            "message": f"{name_a} and {name_b} are in separate reporting trees"
+        }
     
     return {
-        "total_employees": len(df),
-        "locations": df['location'].value_counts().to_dict(),
-        "by_location_and_role": summary.to_dict('records'),
-        "departments": df['department'].value_counts().to_dict()
-    }
\ No newline at end of file
+        "found": True,
+        "common_manager": index.df.iloc[common].to_dict(),
+        "levels_below": {
+            index.df['full_name'].iloc[row_a]: int(org.depth[row_a] - org.depth[common]),
+            index.df['full_name'].iloc[row_b]: int(org.depth[row_b] - org.depth[common])
+        }
+    }
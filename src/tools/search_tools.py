@@ -1,135 +1,69 @@
-import os
-from pathlib import Path
 from typing import List, Dict, Any, Optional
 from langchain_core.tools import tool
-from langchain_community.vectorstores import Chroma
-from langchain_openai import OpenAIEmbeddings
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import TextLoader
 from dotenv import load_dotenv
 
-load_dotenv()
-
-_embeddings: Optional[OpenAIEmbeddings] = None
-_vector_store: Optional[Chroma] = None
-
-
-def _get_embeddings():
-    global _embeddings
-    
-    if _embeddings is None:
-        _embeddings = OpenAIEmbeddings(
-            model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
-    
-    return _embeddings
-
+from src.core.near_duplicates import near_duplicate_candidates, suppress_near_duplicates
+from src.core.result_cache import cached_search
+from src.core.vector_backends import where_all
+from src.core.vector_store import get_vector_store_registry
 
-def _get_or_create_vector_store():
-    """Get or create the vector store."""
-    global _vector_store
-    
-    if _vector_store is not None:
-        return _vector_store
-    
-    embeddings = _get_embeddings()
-    persist_dir = os.getenv("CHROMA_PERSIST_DIR", "./chroma_db")
-    
-    # Check if vector store exists
-    if os.path.exists(persist_dir) and os.listdir(persist_dir):
-        try:
-            _vector_store = Chroma(
-                persist_directory=persist_dir,
-                embedding_function=embeddings
-            )
-            return _vector_store
-        except:
-            pass
-    
-    docs_dir = Path("data")
-    all_docs = []
-    
-    # Load markdown files
-    for md_file in docs_dir.glob("*.md"):
-        try:
-            loader = TextLoader(str(md_file), encoding='utf-8')
-            docs = loader.load()
-            
-            for doc in docs:
-                doc.metadata["source"] = md_file.name
-                doc.metadata["type"] = "team_doc"
-            
-            all_docs.extend(docs)
-        except Exception as e:
-            print(f"Warning: Could not load {md_file}: {e}")
-            continue
-    
-    if not all_docs:
-        raise ValueError("No documents found in data/ directory. Please add .md files.")
-    
-    print(f"Indexing {len(all_docs)} documents...")
-    
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=512,
-        chunk_overlap=50,
-        length_function=len
-    )
-    splits = text_splitter.split_documents(all_docs)
-    
-    print(f"Created {len(splits)} chunks")
-    
-    _vector_store = Chroma.from_documents(
-        documents=splits,
-        embedding=embeddings,
-        persist_directory=persist_dir
-    )
-    
-    print(f"Vector store created at {persist_dir}")
-    
-    return _vector_store
+load_dotenv()
 
 
 @tool
-def search_team_documents(query: str, top_k: int = 5) -> Dict[str, Any]:
+@cached_search("team_docs")
+def search_team_documents(query: str, top_k: int = 5, source: Optional[str] = None) -> Dict[str, Any]:
     """
     Search team documentation using semantic search.
     
+    Near-duplicate passages (the same text in several documents) are
+    returned once, with the other documents listed in "also_in". Extra
+    candidates are retrieved so top_k distinct results usually still come
+    back; with NEAR_DUPLICATE_OVERFETCH=1 none are, and fewer than top_k
+    results come back when duplicates fold.
+    
     Args:
         query: Search query (e.g., "who are the data scientists?")
         top_k: Number of results to return (default: 5)
+        source: Only search this document, by file name as in results (e.g., "team.md")
     
     Returns:
         {
             "results": List of matching document chunks,
             "count": Number of results,
-            "sources": List of source documents
+            "sources": List of source documents,
+            "duplicates_removed": Near-duplicate chunks folded into the returned results
         }
     """
-    vector_store = _get_or_create_vector_store()
-    
-    results = vector_store.similarity_search_with_score(query, k=top_k)
+    where = where_all([{"source": source}] if source else [])
+    results = get_vector_store_registry().search("team_docs", query, k=near_duplicate_candidates(top_k), filter=where)
+    distinct = suppress_near_duplicates(results)[:top_k]
     
     formatted_results = []
     sources = set()
     
-    for doc, score in results:
+    for doc, score, duplicates in distinct:
+        also_in = sorted({dup.metadata.get("source", "unknown") for dup in duplicates} - {doc.metadata.get("source", "unknown")})
         formatted_results.append({
             "content": doc.page_content,
             "source": doc.metadata.get("source", "unknown"),
+            "also_in": also_in,
             "score": float(score)
         })
         sources.add(doc.metadata.get("source", "unknown"))
+        sources.update(also_in)
     
     return {
         "results": formatted_results,
         "count": len(formatted_results),
         "sources": list(sources),
+        "duplicates_removed": sum(len(duplicates) for _, _, duplicates in distinct),
         "query": query
     }
 
 
 @tool
+@cached_search("team_docs")
 def search_for_people(keywords: List[str]) -> Dict[str, Any]:
     """
     Search documents specifically for people/names.
@@ -140,12 +74,16 @@ def search_for_people(keywords: List[str]) -> Dict[str, Any]:
     Returns:
         Names and roles found in documents
     """
-    vector_store = _get_or_create_vector_store()
+    results = get_vector_store_registry().search_batch("team_docs", keywords, k=3)
     
+    # Keep keyword order, dropping chunks already returned for an earlier keyword
+    seen = set()
     all_results = []
-    for keyword in keywords:
-        results = vector_store.similarity_search(keyword, k=3)
-        all_results.extend(results)
+    for hits in results:
+        for doc, _ in hits:
+            if doc.id not in seen:
+                seen.add(doc.id)
+                all_results.append(doc)
     
     combined_text = "\n".join([doc.page_content for doc in all_results])
     
@@ -153,4 +91,57 @@ def search_for_people(keywords: List[str]) -> Dict[str, Any]:
         "found_text": combined_text[:2000],  
         "document_count": len(all_results),
         "keywords_searched": keywords
-    }
\ No newline at end of file
+    }
+
+
+# Metadata kept in federated results: enough to cite a chunk from any collection
+_CITATION_FIELDS = ("source", "doc_id", "heading_path", "video_id", "video_title", "speaker", "timestamp", "video_url")
+
+
+@tool
+@cached_search()
+def search_knowledge_sources(query: str, collections: Optional[List[str]] = None, top_k: int = 8) -> Dict[str, Any]:
+    """
+    Search team docs, the internal AKS knowledge base and video transcripts in one call.
+    
+    Use this instead of several single-source searches when the answer may
+    be in more than one place. The sources are searched in parallel and the
+    hits merged into one ranking by similarity.
+    
+    Args:
+        query: Search query (e.g., "how do we deploy to AKS?")
+        collections: Sources to search, any of "team_docs", "aks_kb",
+                     "video_transcripts" (default: all)
+        top_k: Number of results in the merged ranking (default: 8)
+    
+    Returns:
+        {
+            "results": Matching chunks, best first, each tagged with its "collection" and citation fields,
+            "count": Number of results,
+            "by_collection": Results per collection
+        }
+    """
+    try:
+        results = get_vector_store_registry().federated_search(query, collections, k=top_k)
+    except KeyError as e:
+        return {"error": str(e.args[0])}
+    
+    formatted_results = []
+    by_collection: Dict[str, int] = {}
+    
+    for doc, score in results:
+        collection = doc.metadata["collection"]
+        formatted_results.append({
+            "collection": collection,
+            "content": doc.page_content,
+            **{field: doc.metadata[field] for field in _CITATION_FIELDS if field in doc.metadata},
+            "similarity": round(float(score), 3)
+        })
+        by_collection[collection] = by_collection.get(collection, 0) + 1
+    
+    return {
+        "results": formatted_results,
+        "count": len(formatted_results),
+        "by_collection": by_collection,
+        "query": query
+    }
@@ -1,123 +1,76 @@
 
-import os
-import json
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from langchain_core.tools import tool
-from langchain_community.vectorstores import Chroma
-from langchain_openai import OpenAIEmbeddings
-from langchain.schema import Document
 from dotenv import load_dotenv
 
-load_dotenv()
-
-_video_embeddings: Optional[OpenAIEmbeddings] = None
-_video_vector_store: Optional[Chroma] = None
-
-
-def _get_video_embeddings():
-    global _video_embeddings
-    
-    if _video_embeddings is None:
-        _video_embeddings = OpenAIEmbeddings(
-            model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
-    
-    return _video_embeddings
+from src.core.document_sources import date_number, load_video_transcript
+from src.core.result_cache import cached_search
+from src.core.vector_backends import where_all
+from src.core.vector_store import distance_to_similarity, get_vector_store_registry
 
-
-def _load_video_transcript(video_path: Path) -> Dict[str, Any]:
-    with open(video_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-
-def _get_video_vector_store():
-    global _video_vector_store
-    
-    if _video_vector_store is not None:
-        return _video_vector_store
-    
-    embeddings = _get_video_embeddings()
-    persist_dir = "./chroma_db_videos"
-    
-    if os.path.exists(persist_dir) and os.listdir(persist_dir):
-        try:
-            _video_vector_store = Chroma(
-                persist_directory=persist_dir,
-                embedding_function=embeddings
-            )
-            return _video_vector_store
-        except:
-            pass
-    
-    videos_dir = Path("videos")
-    all_chunks = []
-    
-    for json_file in videos_dir.glob("*.json"):
-        try:
-            video_data = _load_video_transcript(json_file)
-            
-            for segment in video_data['transcript']:
-                doc = Document(
-                    page_content=segment['text'],
-                    metadata={
-                        "video_id": video_data['video_id'],
-                        "video_title": video_data['title'],
-                        "speaker": video_data['speaker'],
-                        "date": video_data['date'],
-                        "timestamp": segment['timestamp'],
-                        "duration": segment['duration'],
-                        "video_url": video_data['url'],
-                        "thumbnail": video_data.get('thumbnail', ''),
-                        "source_type": "video_transcript"
-                    }
-                )
-                all_chunks.append(doc)
-        
-        except Exception as e:
-            print(f"Warning: Could not load {json_file}: {e}")
-    
-    if not all_chunks:
-        raise ValueError("No video transcripts found in videos/ directory")
-    
-    print(f"Indexing {len(all_chunks)} video segments from {len(list(videos_dir.glob('*.json')))} videos...")
-    
-    _video_vector_store = Chroma.from_documents(
-        documents=all_chunks,
-        embedding=embeddings,
-        persist_directory=persist_dir
-    )
-    
-    print(f"Video vector store created")
-    
-    return _video_vector_store
+load_dotenv()
 
 
 @tool
-def search_video_transcripts(query: str, top_k: int = 5) -> Dict[str, Any]:
+@cached_search("video_transcripts")
+def search_video_transcripts(
+    query: str,
+    top_k: int = 5,
+    speaker: Optional[str] = None,
+    video_id: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Search video transcripts for relevant content with timestamps.
     
+    Filters narrow the search before any segment is compared with the
+    query; set them whenever the user names a presenter, a video or a
+    time period.
+    
     Args:
         query: Search query (e.g., "How do I deploy to AKS?")
         top_k: Number of results (default: 5)
+        speaker: Only videos by speakers whose name contains this, case-insensitive
+            (e.g., "Sarah Chen" or "chen")
+        video_id: Only this video (e.g., "VID-001")
+        date_from: Only videos published on or after this date (YYYY-MM-DD)
+        date_to: Only videos published on or before this date (YYYY-MM-DD)
     
     Returns:
         {
-            "results": List of matching segments with timestamps,
+            "results": List of matching segments with timestamps, each with
+                       a relevance_score (cosine similarity, higher is better),
             "count": Number of results,
-            "videos": Unique video IDs found
+            "videos": Unique video IDs found,
+            "filters": Metadata filter applied (empty if none)
         }
     """
-    vector_store = _get_video_vector_store()
-    
-    results = vector_store.similarity_search_with_score(query, k=top_k)
+    clauses = []
+    if speaker:
+        # Resolve to speaker names as stored, matching like search_by_speaker
+        speakers = sorted({video['speaker'] for video in _videos_by_speaker(speaker)})
+        if not speakers:
+            return {"error": f"No videos by a speaker matching '{speaker}'"}
+        clauses.append({"speaker": speakers[0] if len(speakers) == 1 else {"$in": speakers}})
+    if video_id:
+        clauses.append({"video_id": video_id})
+    try:
+        if date_from:
+            clauses.append({"date_number": {"$gte": date_number(date_from)}})
+        if date_to:
+            clauses.append({"date_number": {"$lte": date_number(date_to)}})
+    except ValueError as e:
+        return {"error": str(e)}
+    where = where_all(clauses)
+    
+    results = get_vector_store_registry().search("video_transcripts", query, k=top_k, filter=where)
     
     formatted_results = []
     video_ids = set()
     
-    for doc, score in results:
+    for doc, distance in results:
         formatted_results.append({
             "text": doc.page_content,
             "video_id": doc.metadata.get("video_id"),
@@ -127,7 +80,7 @@ def search_video_transcripts(query: str, top_k: int = 5) -> Dict[str, Any]:
             "duration": doc.metadata.get("duration"),
             "video_url": doc.metadata.get("video_url"),
             "thumbnail": doc.metadata.get("thumbnail"),
-            "relevance_score": round(float(score), 3)
+            "relevance_score": round(distance_to_similarity(float(distance)), 3)
         })
         video_ids.add(doc.metadata.get("video_id"))
     
@@ -135,7 +88,9 @@ def search_video_transcripts(query: str, top_k: int = 5) -> Dict[str, Any]:
         "results": formatted_results,
         "count": len(formatted_results),
         "videos": list(video_ids),
-        "source_type": "video_transcripts"
+        "source_type": "video_transcripts",
+        "score_kind": "cosine_similarity",
+        "filters": where or {}
     }
 
 
@@ -154,7 +109,7 @@ def get_video_summary(video_id: str) -> Dict[str, Any]:
     
     for json_file in videos_dir.glob("*.json"):
         try:
-            video_data = _load_video_transcript(json_file)
+            video_data = load_video_transcript(json_file)
             if video_data['video_id'] == video_id:
                 return {
                     "found": True,
@@ -176,6 +131,22 @@ def get_video_summary(video_id: str) -> Dict[str, Any]:
     }
 
 
+def _videos_by_speaker(speaker_name: str) -> List[Dict[str, Any]]:
+    """Transcripts in videos/ whose speaker name contains `speaker_name`, case-insensitive."""
+    videos_dir = Path("videos")
+    matching_videos = []
+    
+    for json_file in videos_dir.glob("*.json"):
+        try:
+            video_data = load_video_transcript(json_file)
+            if speaker_name.lower() in video_data['speaker'].lower():
+                matching_videos.append(video_data)
+        except:
+            continue
+    
+    return matching_videos
+
+
 @tool
 def search_by_speaker(speaker_name: str) -> Dict[str, Any]:
     """
@@ -187,23 +158,17 @@ def search_by_speaker(speaker_name: str) -> Dict[str, Any]:
     Returns:
         List of videos by that speaker
     """
-    videos_dir = Path("videos")
-    matching_videos = []
-    
-    for json_file in videos_dir.glob("*.json"):
-        try:
-            video_data = _load_video_transcript(json_file)
-            if speaker_name.lower() in video_data['speaker'].lower():
-                matching_videos.append({
-                    "video_id": video_data['video_id'],
-                    "title": video_data['title'],
-                    "speaker": video_data['speaker'],
-                    "date": video_data['date'],
-                    "duration": video_data['duration'],
-                    "url": video_data['url']
-                })
-        except:
-            continue
+    matching_videos = [
+        {
+            "video_id": video_data['video_id'],
+            "title": video_data['title'],
+            "speaker": video_data['speaker'],
+            "date": video_data['date'],
+            "duration": video_data['duration'],
+            "url": video_data['url']
+        }
+        for video_data in _videos_by_speaker(speaker_name)
+    ]
     
     return {
         "found": len(matching_videos) > 0,